@@ -0,0 +1,125 @@
+# benchmarks/chatbot_benchmark.py
+import os
+import sys
+import time
+import random
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from chat.bot import Chatbot
+from chat.answers import AnswerTable
+from chat.knowledge_base import default_knowledge_base
+
+# Questions types de chaque intention ({target} : composant et sous-composant)
+QUESTIONS = {
+    'component_info': "Que peux-tu me dire sur le {target} ?",
+    'failure_mode': "Quelles sont les pannes possibles du {target} ?",
+    'maintenance': "Comment faire l'entretien du {target} ?",
+    'criticality': "Quelle est la criticité du {target} ?"
+}
+
+def make_messages(knowledge_base):
+    """
+    Génère une question par intention, composant et sous-composant
+    
+    Args:
+        knowledge_base (KnowledgeBase): Base de connaissances du chatbot
+    
+    Returns:
+        dict: Intention -> liste de messages
+    """
+    return {
+        kind: [
+            question.format(target=f"{component} {subcomponent}")
+            for component, subcomponents in knowledge_base.subcomponents.items()
+            for subcomponent in subcomponents
+        ]
+        for kind, question in QUESTIONS.items()
+    }
+
+def measure(function, repeat):
+    """
+    Mesure le temps moyen d'un appel
+    
+    Args:
+        function (callable): Fonction sans argument
+        repeat (int): Nombre d'appels
+    
+    Returns:
+        float: Temps moyen en millisecondes
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def respond_all(bot, messages, seed=0):
+    """
+    Répond à une série de messages avec une graine fixe
+    
+    Args:
+        bot (Chatbot): Chatbot interrogé
+        messages (list): Messages de l'utilisateur
+        seed (int, optional): Graine du tirage des modèles de réponse
+    
+    Returns:
+        list: Réponses
+    """
+    random.seed(seed)
+    
+    return [bot.generate_response(message) for message in messages]
+
+def run(repeat=50):
+    """
+    Compare la latence par message avec des réponses rendues à chaque appel
+    et avec la table des réponses précalculées
+    
+    Args:
+        repeat (int, optional): Nombre de passages sur l'ensemble des messages
+    """
+    knowledge_base = default_knowledge_base()
+    messages = make_messages(knowledge_base)
+    
+    start = time.perf_counter()
+    table = AnswerTable(knowledge_base)
+    print(f"Table des réponses : {len(table.answers)} combinaisons précalculées en {(time.perf_counter() - start) * 1000:.2f} ms")
+    
+    # Avant : fragments et modèles rendus à chaque message
+    before = Chatbot()
+    before.answers = AnswerTable(knowledge_base, precompute=False, memoize=False)
+    
+    # Après : recherche dans la table et tirage du modèle
+    after = Chatbot()
+    after.answers = table
+    
+    combinations = [
+        (component, subcomponent)
+        for component, subcomponents in knowledge_base.subcomponents.items()
+        for subcomponent in subcomponents
+    ]
+    
+    # Latence par message complet (analyse + réponse), puis de la seule construction de la réponse
+    print(f"{'intention':>15} {'messages':>9} {'avant (µs)':>11} {'après (µs)':>11} {'gain':>6} {'réponse avant':>14} {'réponse après':>14} {'gain':>6}")
+    
+    for kind, kind_messages in messages.items():
+        # Les deux versions doivent donner exactement les mêmes réponses
+        if respond_all(before, kind_messages) != respond_all(after, kind_messages):
+            raise AssertionError(f"Réponses différentes pour l'intention : {kind}")
+        
+        rendered = measure(lambda: respond_all(before, kind_messages), repeat) * 1000 / len(kind_messages)
+        precomputed = measure(lambda: respond_all(after, kind_messages), repeat) * 1000 / len(kind_messages)
+        
+        render_only = measure(lambda: [before.answers.choose(kind, *target) for target in combinations], repeat) * 1000 / len(combinations)
+        lookup_only = measure(lambda: [after.answers.choose(kind, *target) for target in combinations], repeat) * 1000 / len(combinations)
+        
+        print(
+            f"{kind:>15} {len(kind_messages):>9} {rendered:>11.2f} {precomputed:>11.2f} {rendered / precomputed:>5.1f}x"
+            f" {render_only:>14.2f} {lookup_only:>14.2f} {render_only / lookup_only:>5.1f}x"
+        )
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
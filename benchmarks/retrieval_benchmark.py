@@ -0,0 +1,408 @@
+# benchmarks/retrieval_benchmark.py
+import os
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from data_processing.amdec_generator import AMDECGenerator
+from maintenance.maintenance_planner import MaintenancePlanner
+from rag.metadata import CONTENT_EQUIPMENTS, SUBCOMPONENT_PATTERNS
+from rag.vectordb import VectorDB
+from rag.retriever import Retriever
+
+# Causes de défaillance reconnues par AMDECGenerator
+CAUSES = ('corrosion', 'fissure', 'erosion', 'fatigue', 'percement', 'surchauffe', 'encrassement', 'vibration', 'fuite')
+
+# Variantes comparées : nom -> (moteur de recherche, vectoriseur)
+VARIANTS = {
+    'tfidf': ('tfidf', 'tfidf'),
+    'bm25': ('bm25', 'tfidf'),
+    'lsa': ('lsa', 'tfidf'),
+    'hashing': ('tfidf', 'hashing')
+}
+
+# Mots de remplissage des comptes rendus
+FILLER = (
+    "lors de l'arrêt programmé l'équipe a constaté sur la zone concernée après "
+    "démontage du calorifuge selon le rapport de l'intervenant avec relevé photo"
+).split()
+
+def build_vocabulary(seed=0):
+    """
+    Construit le vocabulaire des corpus à partir des générateurs du projet
+    
+    Les modes de défaillance, effets, fonctions et actions correctives sont
+    obtenus avec AMDECGenerator, les opérations et le matériel avec
+    MaintenancePlanner, pour chaque composant, sous-composant et cause.
+    
+    Args:
+        seed (int, optional): Graine du tirage des actions correctives
+    
+    Returns:
+        list: Faits (dictionnaires) décrivant une défaillance d'un sous-composant
+    """
+    random.seed(seed)
+    generator = AMDECGenerator(pd.DataFrame(columns=['composant', 'sous_composant', 'cause', 'duree']))
+    planner = MaintenancePlanner()
+    
+    components = [f"{equipment} {level}" for equipment in CONTENT_EQUIPMENTS for level in ('bt', 'ht')]
+    subcomponents = [name for _, name in SUBCOMPONENT_PATTERNS]
+    
+    facts = []
+    for component in components:
+        for subcomponent in subcomponents:
+            for criticality in (8, 14, 18, 24):
+                operations = planner._generate_operations(component, subcomponent, criticality)
+                materials = planner._generate_material_list(component, subcomponent, criticality)
+                
+                for cause in CAUSES:
+                    failure_mode = generator._determine_failure_mode(cause, subcomponent)
+                    facts.append({
+                        'component': planner._format_component_name(component),
+                        'subcomponent': planner._format_subcomponent_name(subcomponent),
+                        'cause': cause,
+                        'failure_mode': failure_mode,
+                        'effect': generator._determine_effect(cause, failure_mode),
+                        'function': generator._determine_function(component, subcomponent),
+                        'actions': generator._generate_corrective_actions(
+                            component, subcomponent, failure_mode, cause, criticality
+                        ),
+                        'operations': [f"{op['name']} : {op['details']}" for op in operations],
+                        'materials': materials
+                    })
+    
+    return facts
+
+def make_passage(fact, rng):
+    """
+    Rédige un passage à partir d'un fait
+    
+    Args:
+        fact (dict): Fait tiré du vocabulaire
+        rng (random.Random): Générateur aléatoire
+    
+    Returns:
+        str: Passage (une ligne)
+    """
+    kind = rng.randrange(4)
+    
+    if kind == 0:
+        text = (f"{fact['component']} {fact['subcomponent']} : {fact['cause']}, mode {fact['failure_mode']}, "
+                f"effet {fact['effect']}, actions {fact['actions']}")
+    elif kind == 1:
+        text = f"{fact['component']} - {rng.choice(fact['operations'])}"
+    elif kind == 2:
+        text = (f"Historique {fact['component']} {fact['subcomponent']} : {fact['cause']} constatée, "
+                f"intervention de {rng.randint(1, 48)} h, matériel {rng.choice(fact['materials'])}")
+    else:
+        text = f"{fact['subcomponent']} ({fact['function']}) : {fact['effect']}"
+    
+    filler = ' '.join(rng.choice(FILLER) for _ in range(rng.randint(0, 12)))
+    
+    return f"{text} {filler}".strip()
+
+def make_corpus(facts, n_passages, passages_per_document=50, seed=0):
+    """
+    Génère un corpus synthétique de documents de maintenance
+    
+    Args:
+        facts (list): Vocabulaire (voir build_vocabulary)
+        n_passages (int): Nombre total de passages
+        passages_per_document (int, optional): Nombre de passages par document
+        seed (int, optional): Graine du générateur
+    
+    Yields:
+        dict: Document avec les clés 'id', 'path', 'text' et 'type'
+    """
+    rng = random.Random(seed)
+    
+    for first in range(0, n_passages, passages_per_document):
+        count = min(passages_per_document, n_passages - first)
+        doc_id = f"synthetique_{first // passages_per_document:07d}"
+        yield {
+            'id': doc_id,
+            'path': f"synthetique/{doc_id}.txt",
+            'text': '\n'.join(make_passage(rng.choice(facts), rng) for _ in range(count)),
+            'type': 'txt'
+        }
+
+def make_queries(facts, n_queries, seed=1):
+    """
+    Génère des requêtes d'utilisateurs à partir du vocabulaire
+    
+    Args:
+        facts (list): Vocabulaire (voir build_vocabulary)
+        n_queries (int): Nombre de requêtes
+        seed (int, optional): Graine du générateur
+    
+    Returns:
+        list: Requêtes
+    """
+    rng = random.Random(seed)
+    queries = []
+    
+    for _ in range(n_queries):
+        fact = rng.choice(facts)
+        kind = rng.randrange(3)
+        if kind == 0:
+            queries.append(f"{fact['cause']} {fact['subcomponent']} {fact['component']}")
+        elif kind == 1:
+            queries.append(f"que faire en cas de {fact['failure_mode']} sur {fact['component']}")
+        else:
+            queries.append(rng.choice(fact['operations']).split(' : ')[0])
+    
+    return queries
+
+def brute_force(db, queries, top_k):
+    """
+    Classe les documents par similarité cosinus exacte, sans index accéléré
+    
+    Le vectoriseur TF-IDF de la base sert de référence : chaque requête est
+    comparée à tous les passages, et un document reçoit le score de son meilleur
+    passage. Les passages synthétiques se répètent : tous les documents à égalité
+    avec le k-ième sont acceptés.
+    
+    Args:
+        db (VectorDB): Base de référence (moteur 'tfidf', vectoriseur 'tfidf')
+        queries (list): Requêtes
+        top_k (int): Nombre de documents par requête
+    
+    Returns:
+        list: Pour chaque requête, couple (identifiants des documents acceptés,
+            nombre de documents attendus)
+    """
+    embeddings = db.embeddings.tocsr()
+    query_embeddings = db.vectorizer.transform(queries)
+    passage_docs = np.asarray(db.passages.doc)
+    ranked = []
+    
+    for i in range(len(queries)):
+        scores = (embeddings @ query_embeddings[i].T).toarray().ravel()
+        doc_scores = np.full(len(db.documents), -np.inf)
+        np.maximum.at(doc_scores, passage_docs, scores)
+        doc_scores[doc_scores <= 0] = -np.inf
+        
+        expected = min(top_k, int(np.isfinite(doc_scores).sum()))
+        if expected == 0:
+            ranked.append((set(), 0))
+            continue
+        
+        threshold = np.partition(-doc_scores, expected - 1)[expected - 1]
+        accepted = np.flatnonzero(-doc_scores <= threshold + 1e-6)
+        ranked.append(({db.documents.record(j)['id'] for j in accepted.tolist()}, expected))
+    
+    return ranked
+
+def recall_at_k(results, reference, top_k):
+    """
+    Calcule le rappel moyen des résultats par rapport à la référence
+    
+    Args:
+        results (list): Pour chaque requête, identifiants des documents trouvés
+        reference (list): Pour chaque requête, documents acceptés et nombre attendu (voir brute_force)
+        top_k (int): Nombre de documents comparés
+    
+    Returns:
+        float: Rappel@k moyen (1.0 si les requêtes sans référence sont les seules)
+    """
+    recalls = [
+        min(len(set(found[:top_k]) & accepted), expected) / expected
+        for found, (accepted, expected) in zip(results, reference)
+        if expected
+    ]
+    
+    return float(np.mean(recalls)) if recalls else 1.0
+
+def latencies(function, queries):
+    """
+    Mesure la latence d'une fonction sur chaque requête
+    
+    Args:
+        function (callable): Fonction appelée avec une requête
+        queries (list): Requêtes
+    
+    Returns:
+        dict: Percentiles p50, p95 et p99 et moyenne, en millisecondes
+    """
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'mean_ms': float(np.mean(timings))
+    }
+
+def directory_size(path):
+    """
+    Calcule la taille des fichiers d'un répertoire
+    
+    Args:
+        path (str): Répertoire
+    
+    Returns:
+        int: Taille en octets
+    """
+    return sum(
+        os.path.getsize(os.path.join(root, filename))
+        for root, _, files in os.walk(path)
+        for filename in files
+    )
+
+def run_variant(name, facts, n_passages, queries, work_dir, top_k):
+    """
+    Construit, recharge et interroge l'index d'une variante sur un corpus
+    
+    Args:
+        name (str): Nom de la variante (voir VARIANTS)
+        facts (list): Vocabulaire du corpus
+        n_passages (int): Nombre de passages du corpus
+        queries (list): Requêtes
+        work_dir (str): Répertoire de données temporaire de la variante
+        top_k (int): Nombre de documents par requête
+    
+    Returns:
+        tuple: (mesures de la variante, base chargée)
+    """
+    backend, vectorizer = VARIANTS[name]
+    for directory in ('models', 'maintenance'):
+        os.makedirs(os.path.join(work_dir, directory), exist_ok=True)
+    with open(os.path.join(work_dir, 'rag_config.json'), 'w', encoding='utf-8') as f:
+        json.dump({'backend': backend, 'vectorizer': {'type': vectorizer}}, f)
+    
+    # Les messages de chargement et de sauvegarde de la base sont masqués
+    with redirect_stdout(io.StringIO()):
+        db = VectorDB(work_dir)
+        start = time.perf_counter()
+        db.add_documents(make_corpus(facts, n_passages))
+        build_time = time.perf_counter() - start
+        
+        with open(os.path.join(db.index_dir, 'CURRENT'), 'r', encoding='utf-8') as f:
+            index_size = directory_size(os.path.join(db.index_dir, f.read().strip()))
+        
+        start = time.perf_counter()
+        db = VectorDB(work_dir)
+        load_time = time.perf_counter() - start
+    
+    retriever = Retriever(db=db)
+    results = [[result['document']['id'] for result in db.search(query, top_k=top_k)] for query in queries]
+    
+    return {
+        'backend': backend,
+        'vectorizer': vectorizer,
+        'passages': len(db.passages),
+        'documents': len(db.documents),
+        'build_s': build_time,
+        'index_bytes': index_size,
+        'load_s': load_time,
+        'search': latencies(lambda query: db.search(query, top_k=top_k), queries),
+        'retrieve': latencies(lambda query: retriever.retrieve(query, top_k=top_k), queries),
+        'results': results
+    }, db
+
+def run(sizes=(1000, 10000, 100000), variants=tuple(VARIANTS), n_queries=200, top_k=5, output=None):
+    """
+    Mesure les performances de la recherche documentaire sur des corpus synthétiques
+    
+    Pour chaque taille de corpus et chaque variante : temps de construction de
+    l'index, taille sur disque, temps de chargement, latences de VectorDB.search
+    et de Retriever.retrieve (p50, p95, p99), et rappel@k par rapport à une
+    recherche cosinus exhaustive.
+    
+    Args:
+        sizes (iterable, optional): Nombres de passages des corpus
+        variants (iterable, optional): Variantes comparées (voir VARIANTS)
+        n_queries (int, optional): Nombre de requêtes par corpus
+        top_k (int, optional): Nombre de documents par requête
+        output (str, optional): Fichier JSON des résultats. Si non fourni, un fichier
+            horodaté du répertoire benchmarks/results.
+    
+    Returns:
+        dict: Résultats complets (également écrits dans le fichier JSON)
+    """
+    facts = build_vocabulary()
+    queries = make_queries(facts, n_queries)
+    
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'scikit-learn': sklearn.__version__
+        },
+        'parameters': {'sizes': list(sizes), 'variants': list(variants), 'queries': n_queries, 'top_k': top_k},
+        'runs': []
+    }
+    
+    print(f"{'passages':>9} {'variante':>9} {'construction':>13} {'index':>10} {'chargement':>11} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {f'rappel@{top_k}':>9}")
+    
+    for n_passages in sizes:
+        work_dir = tempfile.mkdtemp(prefix='retrieval_benchmark_')
+        try:
+            reference = None
+            for name in ['tfidf'] + [variant for variant in variants if variant != 'tfidf']:
+                measures, db = run_variant(name, facts, n_passages, queries, os.path.join(work_dir, name), top_k)
+                
+                # La base TF-IDF sert de référence exhaustive pour les autres variantes
+                if reference is None:
+                    reference = brute_force(db, queries, top_k)
+                measures['recall_at_k'] = recall_at_k(measures.pop('results'), reference, top_k)
+                del db
+                
+                if name not in variants:
+                    continue
+                report['runs'].append(dict(measures, variant=name, size=n_passages))
+                
+                print(f"{n_passages:>9} {name:>9} {measures['build_s']:>12.2f}s {measures['index_bytes'] / 2 ** 20:>8.1f}Mo "
+                      f"{measures['load_s']:>10.3f}s {measures['search']['p50_ms']:>6.2f}ms "
+                      f"{measures['search']['p95_ms']:>6.2f}ms {measures['search']['p99_ms']:>6.2f}ms "
+                      f"{measures['recall_at_k']:>9.3f}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    # Enregistrer les résultats pour comparer les exécutions dans le temps
+    if output is None:
+        output = os.path.join(current_dir, 'results', f"retrieval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Résultats enregistrés dans {output}")
+    
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la recherche documentaire")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Nombres de passages des corpus (jusqu'à 1000000)")
+    parser.add_argument('--variants', nargs='+', choices=list(VARIANTS), default=list(VARIANTS),
+                        help="Variantes comparées")
+    parser.add_argument('--queries', type=int, default=200, help="Nombre de requêtes par corpus")
+    parser.add_argument('--top-k', type=int, default=5, help="Nombre de documents par requête")
+    parser.add_argument('--output', default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+    
+    run(sizes=args.sizes, variants=args.variants, n_queries=args.queries, top_k=args.top_k, output=args.output)
\ No newline at end of file
@@ -0,0 +1,105 @@
+# benchmarks/segment_benchmark.py
+import os
+import sys
+import time
+import random
+import itertools
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag.segment_matcher import SegmentMatcher, extract_segments_naive
+
+# Vocabulaire des textes générés
+WORDS = (
+    "chaudière économiseur surchauffeur réchauffeur collecteur sortie entrée tube porteur "
+    "épingle percement fuite corrosion érosion soudure inspection remplacement contrôle "
+    "épaisseur ultrasons arrêt maintenance préventive corrective vanne pression température "
+    "le la les de du des un une et ou pour avec sur dans par"
+).split()
+
+# Syllabes des mots de remplissage (vocabulaire courant des documents)
+SYLLABLES = "ba ce di fo gu la me ni po ru sa te vi xo zu tra pre gli on an in ur".split()
+
+QUERIES = [
+    "fuite collecteur sortie",
+    "percement tube porteur économiseur",
+    "contrôle épaisseur ultrasons soudure épingle surchauffeur",
+    "corrosion érosion remplacement tube collecteur entrée sortie vanne pression température"
+]
+
+def make_text(n_paragraphs, paragraph_words, density=0.2, seed=0):
+    """
+    Génère un texte de paragraphes aléatoires
+    
+    Args:
+        n_paragraphs (int): Nombre de paragraphes
+        paragraph_words (int): Nombre de mots par paragraphe
+        density (float, optional): Part des mots tirés du vocabulaire technique,
+            les autres étant des mots de remplissage
+        seed (int, optional): Graine du générateur
+    
+    Returns:
+        str: Texte généré
+    """
+    rng = random.Random(seed)
+    
+    def word():
+        if rng.random() < density:
+            return rng.choice(WORDS)
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    
+    return '\n'.join(
+        ' '.join(word() for _ in range(paragraph_words))
+        for _ in range(n_paragraphs)
+    )
+
+def measure(function, repeat):
+    """
+    Mesure le temps moyen d'un appel
+    
+    Args:
+        function (callable): Fonction sans argument
+        repeat (int): Nombre d'appels
+    
+    Returns:
+        float: Temps moyen en millisecondes
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def run(repeat=20, segment_length=200):
+    """
+    Compare l'extraction des segments naïve et en une passe
+    
+    Args:
+        repeat (int, optional): Nombre d'appels par mesure
+        segment_length (int, optional): Longueur des segments
+    """
+    print(f"{'texte':>22} {'densité':>8} {'mots requête':>13} {'naïf (ms)':>10} {'une passe (ms)':>15} {'gain':>6}")
+    
+    cases = [(50, 20), (10, 500), (5, 5000), (1, 50000)]
+    for (n_paragraphs, paragraph_words), density in itertools.product(cases, (0.2, 1.0)):
+        text = make_text(n_paragraphs, paragraph_words, density=density)
+        
+        for query in QUERIES:
+            matcher = SegmentMatcher(query)
+            
+            # Les deux versions doivent donner exactement les mêmes segments
+            expected = extract_segments_naive(text, query, segment_length=segment_length)
+            if matcher.extract_segments(text, segment_length=segment_length) != expected:
+                raise AssertionError(f"Résultats différents pour la requête : {query}")
+            
+            naive = measure(lambda: extract_segments_naive(text, query, segment_length=segment_length), repeat)
+            single_pass = measure(lambda: matcher.extract_segments(text, segment_length=segment_length), repeat)
+            
+            label = f"{n_paragraphs} x {paragraph_words} mots"
+            print(f"{label:>22} {density:>8.0%} {len(query.split()):>13} {naive:>10.3f} {single_pass:>15.3f} {naive / single_pass:>5.1f}x")
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
@@ -0,0 +1,340 @@
+# chat/answers.py
+import random
+from functools import lru_cache
+
+from chat.knowledge_base import default_knowledge_base
+
+# Modèles de réponses pour différents types de questions
+RESPONSE_TEMPLATES = {
+    'greeting': [
+        "Bonjour ! Comment puis-je vous aider avec la maintenance des chaudières aujourd'hui ?",
+        "Salut ! Je suis là pour répondre à vos questions sur les AMDEC et la maintenance des chaudières.",
+        "Bonjour, que puis-je faire pour vous concernant les chaudières et leur maintenance ?"
+    ],
+    'farewell': [
+        "Au revoir ! N'hésitez pas à revenir si vous avez d'autres questions.",
+        "À bientôt ! J'espère avoir pu vous aider.",
+        "Bonne journée ! Je reste disponible pour toute autre question sur les chaudières."
+    ],
+    'component_info': [
+        "Le {component} est un élément important de la chaudière. {info}",
+        "Concernant le {component}, voici ce que je peux vous dire : {info}",
+        "Informations sur le {component} : {info}"
+    ],
+    'failure_mode': [
+        "Les modes de défaillance courants pour {component} - {subcomponent} incluent : {modes}",
+        "Pour {component} - {subcomponent}, voici les défaillances typiques : {modes}",
+        "Le {component} - {subcomponent} peut présenter les défaillances suivantes : {modes}"
+    ],
+    'maintenance': [
+        "Pour la maintenance de {component} - {subcomponent}, je recommande : {maintenance}",
+        "Voici les opérations de maintenance recommandées pour {component} - {subcomponent} : {maintenance}",
+        "La maintenance de {component} - {subcomponent} nécessite : {maintenance}"
+    ],
+    'criticality': [
+        "La criticité de {component} - {subcomponent} est de {criticality}. {interpretation}",
+        "Pour {component} - {subcomponent}, l'indice de criticité est de {criticality}. {interpretation}",
+        "Avec une criticité de {criticality}, {component} - {subcomponent} {interpretation}"
+    ],
+    'image_match': [
+        "Cette photo ressemble le plus à : {matches}",
+        "Références visuelles les plus proches de votre photo : {matches}",
+        "D'après la bibliothèque d'images, votre photo se rapproche de : {matches}"
+    ],
+    'not_understood': [
+        "Je ne suis pas sûr de comprendre votre question. Pouvez-vous reformuler ?",
+        "Désolé, je n'ai pas bien saisi votre demande. Pourriez-vous préciser ?",
+        "Je ne comprends pas complètement. Pouvez-vous me donner plus de détails ?"
+    ]
+}
+
+# Types de réponses dépendant uniquement du composant et du sous-composant
+ANSWER_KINDS = ('component_info', 'failure_mode', 'maintenance', 'criticality')
+
+def display_names(component, subcomponent):
+    """
+    Formate les noms du composant et du sous-composant pour l'affichage
+    
+    Args:
+        component (str): Nom du composant
+        subcomponent (str): Nom du sous-composant
+    
+    Returns:
+        tuple: (composant affiché, sous-composant affiché)
+    """
+    component_display = component.replace('economiseur', 'Économiseur').replace('surchauffeur', 'Surchauffeur').replace('rechauffeur', 'Réchauffeur')
+    subcomponent_display = subcomponent.replace('entree', 'entrée').replace('epingle', 'épingle')
+    
+    return component_display, subcomponent_display
+
+class AnswerTable:
+    """
+    Table des réponses rendues pour chaque (type de réponse, composant, sous-composant)
+    
+    Hormis le choix aléatoire du modèle, une réponse ne dépend que de son type,
+    du composant et du sous-composant : ses fragments (modes de défaillance,
+    opérations, fréquence, interprétation de la criticité...) sont rendus une
+    seule fois dans chacun des modèles. Répondre à une question reconnue revient
+    alors à une recherche dans un dictionnaire suivie du tirage d'un modèle.
+    """
+    
+    def __init__(self, knowledge_base=None, templates=None, precompute=True, memoize=True):
+        """
+        Initialisation de la table
+        
+        Args:
+            knowledge_base (KnowledgeBase, optional): Base de connaissances.
+                Si non fournie, la base partagée du projet sera utilisée.
+            templates (dict, optional): Modèles de réponses. Si non fournis, RESPONSE_TEMPLATES.
+            precompute (bool, optional): Si True, rend toutes les combinaisons connues dès l'initialisation
+            memoize (bool, optional): Si False, chaque réponse est rendue à nouveau (pour comparaison)
+        """
+        self.knowledge_base = knowledge_base if knowledge_base is not None else default_knowledge_base()
+        self.templates = templates if templates is not None else RESPONSE_TEMPLATES
+        self.memoize = memoize
+        self.answers = {}
+        
+        if precompute and memoize:
+            for component, subcomponents in self.knowledge_base.subcomponents.items():
+                for subcomponent in subcomponents:
+                    for kind in ANSWER_KINDS:
+                        self.get(kind, component, subcomponent)
+    
+    def get(self, kind, component, subcomponent):
+        """
+        Récupère les variantes rendues d'une réponse, calculées au premier appel
+        
+        Args:
+            kind (str): Type de réponse (voir ANSWER_KINDS)
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: Une réponse complète par modèle
+        """
+        key = (kind, component, subcomponent)
+        
+        answers = self.answers.get(key)
+        if answers is None:
+            answers = self.render(kind, component, subcomponent)
+            if self.memoize:
+                self.answers[key] = answers
+        
+        return answers
+    
+    def choose(self, kind, component, subcomponent):
+        """
+        Tire une réponse parmi les variantes rendues
+        
+        Args:
+            kind (str): Type de réponse (voir ANSWER_KINDS)
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            str: Réponse
+        """
+        answers = self.get(kind, component, subcomponent)
+        
+        # Réponse fixe : pas de tirage
+        if len(answers) == 1:
+            return answers[0]
+        
+        return random.choice(answers)
+    
+    def render(self, kind, component, subcomponent):
+        """
+        Rend une réponse dans chacun des modèles de son type
+        
+        Args:
+            kind (str): Type de réponse (voir ANSWER_KINDS)
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: Une réponse complète par modèle
+        """
+        if kind not in ANSWER_KINDS:
+            raise ValueError(f"Type de réponse inconnu : {kind}. Valeurs possibles : {', '.join(ANSWER_KINDS)}")
+        
+        fields, suffix = getattr(self, f"_{kind}_fragments")(component, subcomponent)
+        
+        # Réponse fixe, sans modèle
+        if fields is None:
+            return (suffix,)
+        
+        return tuple(template.format(**fields) + suffix for template in self.templates[kind])
+    
+    def _component_info_fragments(self, component, subcomponent):
+        """
+        Fragments d'une réponse d'informations générales sur un composant
+        
+        Args:
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: (champs du modèle ou None pour une réponse fixe, texte ajouté après le modèle)
+        """
+        component_display, subcomponent_display = display_names(component, subcomponent)
+        
+        # Vérifier si les données du composant sont disponibles
+        comp_data = self.knowledge_base.component_data(component)
+        if comp_data is not None:
+            # Construire une réponse informative
+            info = f"{comp_data.get('description_simple', '')} "
+            
+            # Ajouter des informations sur les matériaux si disponibles
+            if 'matériaux' in comp_data:
+                material_info = []
+                for mat_type, mat_value in comp_data['matériaux'].items():
+                    material_info.append(f"{mat_type}: {mat_value}")
+                
+                if material_info:
+                    info += f"Il est fabriqué avec {', '.join(material_info)}. "
+            
+            # Ajouter des informations sur la structure si disponibles
+            if 'structure' in comp_data:
+                structure_info = []
+                for struct_type, struct_value in comp_data['structure'].items():
+                    if isinstance(struct_value, (list, tuple)):
+                        structure_info.append(f"{struct_type}: {', '.join(struct_value)}")
+                    else:
+                        structure_info.append(f"{struct_type}: {struct_value}")
+                
+                if structure_info:
+                    info += f"Sa structure comprend {', '.join(structure_info)}. "
+            
+            # Ajouter des informations sur le sous-composant si disponibles
+            subcmp_info = ""
+            if 'AMDEC' in comp_data:
+                subcmp_info = f"Le {subcomponent_display} est susceptible de subir des défaillances comme {comp_data['AMDEC'].get('mode_defaillance', '')}. "
+            
+            return {'component': component_display, 'info': info + subcmp_info}, ""
+        
+        # Réponse par défaut si les données ne sont pas disponibles
+        return None, f"Le {component_display} est un composant important de la chaudière. Le {subcomponent_display} est un élément critique qui nécessite une attention particulière lors de la maintenance."
+    
+    def _failure_mode_fragments(self, component, subcomponent):
+        """
+        Fragments d'une réponse sur les modes de défaillance d'un composant
+        
+        Args:
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: (champs du modèle, texte ajouté après le modèle)
+        """
+        component_display, subcomponent_display = display_names(component, subcomponent)
+        
+        # Modes de défaillance connus (modes génériques à défaut)
+        modes = self.knowledge_base.entry(component, subcomponent).failure_modes
+        
+        # Ajouter des informations supplémentaires
+        causes = ""
+        effects = ""
+        
+        # Vérifier si les données AMDEC sont disponibles
+        comp_data = self.knowledge_base.component_data(component)
+        if comp_data is not None and 'AMDEC' in comp_data:
+            amdec_data = comp_data['AMDEC']
+            
+            if 'causes' in amdec_data:
+                causes = f" Ces défaillances sont souvent causées par {', '.join(amdec_data['causes'])}."
+            
+            if 'mode_defaillance' in amdec_data:
+                effects = f" Le mode de défaillance principal est {amdec_data['mode_defaillance']}."
+        
+        fields = {
+            'component': component_display,
+            'subcomponent': subcomponent_display,
+            'modes': ', '.join(modes)
+        }
+        
+        return fields, causes + effects
+    
+    def _maintenance_fragments(self, component, subcomponent):
+        """
+        Fragments d'une réponse sur la maintenance d'un composant
+        
+        Args:
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: (champs du modèle, texte ajouté après le modèle)
+        """
+        component_display, subcomponent_display = display_names(component, subcomponent)
+        
+        # Opérations de maintenance connues (opérations génériques à défaut) et fréquence
+        ops = self.knowledge_base.entry(component, subcomponent).maintenance_ops
+        frequency = self.knowledge_base.frequency(component)
+        
+        # Construire la réponse
+        maintenance_text = f"La maintenance {frequency} devrait inclure : {', '.join(ops)}."
+        
+        # Ajouter des informations supplémentaires si disponibles
+        equipment_info = ""
+        
+        # Vérifier si les données du composant sont disponibles
+        comp_data = self.knowledge_base.component_data(component)
+        if comp_data is not None and 'maintenance' in comp_data:
+            maint_data = comp_data['maintenance']
+            
+            if 'personnel' in maint_data:
+                equipment_info = f" Cette maintenance devrait être effectuée par {', '.join(maint_data['personnel'])}."
+        
+        fields = {
+            'component': component_display,
+            'subcomponent': subcomponent_display,
+            'maintenance': maintenance_text
+        }
+        
+        return fields, equipment_info
+    
+    def _criticality_fragments(self, component, subcomponent):
+        """
+        Fragments d'une réponse sur la criticité d'un composant
+        
+        Args:
+            component (str): Nom du composant
+            subcomponent (str): Nom du sous-composant
+        
+        Returns:
+            tuple: (champs du modèle, texte ajouté après le modèle)
+        """
+        component_display, subcomponent_display = display_names(component, subcomponent)
+        
+        # Récupérer la criticité (valeur par défaut si elle n'est pas connue)
+        criticality = self.knowledge_base.entry(component, subcomponent).criticality
+        
+        # Interprétation de la criticité
+        interpretation = ""
+        if criticality <= 12:
+            interpretation = "présente une criticité négligeable. Une maintenance corrective est suffisante."
+        elif criticality <= 16:
+            interpretation = "présente une criticité moyenne. Une maintenance préventive systématique est recommandée."
+        elif criticality <= 20:
+            interpretation = "présente une criticité élevée. Une maintenance préventive conditionnelle est nécessaire."
+        else:
+            interpretation = "présente une criticité interdite. Une remise en cause complète de la conception est requise."
+        
+        fields = {
+            'component': component_display,
+            'subcomponent': subcomponent_display,
+            'criticality': criticality,
+            'interpretation': interpretation
+        }
+        
+        return fields, ""
+
+@lru_cache(maxsize=1)
+def default_answer_table():
+    """
+    Récupère la table des réponses du projet, calculée une seule fois par processus
+    
+    Returns:
+        AnswerTable: Table partagée par toutes les sessions
+    """
+    return AnswerTable()
\ No newline at end of file
@@ -0,0 +1,187 @@
+# chat/knowledge_base.py
+import os
+import json
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+# Connaissances d'un sous-composant : modes de défaillance, opérations de maintenance et criticité
+KnowledgeEntry = namedtuple('KnowledgeEntry', ['failure_modes', 'maintenance_ops', 'criticality'])
+
+class KnowledgeBase:
+    """
+    Base de connaissances du chatbot, immuable et partagée
+    
+    Les modes de défaillance, opérations de maintenance, criticités et
+    fréquences sont lus une fois dans data/knowledge_base.json, avec les
+    descriptions de chaudiere_data.json si le fichier existe. Les données sont
+    figées (tuples, dictionnaires en lecture seule) et indexées par couple
+    (composant, sous-composant) : une même instance peut être partagée par
+    toutes les sessions du processus (voir default_knowledge_base).
+    """
+    
+    __slots__ = ('defaults', 'entries', 'frequencies', 'subcomponents', 'components_data')
+    
+    def __init__(self, knowledge=None, components_data=None):
+        """
+        Initialisation de la base
+        
+        Args:
+            knowledge (dict, optional): Contenu de knowledge_base.json (clés 'defaults' et 'components')
+            components_data (dict, optional): Contenu de chaudiere_data.json
+        """
+        knowledge = knowledge or {}
+        defaults = knowledge.get('defaults', {})
+        components = knowledge.get('components', {})
+        
+        values = {
+            'defaults': KnowledgeEntry(
+                tuple(defaults.get('failure_modes', [])),
+                tuple(defaults.get('maintenance_ops', [])),
+                defaults.get('criticality', 0)
+            ),
+            'entries': MappingProxyType({
+                (component, subcomponent): KnowledgeEntry(
+                    tuple(entry.get('failure_modes', [])),
+                    tuple(entry.get('maintenance_ops', [])),
+                    entry.get('criticality', 0)
+                )
+                for component, component_data in components.items()
+                for subcomponent, entry in component_data.get('subcomponents', {}).items()
+            }),
+            'frequencies': MappingProxyType({
+                component: component_data.get('frequency', defaults.get('frequency', 'régulière'))
+                for component, component_data in components.items()
+            }),
+            # Ordre des sous-composants conservé : le premier est retenu par défaut
+            'subcomponents': MappingProxyType({
+                component: tuple(component_data.get('subcomponents', {}))
+                for component, component_data in components.items()
+            }),
+            'components_data': _freeze((components_data or {}).get('chaudiere', {}))
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("La base de connaissances ne peut pas être modifiée")
+    
+    @classmethod
+    def load(cls, data_dir=None):
+        """
+        Charge la base depuis le répertoire de données
+        
+        Args:
+            data_dir (str, optional): Répertoire contenant knowledge_base.json et chaudiere_data.json.
+                Si non fourni, le répertoire data du projet sera utilisé.
+        
+        Returns:
+            KnowledgeBase: Base chargée (vide pour les fichiers absents ou illisibles)
+        """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        
+        return cls(
+            _read_json(os.path.join(data_dir, 'knowledge_base.json')),
+            _read_json(os.path.join(data_dir, 'chaudiere_data.json'))
+        )
+    
+    @property
+    def components(self):
+        """
+        tuple: Composants connus, dans l'ordre du fichier
+        """
+        return tuple(self.subcomponents)
+    
+    def entry(self, component, subcomponent):
+        """
+        Récupère les connaissances d'un sous-composant
+        
+        Args:
+            component (str): Nom du composant ('economiseur bt'...)
+            subcomponent (str): Nom du sous-composant ('epingle'...)
+        
+        Returns:
+            KnowledgeEntry: Connaissances du sous-composant, complétées par les
+                valeurs par défaut lorsqu'elles manquent
+        """
+        entry = self.entries.get((component, subcomponent))
+        if entry is None:
+            return self.defaults
+        
+        return KnowledgeEntry(
+            entry.failure_modes or self.defaults.failure_modes,
+            entry.maintenance_ops or self.defaults.maintenance_ops,
+            entry.criticality or self.defaults.criticality
+        )
+    
+    def frequency(self, component):
+        """
+        Récupère la fréquence de maintenance d'un composant
+        
+        Args:
+            component (str): Nom du composant
+        
+        Returns:
+            str: Fréquence ('trimestrielle', 'semestrielle'...)
+        """
+        return self.frequencies.get(component, 'régulière')
+    
+    def component_data(self, component):
+        """
+        Récupère la description d'un composant issue de chaudiere_data.json
+        
+        Args:
+            component (str): Nom du composant
+        
+        Returns:
+            mappingproxy: Description en lecture seule, ou None si elle n'est pas disponible
+        """
+        return self.components_data.get(component)
+
+def _read_json(path):
+    """
+    Lit un fichier JSON
+    
+    Args:
+        path (str): Chemin du fichier
+    
+    Returns:
+        dict: Contenu du fichier, ou None s'il n'existe pas ou est illisible
+    """
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Erreur lors du chargement de {path} : {str(e)}")
+        return None
+
+def _freeze(value):
+    """
+    Convertit récursivement des données JSON en structures immuables
+    
+    Args:
+        value: Données (dictionnaires, listes, valeurs simples)
+    
+    Returns:
+        Données équivalentes (dictionnaires en lecture seule, tuples)
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    
+    return value
+
+@lru_cache(maxsize=1)
+def default_knowledge_base():
+    """
+    Récupère la base de connaissances du projet, chargée une seule fois par processus
+    
+    Returns:
+        KnowledgeBase: Base partagée par toutes les sessions
+    """
+    return KnowledgeBase.load()
\ No newline at end of file
@@ -0,0 +1,162 @@
+# chat/matcher.py
+from collections import deque, namedtuple
+
+from rag.metadata import normalize_text
+
+# Expression reconnue dans un message : position dans le texte normalisé, type et valeur canonique
+Match = namedtuple('Match', ['start', 'end', 'kind', 'value', 'phrase'])
+
+class PhraseMatcher:
+    """
+    Reconnaissance des entités et intentions d'un message en une seule passe
+    
+    Toutes les expressions (noms de composants, alias, mots-clés d'intention...)
+    sont compilées une fois dans un automate d'Aho-Corasick. Le message est
+    normalisé comme les expressions (minuscules, sans accents ni ponctuation,
+    voir normalize_text), puis parcouru une seule fois caractère par caractère :
+    le coût d'analyse dépend de la longueur du message et non du nombre
+    d'expressions du vocabulaire.
+    
+    Une expression doit commencer au début d'un mot ('hi' ne reconnaît pas
+    'chimique') mais peut se prolonger dans le mot ('panne' reconnaît 'pannes').
+    Lorsque des expressions se chevauchent, la plus à gauche puis la plus longue
+    est retenue ('collecteur de sortie' plutôt que 'collecteur').
+    """
+    
+    def __init__(self):
+        """
+        Initialisation d'un automate vide
+        """
+        # Transitions, lien d'échec et expressions reconnues de chaque état
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.entries = []
+        self.compiled = True
+    
+    def add(self, phrase, kind, value):
+        """
+        Ajoute une expression au vocabulaire
+        
+        Args:
+            phrase (str): Expression telle qu'écrite par les utilisateurs ("collecteur d'entrée")
+            kind (str): Type de l'expression ('component', 'intent'...)
+            value (str): Valeur canonique renvoyée lorsqu'elle est reconnue
+        """
+        normalized = normalize_text(phrase)
+        if not normalized:
+            return
+        
+        state = 0
+        for char in normalized:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        
+        self.outputs[state].append(len(self.entries))
+        self.entries.append((len(normalized), kind, value, normalized))
+        self.compiled = False
+    
+    def add_all(self, phrases, kind):
+        """
+        Ajoute un ensemble d'expressions d'un même type
+        
+        Args:
+            phrases (dict or iterable): Expression -> valeur canonique, ou expressions
+                servant de valeur canonique
+            kind (str): Type des expressions
+        """
+        items = phrases.items() if isinstance(phrases, dict) else ((phrase, phrase) for phrase in phrases)
+        
+        for phrase, value in items:
+            self.add(phrase, kind, value)
+    
+    def compile(self):
+        """
+        Calcule les liens d'échec de l'automate (parcours en largeur)
+        
+        Returns:
+            PhraseMatcher: L'automate lui-même
+        """
+        # Les états de profondeur 1 échouent vers la racine
+        queue = deque(self.transitions[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                # Les expressions reconnues par le lien d'échec le sont aussi par cet état
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+                queue.append(next_state)
+        
+        self.compiled = True
+        
+        return self
+    
+    def scan(self, text):
+        """
+        Recherche les expressions du vocabulaire dans un texte
+        
+        Args:
+            text (str): Message de l'utilisateur
+        
+        Returns:
+            list: Expressions reconnues (Match), dans l'ordre du texte normalisé,
+                sans chevauchement
+        """
+        if not self.compiled:
+            self.compile()
+        
+        text = normalize_text(text)
+        candidates = []
+        state = 0
+        
+        for position, char in enumerate(text):
+            while state and char not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(char, 0)
+            
+            for entry in self.outputs[state]:
+                length, kind, value, phrase = self.entries[entry]
+                start = position + 1 - length
+                # L'expression doit commencer au début d'un mot
+                if start == 0 or text[start - 1] == ' ':
+                    candidates.append(Match(start, position + 1, kind, value, phrase))
+        
+        # Sélection de gauche à droite, la plus longue expression d'abord
+        candidates.sort(key=lambda match: (match.start, -match.end))
+        matches = []
+        end = 0
+        for match in candidates:
+            if match.start >= end:
+                matches.append(match)
+                end = match.end
+        
+        return matches
+    
+    def find(self, text):
+        """
+        Regroupe par type les valeurs reconnues dans un texte
+        
+        Args:
+            text (str): Message de l'utilisateur
+        
+        Returns:
+            dict: Type -> valeurs canoniques distinctes, dans l'ordre du texte
+        """
+        found = {}
+        
+        for match in self.scan(text):
+            values = found.setdefault(match.kind, [])
+            if match.value not in values:
+                values.append(match.value)
+        
+        return found
\ No newline at end of file
@@ -0,0 +1,326 @@
+# data_processing/image_catalog.py
+import os
+import json
+from functools import lru_cache
+from PIL import Image
+
+from rag.extractors import hash_file
+from rag.metadata import EQUIPMENT_ALIASES, normalize_text, find_components, find_subcomponents
+
+# Extensions des images cataloguées
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+# Facettes indexées pour chaque image
+IMAGE_FACETS = ('category', 'component', 'subcomponent', 'tag')
+
+class ImageCatalog:
+    """
+    Catalogue des images de référence (anomalies, défauts, inspections, composants...)
+    
+    Le catalogue est construit une fois et enregistré dans le répertoire de
+    cache : pour chaque image, son chemin, ses dimensions (lues dans l'en-tête,
+    sans décoder l'image), son empreinte et ses étiquettes tirées du dossier et
+    du nom de fichier. Aux chargements suivants, seules les images ajoutées ou
+    modifiées sont relues. Des index par facette donnent directement les images
+    d'un composant, d'un sous-composant, d'une catégorie ou d'une étiquette, et
+    des miniatures sont conservées sur disque.
+    """
+    
+    CATALOG_FILE = 'catalog.json'
+    
+    def __init__(self, image_dir=None, cache_dir=None, thumbnail_size=(256, 256)):
+        """
+        Initialisation et chargement du catalogue
+        
+        Args:
+            image_dir (str, optional): Répertoire des images.
+                Si non fourni, le répertoire image du projet sera utilisé.
+            cache_dir (str, optional): Répertoire du catalogue et des miniatures.
+                Si non fourni, le répertoire data/image_cache du projet sera utilisé.
+            thumbnail_size (tuple, optional): Taille maximale des miniatures (largeur, hauteur)
+        """
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        
+        self.image_dir = image_dir if image_dir is not None else os.path.join(project_dir, 'image')
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(project_dir, 'data', 'image_cache')
+        self.thumbnail_dir = os.path.join(self.cache_dir, 'thumbnails')
+        self.thumbnail_size = tuple(thumbnail_size)
+        
+        # Chemins relatifs au répertoire parent des images ('image/anomalies/...')
+        self.base_dir = os.path.dirname(os.path.abspath(self.image_dir))
+        
+        self.images = {}
+        self.facets = {facet: {} for facet in IMAGE_FACETS}
+        
+        self.load()
+    
+    def load(self):
+        """
+        Charge le catalogue enregistré et le met à jour à partir des fichiers présents
+        
+        Returns:
+            int: Nombre d'images ajoutées ou relues
+        """
+        known = {}
+        catalog_path = os.path.join(self.cache_dir, self.CATALOG_FILE)
+        
+        if os.path.exists(catalog_path):
+            try:
+                with open(catalog_path, 'r', encoding='utf-8') as f:
+                    known = {entry['path']: entry for entry in json.load(f)['images']}
+            except Exception as e:
+                print(f"Erreur lors du chargement du catalogue d'images {catalog_path} : {str(e)}")
+        
+        images = {}
+        changed = 0
+        
+        for filepath in self._list_images():
+            path = os.path.relpath(filepath, self.base_dir).replace(os.sep, '/')
+            stat = os.stat(filepath)
+            entry = known.get(path)
+            
+            # Taille et date inchangées : l'image n'est pas relue
+            if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+                try:
+                    entry = self._describe(filepath, path, stat)
+                except Exception as e:
+                    print(f"Erreur lors de la lecture de l'image {filepath} : {str(e)}")
+                    continue
+                changed += 1
+            
+            images[path] = entry
+        
+        self.images = images
+        self._build_facets()
+        
+        if changed or len(images) != len(known):
+            self.save()
+        
+        return changed
+    
+    def save(self):
+        """
+        Enregistre le catalogue dans le répertoire de cache
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        catalog_path = os.path.join(self.cache_dir, self.CATALOG_FILE)
+        tmp_path = catalog_path + '.tmp'
+        
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'images': list(self.images.values())}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, catalog_path)
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement du catalogue d'images {catalog_path} : {str(e)}")
+    
+    def _list_images(self):
+        """
+        Liste les images du répertoire, triées par chemin
+        
+        Returns:
+            list: Chemins des images
+        """
+        filepaths = []
+        
+        for root, _, files in os.walk(self.image_dir):
+            for filename in files:
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    filepaths.append(os.path.join(root, filename))
+        
+        return sorted(filepaths)
+    
+    def _describe(self, filepath, path, stat):
+        """
+        Décrit une image : dimensions, empreinte et étiquettes
+        
+        Args:
+            filepath (str): Chemin du fichier
+            path (str): Chemin relatif enregistré dans le catalogue
+            stat (os.stat_result): Résultat de os.stat
+        
+        Returns:
+            dict: Entrée du catalogue
+        """
+        # Image.open ne lit que l'en-tête : les pixels ne sont pas décodés
+        with Image.open(filepath) as image:
+            width, height = image.size
+            image_format = image.format
+        
+        folders = path.split('/')[1:-1]
+        name = normalize_text(os.path.splitext(os.path.basename(path))[0])
+        text = ' '.join([normalize_text(folder) for folder in folders] + [name])
+        
+        return {
+            'path': path,
+            'width': width,
+            'height': height,
+            'format': image_format,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': hash_file(filepath),
+            # Dossier de premier niveau : anomalies, defauts, inspections, composants...
+            'category': normalize_text(folders[0]) if folders else '',
+            'component': find_components(text, EQUIPMENT_ALIASES),
+            'subcomponent': find_subcomponents(text),
+            'tags': sorted({word for word in text.split() if len(word) > 2 and not word.isdigit()})
+        }
+    
+    def _build_facets(self):
+        """
+        Reconstruit les index des images par facette
+        """
+        self.facets = {facet: {} for facet in IMAGE_FACETS}
+        
+        for path, entry in self.images.items():
+            values = {
+                'category': [entry['category']],
+                'component': entry['component'],
+                'subcomponent': entry['subcomponent'],
+                'tag': entry['tags']
+            }
+            for facet, facet_values in values.items():
+                for value in facet_values:
+                    self.facets[facet].setdefault(value, []).append(path)
+    
+    def get(self, path):
+        """
+        Récupère l'entrée d'une image
+        
+        Args:
+            path (str): Chemin relatif de l'image ('image/anomalies/eclatement.png')
+        
+        Returns:
+            dict: Entrée du catalogue, ou None si l'image est inconnue
+        """
+        return self.images.get(path)
+    
+    def find(self, **filters):
+        """
+        Recherche les images correspondant à des filtres
+        
+        Args:
+            **filters: Facette ('category', 'component', 'subcomponent' ou 'tag') -> valeur
+        
+        Returns:
+            list: Chemins relatifs des images, triés
+        """
+        selected = None
+        
+        for facet, value in filters.items():
+            if facet not in self.facets:
+                raise ValueError(f"Filtre inconnu : {facet}. Valeurs possibles : {', '.join(IMAGE_FACETS)}")
+            if value is None:
+                continue
+            
+            paths = set(self.facets[facet].get(self._normalize_value(facet, value), []))
+            selected = paths if selected is None else selected & paths
+        
+        if selected is None:
+            selected = self.images
+        
+        return sorted(selected)
+    
+    def images_for(self, component, subcomponent=None, limit=None, other_components=False):
+        """
+        Récupère les images à joindre pour un composant et un sous-composant
+        
+        Les images du sous-composant sur ce composant viennent en premier, puis
+        celles du composant. Les images du sous-composant prises sur d'autres
+        composants ne sont ajoutées, à la suite, que sur demande.
+        
+        Args:
+            component (str): Nom du composant ('economiseur bt', 'Économiseur BT'...)
+            subcomponent (str, optional): Nom du sous-composant
+            limit (int, optional): Nombre maximal d'images
+            other_components (bool, optional): Si True, ajoute les images du
+                sous-composant sur d'autres composants
+                
+        Returns:
+            list: Chemins relatifs des images
+        """
+        component_images = self.find(component=component)
+        
+        if subcomponent:
+            subcomponent_images = self.find(subcomponent=subcomponent)
+            both = set(component_images) & set(subcomponent_images)
+            paths = (
+                [path for path in subcomponent_images if path in both]
+                + [path for path in component_images if path not in both]
+            )
+            if other_components:
+                paths += [path for path in subcomponent_images if path not in both]
+        else:
+            paths = component_images
+        
+        return paths[:limit] if limit is not None else paths
+    
+    def thumbnail(self, path):
+        """
+        Récupère la miniature d'une image, créée au premier appel puis lue depuis le cache
+        
+        Args:
+            path (str): Chemin relatif de l'image
+        
+        Returns:
+            str: Chemin du fichier de la miniature, ou None si l'image est inconnue ou illisible
+        """
+        entry = self.images.get(path)
+        if entry is None:
+            return None
+        
+        # L'empreinte du contenu nomme la miniature : une image modifiée en obtient une nouvelle
+        width, height = self.thumbnail_size
+        thumbnail_path = os.path.join(self.thumbnail_dir, f"{entry['hash']}_{width}x{height}.png")
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+        
+        try:
+            os.makedirs(self.thumbnail_dir, exist_ok=True)
+            with Image.open(os.path.join(self.base_dir, path)) as image:
+                # draft permet aux formats compressés (JPEG) de ne décoder qu'une version réduite
+                image.draft('RGB', self.thumbnail_size)
+                if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+                    image = image.convert('RGB')
+                image.thumbnail(self.thumbnail_size)
+                image.save(thumbnail_path + '.tmp', format='PNG')
+            os.replace(thumbnail_path + '.tmp', thumbnail_path)
+        except Exception as e:
+            print(f"Erreur lors de la création de la miniature de {path} : {str(e)}")
+            return None
+        
+        return thumbnail_path
+    
+    @staticmethod
+    def _normalize_value(facet, value):
+        """
+        Normalise une valeur de filtre ('Économiseur BT' -> 'economiseur bt')
+        
+        Args:
+            facet (str): Nom de la facette
+            value (str): Valeur fournie
+        
+        Returns:
+            str: Valeur sous la forme stockée dans le catalogue
+        """
+        text = normalize_text(value)
+        
+        if facet == 'component':
+            components = find_components(text, EQUIPMENT_ALIASES)
+            if components:
+                return components[0]
+        if facet == 'subcomponent':
+            subcomponents = find_subcomponents(text)
+            if subcomponents:
+                return subcomponents[0]
+        
+        return text
+
+@lru_cache(maxsize=1)
+def default_catalog():
+    """
+    Récupère le catalogue des images du projet, chargé une seule fois par processus
+    
+    Returns:
+        ImageCatalog: Catalogue du répertoire image du projet
+    """
+    return ImageCatalog()
\ No newline at end of file
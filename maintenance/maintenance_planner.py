@@ -11,6 +11,11 @@ from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.table import _Cell
 import re
 
+from data_processing.image_catalog import default_catalog
+
+# Nombre maximal d'images jointes à une gamme
+MAX_IMAGES = 2
+
 class MaintenancePlanner:
     """
     Classe pour générer des gammes de maintenance à partir des données AMDEC
@@ -28,36 +33,8 @@ class MaintenancePlanner:
         self.maintenance_data = {}
         self.output_path = None
         
-        # Mappings des composants et sous-composants pour les chemins d'images
-        self.image_mappings = {
-            'economiseur bt': {
-                'collecteur sortie': ['eco_bt_collecteur_1.png', 'eco_bt_collecteur_2.png'],
-                'epingle': ['eco_bt_epingle_1.png', 'eco_bt_epingle_2.png']
-            },
-            'economiseur ht': {
-                'collecteur entree': ['eco_ht_collecteur_1.png', 'eco_ht_collecteur_2.png'],
-                'tubes suspension': ['eco_ht_tubes_1.png', 'eco_ht_tubes_2.png']
-            },
-            'surchauffeur bt': {
-                'epingle': ['sur_bt_epingle_1.png', 'sur_bt_epingle_2.png'],
-                'collecteur entree': ['sur_bt_collecteur_1.png', 'sur_bt_collecteur_2.png']
-            },
-            'surchauffeur ht': {
-                'tube porteur': ['sur_ht_tube_1.png', 'sur_ht_tube_2.png'],
-                'branches entree': ['sur_ht_branches_1.png', 'sur_ht_branches_2.png'],
-                'collecteur sortie': ['sur_ht_collecteur_1.png', 'sur_ht_collecteur_2.png']
-            },
-            'rechauffeur bt': {
-                'collecteur entree': ['rch_bt_collecteur_1.png', 'rch_bt_collecteur_2.png'],
-                'tubes suspension': ['rch_bt_tubes_1.png', 'rch_bt_tubes_2.png'],
-                'tube porteur': ['rch_bt_porteur_1.png', 'rch_bt_porteur_2.png']
-            },
-            'rechauffeur ht': {
-                'branches sortie': ['rch_ht_branches_1.png', 'rch_ht_branches_2.png'],
-                'collecteur entree': ['rch_ht_collecteur_1.png', 'rch_ht_collecteur_2.png'],
-                'collecteur sortie': ['rch_ht_collecteur_sortie_1.png', 'rch_ht_collecteur_sortie_2.png']
-            }
-        }
+        # Catalogue des images (chemins, dimensions, étiquettes), chargé à la première demande
+        self.image_catalog = None
     
     def get_criticality(self, component, subcomponent):
         """
@@ -588,24 +565,11 @@ class MaintenancePlanner:
         Returns:
             list: Liste des chemins d'images
         """
-        # Vérifier si le composant et le sous-composant sont dans les mappings
-        if component in self.image_mappings and subcomponent in self.image_mappings[component]:
-            image_names = self.image_mappings[component][subcomponent]
-            
-            # Créer les chemins complets
-            image_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'image')
-            
-            # Vérifier si le dossier existe
-            if not os.path.exists(image_dir):
-                os.makedirs(image_dir, exist_ok=True)
-            
-            # Créer des chemins relatifs
-            image_paths = [os.path.join('image', img) for img in image_names]
-            
-            return image_paths
+        if self.image_catalog is None:
+            self.image_catalog = default_catalog()
         
-        # Retourner une liste vide si pas d'images disponibles
-        return []
+        # Images du sous-composant sur ce composant, puis du composant (chemins relatifs)
+        return self.image_catalog.images_for(component, subcomponent, limit=MAX_IMAGES)
     
     def save_to_file(self, output_path=None):
         """
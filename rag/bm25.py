@@ -0,0 +1,165 @@
+# rag/bm25.py
+import numpy as np
+from scipy import sparse
+
+class BM25Index:
+    """
+    Index inversé avec score BM25
+    
+    Les listes de postings sont stockées dans une matrice CSC (une colonne par
+    terme) : pour un terme, indices donne les passages qui le contiennent et data
+    le poids BM25 précalculé du terme dans chaque passage. Le score d'une requête
+    est la somme des poids de ses termes et ne parcourt que leurs postings.
+    """
+    
+    def __init__(self, counts, postings, k1=1.2, b=0.75):
+        """
+        Initialisation de l'index
+        
+        Args:
+            counts (scipy.sparse.csr_matrix): Fréquences des termes (passages x termes)
+            postings (scipy.sparse.csc_matrix): Poids BM25 (passages x termes)
+            k1 (float, optional): Saturation de la fréquence des termes
+            b (float, optional): Normalisation par la longueur des passages
+        """
+        self.counts = counts
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        
+        # Copie CSR des poids (une ligne par passage), créée à la première recherche filtrée
+        self._rows = None
+        
+    @classmethod
+    def build(cls, counts, k1=1.2, b=0.75):
+        """
+        Construit l'index à partir des fréquences des termes
+        
+        Args:
+            counts (scipy.sparse matrix): Fréquences des termes (passages x termes)
+            k1 (float, optional): Saturation de la fréquence des termes
+            b (float, optional): Normalisation par la longueur des passages
+        
+        Returns:
+            BM25Index: Index construit
+        """
+        counts = sparse.csr_matrix(counts, dtype=np.int32)
+        n_passages = counts.shape[0]
+        
+        # Longueur des passages et fréquence documentaire des termes
+        lengths = np.asarray(counts.sum(axis=1)).ravel().astype(np.float64)
+        avg_length = lengths.mean() if n_passages else 0.0
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log(1.0 + (n_passages - document_frequency + 0.5) / (document_frequency + 0.5))
+        
+        # Poids BM25 de chaque posting
+        rows = np.repeat(np.arange(n_passages), np.diff(counts.indptr))
+        tf = counts.data.astype(np.float64)
+        norm = k1 * (1.0 - b + b * lengths[rows] / max(avg_length, 1e-9))
+        weights = idf[counts.indices] * tf * (k1 + 1.0) / (tf + norm)
+        
+        postings = sparse.csr_matrix(
+            (weights.astype(np.float32), counts.indices, counts.indptr),
+            shape=counts.shape
+        ).tocsc()
+        postings.sort_indices()
+        
+        return cls(counts, postings, k1, b)
+    
+    @classmethod
+    def from_arrays(cls, arrays, params):
+        """
+        Reconstruit l'index à partir des tableaux stockés
+        
+        Args:
+            arrays (dict): Tableaux annexes de l'index
+            params (dict): Paramètres de l'index ('shape', 'k1', 'b')
+        
+        Returns:
+            BM25Index: Index reconstruit, ou None si l'index n'en contient pas
+        """
+        if 'bm25_data' not in arrays:
+            return None
+        
+        shape = tuple(params['shape'])
+        counts = sparse.csr_matrix(
+            (arrays['bm25_counts_data'], arrays['bm25_counts_indices'], arrays['bm25_counts_indptr']),
+            shape=shape,
+            copy=False
+        )
+        postings = sparse.csc_matrix(
+            (arrays['bm25_data'], arrays['bm25_indices'], arrays['bm25_indptr']),
+            shape=shape,
+            copy=False
+        )
+        
+        return cls(counts, postings, params['k1'], params['b'])
+    
+    def to_arrays(self):
+        """
+        Convertit l'index en tableaux à stocker
+        
+        Returns:
+            tuple: (tableaux nom -> numpy.ndarray, paramètres sérialisables en JSON)
+        """
+        arrays = {
+            'bm25_counts_data': self.counts.data,
+            'bm25_counts_indices': self.counts.indices,
+            'bm25_counts_indptr': self.counts.indptr,
+            'bm25_data': self.postings.data,
+            'bm25_indices': self.postings.indices,
+            'bm25_indptr': self.postings.indptr
+        }
+        params = {
+            'shape': list(self.counts.shape),
+            'k1': self.k1,
+            'b': self.b
+        }
+        
+        return arrays, params
+    
+    def select_rows(self, rows):
+        """
+        Extrait les poids BM25 d'un sous-ensemble de passages
+        
+        Le résultat est au même format que les postings (CSC) : le score d'une
+        requête sur ce sous-ensemble ne parcourt lui aussi que les termes de la requête.
+        
+        Args:
+            rows (numpy.ndarray): Indices des passages
+        
+        Returns:
+            scipy.sparse.csc_matrix: Poids BM25 (len(rows) x termes)
+        """
+        if self._rows is None:
+            self._rows = self.postings.tocsr()
+        
+        weights = self._rows[rows].tocsc()
+        weights.sort_indices()
+        
+        return weights
+    
+    def score(self, query_terms, weights=None):
+        """
+        Calcule le score BM25 des passages pour un lot de requêtes
+        
+        Le produit creux avec la transposée des postings (stockée en CSR) ne
+        parcourt, pour chaque requête, que les postings de ses termes.
+        
+        Args:
+            query_terms (scipy.sparse matrix): Termes des requêtes (requêtes x termes),
+                toute valeur non nulle indiquant la présence du terme
+            weights (scipy.sparse.csc_matrix, optional): Poids d'un sous-ensemble de
+                passages (voir select_rows). Si fourni, seule cette sous-matrice est parcourue.
+        
+        Returns:
+            scipy.sparse.csr_matrix: Scores (requêtes x passages, ou requêtes x lignes de
+                weights), non nuls pour les seuls passages contenant au moins un terme de la requête
+        """
+        query_terms = sparse.csr_matrix(query_terms, copy=True)
+        query_terms.data = np.ones_like(query_terms.data, dtype=np.float32)
+        
+        if weights is None:
+            return sparse.csr_matrix(query_terms @ self.postings.T)
+        
+        return sparse.csr_matrix(query_terms @ weights.T)
\ No newline at end of file
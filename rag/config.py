@@ -0,0 +1,81 @@
+# rag/config.py
+import os
+import json
+import copy
+
+# Configuration par défaut de la recherche documentaire
+DEFAULT_CONFIG = {
+    # Moteur de recherche : 'tfidf' (similarité cosinus), 'bm25' (index inversé)
+    # ou 'lsa' (vecteurs sémantiques denses)
+    'backend': 'tfidf',
+    # Dérive du vocabulaire au-delà de laquelle le vectoriseur est réentraîné
+    'refit_threshold': 0.1,
+    # Vectoriseur : 'tfidf' (vocabulaire de 1000 termes appris sur tout le corpus) ou
+    # 'hashing' (colonnes fixes par hachage, construction en flux par paquets de
+    # passages à mémoire constante, voir rag/hashing.py)
+    'vectorizer': {
+        'type': 'tfidf',
+        'n_features': 2 ** 18,
+        'batch_size': 2000
+    },
+    # Nombre de processus d'extraction des documents (None : choix automatique, 1 : séquentiel)
+    'extraction_workers': None,
+    # Paramètres du score BM25
+    'bm25': {
+        'k1': 1.2,
+        'b': 0.75
+    },
+    # Vecteurs sémantiques LSA (nombre de dimensions, passages évalués par bloc)
+    'lsa': {
+        'n_components': 128,
+        'block_size': 65536
+    },
+    # Part des passages supprimés au-delà de laquelle l'index est compacté,
+    # éventuellement dans un thread séparé
+    'compaction_threshold': 0.2,
+    'background_compaction': False,
+    # Nombre de sous-matrices de recherches filtrées conservées en mémoire
+    'filter_cache_size': 16,
+    # Index répartis (shards) : nom -> répertoires des documents, relatifs au
+    # répertoire de données (None : un seul index, voir ShardedVectorDB)
+    'shards': None,
+    # Délai d'attente maximal (en secondes) d'une recherche pendant le chargement
+    # de l'index en arrière-plan, avant une réponse dégradée
+    'warm_up_timeout': 0.5,
+    # Cache des requêtes du Retriever (taille maximale en octets, durée de vie en secondes)
+    'cache': {
+        'max_bytes': 8 * 1024 * 1024,
+        'ttl': 600
+    }
+}
+
+def load_config(data_dir):
+    """
+    Charge la configuration de la recherche documentaire
+    
+    Les valeurs du fichier rag_config.json du répertoire de données, s'il existe,
+    remplacent les valeurs par défaut.
+    
+    Args:
+        data_dir (str): Répertoire contenant les données
+    
+    Returns:
+        dict: Configuration complète
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config_path = os.path.join(data_dir, 'rag_config.json')
+    
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                user_config = json.load(f)
+            
+            for key, value in user_config.items():
+                if isinstance(value, dict) and isinstance(config.get(key), dict):
+                    config[key].update(value)
+                else:
+                    config[key] = value
+        except Exception as e:
+            print(f"Erreur lors du chargement de la configuration {config_path} : {str(e)}")
+    
+    return config
\ No newline at end of file
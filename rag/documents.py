@@ -0,0 +1,336 @@
+# rag/documents.py
+import os
+import json
+import mmap
+import numpy as np
+
+# Taille des blocs recopiés lors de l'écriture des textes
+COPY_BLOCK_SIZE = 1024 * 1024
+
+def _map_file(path):
+    """
+    Ouvre un fichier en lecture seule avec mmap
+    
+    Args:
+        path (str): Chemin du fichier
+    
+    Returns:
+        mmap.mmap or bytes: Contenu mappé en mémoire (b'' pour un fichier vide)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class DocumentTable:
+    """
+    Table des documents indexés : métadonnées (identifiant, chemin, type...) et texte
+    
+    Les documents d'une génération de l'index sont lus à la demande dans ses
+    fichiers, ouverts avec mmap : une ligne JSON de métadonnées par document et
+    les textes encodés en UTF-8 les uns à la suite des autres, retrouvés par
+    leurs positions. L'ouverture ne décode aucun document, et le texte d'un
+    passage est lu sans décoder le reste du document. Les documents ajoutés
+    depuis sont conservés en mémoire jusqu'à la sauvegarde suivante.
+    
+    Les positions des passages dans le texte d'un document (voir PassageTable)
+    sont des positions en octets dans son encodage UTF-8.
+    """
+    
+    def __init__(self, records=None, texts=None):
+        """
+        Initialisation d'une table en mémoire
+        
+        Args:
+            records (list, optional): Métadonnées de chaque document (sans la clé 'text')
+            texts (list, optional): Texte de chaque document, encodé en UTF-8 (bytes ou mmap)
+        """
+        # Documents lus dans les fichiers d'une génération (lignes stored_rows, dans l'ordre)
+        self._records_data = b''
+        self._record_offsets = np.zeros(1, dtype=np.int64)
+        self._texts_data = b''
+        self._text_offsets = np.zeros(1, dtype=np.int64)
+        self._stored_rows = None
+        
+        # Documents ajoutés depuis, à la suite des précédents
+        self._records = records if records is not None else []
+        self._texts = texts if texts is not None else []
+    
+    @classmethod
+    def from_documents(cls, documents):
+        """
+        Construit la table de documents fournis en mémoire
+        
+        Args:
+            documents (iterable): Documents avec la clé 'text', ou 'text_path' pour un texte
+                écrit sur disque par PassageWriter (la clé 'passages' est ignorée)
+        
+        Returns:
+            DocumentTable: Table des documents
+        """
+        records = []
+        texts = []
+        
+        for document in documents:
+            records.append({
+                key: value for key, value in document.items()
+                if key not in ('text', 'text_path', 'passages')
+            })
+            if 'text_path' in document:
+                texts.append(_map_file(document['text_path']))
+            else:
+                texts.append(document['text'].encode('utf-8'))
+        
+        return cls(records, texts)
+    
+    @classmethod
+    def open(cls, records_path, record_offsets, texts_path, text_offsets):
+        """
+        Ouvre les documents stockés dans une génération de l'index
+        
+        Args:
+            records_path (str): Fichier des métadonnées (une ligne JSON par document)
+            record_offsets (numpy.ndarray): Position de chaque ligne (n + 1 positions)
+            texts_path (str): Fichier des textes encodés en UTF-8
+            text_offsets (numpy.ndarray): Position du texte de chaque document (n + 1 positions)
+        
+        Returns:
+            DocumentTable: Table des documents, lus à la demande
+        """
+        table = cls()
+        table._records_data = _map_file(records_path)
+        table._record_offsets = record_offsets
+        table._texts_data = _map_file(texts_path)
+        table._text_offsets = text_offsets
+        
+        return table
+    
+    def _n_stored(self):
+        """
+        Compte les documents lus dans les fichiers, placés en tête de la table
+        
+        Returns:
+            int: Nombre de documents
+        """
+        if self._stored_rows is None:
+            return len(self._record_offsets) - 1
+        return len(self._stored_rows)
+    
+    def _locate(self, i):
+        """
+        Localise un document de la table
+        
+        Args:
+            i (int): Indice du document
+        
+        Returns:
+            tuple: (True, ligne dans les fichiers) ou (False, indice parmi les documents ajoutés)
+        """
+        n_stored = self._n_stored()
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Indice de document hors de la table")
+        
+        if i < n_stored:
+            return True, i if self._stored_rows is None else int(self._stored_rows[i])
+        return False, i - n_stored
+    
+    def __len__(self):
+        return self._n_stored() + len(self._records)
+    
+    def __getitem__(self, i):
+        """
+        Récupère un document complet (métadonnées et texte)
+        
+        Args:
+            i (int): Indice du document
+        
+        Returns:
+            dict: Document avec la clé 'text'
+        """
+        document = self.record(i)
+        document['text'] = self.text(i)
+        
+        return document
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def record(self, i):
+        """
+        Récupère les métadonnées d'un document, sans son texte
+        
+        Args:
+            i (int): Indice du document
+        
+        Returns:
+            dict: Document sans la clé 'text' (copie)
+        """
+        stored, row = self._locate(i)
+        if stored:
+            return json.loads(self._records_data[self._record_offsets[row]:self._record_offsets[row + 1]])
+        
+        return dict(self._records[row])
+    
+    def iter_records(self):
+        """
+        Parcourt les métadonnées des documents, sans décoder leurs textes
+        
+        Yields:
+            dict: Document sans la clé 'text'
+        """
+        for i in range(len(self)):
+            yield self.record(i)
+    
+    def _text_region(self, i):
+        """
+        Localise le texte encodé d'un document
+        
+        Args:
+            i (int): Indice du document
+        
+        Returns:
+            tuple: (données, position de début, position de fin)
+        """
+        stored, row = self._locate(i)
+        if stored:
+            return self._texts_data, int(self._text_offsets[row]), int(self._text_offsets[row + 1])
+        
+        data = self._texts[row]
+        return data, 0, len(data)
+    
+    def text(self, i):
+        """
+        Récupère le texte complet d'un document
+        
+        Args:
+            i (int): Indice du document
+        
+        Returns:
+            str: Texte du document
+        """
+        data, start, end = self._text_region(i)
+        
+        return data[start:end].decode('utf-8')
+    
+    def passage_text(self, i, start, end):
+        """
+        Récupère le texte d'un passage sans décoder le reste du document
+        
+        Args:
+            i (int): Indice du document
+            start (int): Position de début (en octets) dans le texte du document
+            end (int): Position de fin (en octets)
+        
+        Returns:
+            str: Texte du passage
+        """
+        data, offset, _ = self._text_region(i)
+        
+        return data[offset + start:offset + end].decode('utf-8')
+    
+    def copy(self):
+        """
+        Copie la table (les fichiers ouverts sont partagés)
+        
+        Returns:
+            DocumentTable: Copie dont les ajouts n'affectent pas cette table
+        """
+        return self._with_documents(self._stored_rows, list(self._records), list(self._texts))
+    
+    def _with_documents(self, stored_rows, records, texts):
+        """
+        Crée une table partageant les fichiers de celle-ci
+        
+        Args:
+            stored_rows (numpy.ndarray): Lignes des fichiers retenues (None pour toutes)
+            records (list): Métadonnées des documents ajoutés
+            texts (list): Textes des documents ajoutés
+        
+        Returns:
+            DocumentTable: Nouvelle table
+        """
+        table = DocumentTable(records, texts)
+        table._records_data = self._records_data
+        table._record_offsets = self._record_offsets
+        table._texts_data = self._texts_data
+        table._text_offsets = self._text_offsets
+        table._stored_rows = stored_rows
+        
+        return table
+    
+    def extend(self, other):
+        """
+        Ajoute les documents d'une autre table à la suite
+        
+        Args:
+            other (DocumentTable): Documents à ajouter
+        """
+        for i in range(len(other)):
+            stored, row = other._locate(i)
+            self._records.append(other.record(i))
+            if stored:
+                data, start, end = other._text_region(i)
+                self._texts.append(data[start:end])
+            else:
+                self._texts.append(other._texts[row])
+    
+    def select(self, indices):
+        """
+        Extrait un sous-ensemble des documents, sans les décoder
+        
+        Args:
+            indices (array-like): Indices des documents à conserver, triés
+        
+        Returns:
+            DocumentTable: Nouvelle table
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        n_stored = self._n_stored()
+        
+        stored = indices[indices < n_stored]
+        if self._stored_rows is not None:
+            stored = self._stored_rows[stored]
+        added = (indices[indices >= n_stored] - n_stored).tolist()
+        
+        return self._with_documents(stored, [self._records[j] for j in added], [self._texts[j] for j in added])
+    
+    def write(self, records_path, texts_path):
+        """
+        Écrit les documents dans les fichiers d'une génération de l'index
+        
+        Les documents lus dans des fichiers sont recopiés tels quels, sans être
+        décodés ; les textes sont recopiés par blocs.
+        
+        Args:
+            records_path (str): Fichier des métadonnées à créer
+            texts_path (str): Fichier des textes à créer
+        
+        Returns:
+            tuple: (positions des lignes de métadonnées, positions des textes)
+        """
+        record_offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        text_offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        
+        with open(records_path, 'wb') as records_file, open(texts_path, 'wb') as texts_file:
+            for i in range(len(self)):
+                stored, row = self._locate(i)
+                if stored:
+                    line = self._records_data[self._record_offsets[row]:self._record_offsets[row + 1]]
+                else:
+                    line = (json.dumps(self._records[row], ensure_ascii=False) + '\n').encode('utf-8')
+                records_file.write(line)
+                record_offsets[i + 1] = record_offsets[i] + len(line)
+                
+                data, start, end = self._text_region(i)
+                for block in range(start, end, COPY_BLOCK_SIZE):
+                    texts_file.write(data[block:min(block + COPY_BLOCK_SIZE, end)])
+                text_offsets[i + 1] = text_offsets[i] + end - start
+            
+            for f in (records_file, texts_file):
+                f.flush()
+                os.fsync(f.fileno())
+        
+        return record_offsets, text_offsets
\ No newline at end of file
@@ -0,0 +1,186 @@
+# rag/docx_extractor.py
+import zipfile
+from lxml import etree
+
+# Espaces de noms WordprocessingML
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+W_BODY = W_NS + 'body'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+W_TBL = W_NS + 'tbl'
+W_TR = W_NS + 'tr'
+W_TC = W_NS + 'tc'
+W_GRID_SPAN = W_NS + 'gridSpan'
+W_V_MERGE = W_NS + 'vMerge'
+W_TABS = W_NS + 'tabs'
+W_VAL = W_NS + 'val'
+MC_FALLBACK = MC_NS + 'Fallback'
+
+# Seuls ces éléments génèrent un événement : les propriétés de mise en forme
+# (w:rPr, w:pPr...) sont parcourues par lxml sans remonter jusqu'à Python
+STREAM_TAGS = (W_P, W_T, W_TAB, W_BR, W_CR, W_TBL, W_TR, W_TC, W_GRID_SPAN, W_V_MERGE, MC_FALLBACK)
+
+def iter_docx_blocks(filepath):
+    """
+    Parcourt en flux le contenu d'un document Word
+    
+    Le fichier word/document.xml est lu directement dans l'archive avec
+    lxml.iterparse, sans construire le modèle objet de python-docx. Les éléments
+    déjà traités sont libérés au fur et à mesure : la mémoire utilisée ne dépend
+    pas de la taille du document.
+    
+    Args:
+        filepath (str): Chemin du fichier .docx
+    
+    Yields:
+        dict: Blocs dans l'ordre du document :
+            - {'kind': 'paragraph', 'text': ...} pour un paragraphe hors tableau
+            - {'kind': 'table_row', 'table': i, 'row': j, 'cells': [(colonne, texte), ...],
+              'columns': n} pour une ligne de tableau de n colonnes de la grille (les
+              tableaux imbriqués sont inclus dans la cellule qui les contient)
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        with archive.open('word/document.xml') as stream:
+            yield from _iter_blocks(stream)
+
+def _iter_blocks(stream):
+    """
+    Analyse le flux XML du corps du document
+    
+    Args:
+        stream (file): Flux de word/document.xml
+    
+    Yields:
+        dict: Blocs du document (voir iter_docx_blocks)
+    """
+    # Paragraphes en cours (les zones de texte peuvent imbriquer des paragraphes)
+    paragraphs = []
+    # Tableaux en cours (un par niveau d'imbrication) : ligne courante et texte
+    # des cellules fusionnées verticalement, par colonne
+    tables = []
+    # Cellules en cours : {'column', 'texts', 'span', 'merge'}
+    cells = []
+    # Position dans les tableaux de premier niveau
+    table_index = -1
+    row_index = -1
+    # Contenu de repli (doublon des zones de texte) à ignorer
+    fallback_depth = 0
+    
+    for event, element in etree.iterparse(stream, events=('start', 'end'), tag=STREAM_TAGS):
+        tag = element.tag
+        
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        
+        if fallback_depth:
+            continue
+        
+        if event == 'start':
+            if tag == W_P:
+                paragraphs.append([])
+            elif tag == W_TBL:
+                tables.append({'row': None, 'merged': {}})
+                if len(tables) == 1:
+                    table_index += 1
+                    row_index = -1
+            elif tag == W_TR:
+                tables[-1]['row'] = {'column': 0, 'cells': []}
+                if len(tables) == 1:
+                    row_index += 1
+            elif tag == W_TC:
+                cells.append({'column': tables[-1]['row']['column'], 'texts': [], 'span': 1, 'merge': None})
+            continue
+        
+        # Événements de fin
+        if tag == W_T:
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag == W_TAB:
+            # Les w:tab des propriétés de paragraphe (w:tabs) sont des taquets, pas du texte
+            if paragraphs and element.getparent().tag != W_TABS:
+                paragraphs[-1].append('\t')
+        elif tag in (W_BR, W_CR):
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == W_GRID_SPAN:
+            if cells:
+                cells[-1]['span'] = int(element.get(W_VAL, '1'))
+        elif tag == W_V_MERGE:
+            if cells:
+                cells[-1]['merge'] = element.get(W_VAL, 'continue')
+        elif tag == W_P:
+            text = ''.join(paragraphs.pop())
+            
+            if paragraphs:
+                # Paragraphe d'une zone de texte : rattaché au paragraphe parent
+                paragraphs[-1].append(' ' + text)
+            elif cells:
+                cells[-1]['texts'].append(text)
+            else:
+                yield {'kind': 'paragraph', 'text': text}
+        elif tag == W_TC:
+            cell = cells.pop()
+            table = tables[-1]
+            text = ' '.join(t.strip() for t in cell['texts'] if t.strip())
+            
+            # Une cellule fusionnée verticalement reprend le texte de la cellule d'origine
+            if cell['merge'] == 'restart':
+                table['merged'][cell['column']] = text
+            elif cell['merge'] == 'continue':
+                text = text or table['merged'].get(cell['column'], '')
+            else:
+                table['merged'].pop(cell['column'], None)
+            
+            table['row']['cells'].append((cell['column'], text))
+            table['row']['column'] += cell['span']
+        elif tag == W_TR:
+            row = tables[-1]['row']
+            tables[-1]['row'] = None
+            
+            if len(tables) == 1:
+                yield {'kind': 'table_row', 'table': table_index, 'row': row_index, 'cells': row['cells'], 'columns': row['column']}
+            elif cells:
+                # Tableau imbriqué : la ligne est ajoutée au texte de la cellule parente
+                cells[-1]['texts'].append(' | '.join(text for _, text in row['cells'] if text))
+        elif tag == W_TBL:
+            tables.pop()
+        
+        # Libérer les éléments de premier niveau déjà traités
+        if tag in (W_P, W_TBL):
+            parent = element.getparent()
+            if parent is not None and parent.tag == W_BODY:
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+
+def docx_to_passages(filepath):
+    """
+    Extrait les paragraphes et les lignes de tableaux d'un document Word
+    
+    Args:
+        filepath (str): Chemin du fichier .docx
+    
+    Returns:
+        list: Couples (texte, type) dans l'ordre du document
+    """
+    items = []
+    
+    for block in iter_docx_blocks(filepath):
+        if block['kind'] == 'paragraph':
+            items.append((block['text'], 'paragraph'))
+        else:
+            # Une case par colonne de la grille, même vide, pour que les valeurs
+            # restent alignées sur leurs colonnes (une cellule fusionnée
+            # horizontalement occupe la première de ses colonnes)
+            cells = [''] * block['columns']
+            for column, text in block['cells']:
+                cells[column] = text.replace('\n', ' ')
+            items.append((' | '.join(cells) if any(cells) else '', 'table_row'))
+    
+    return items
\ No newline at end of file
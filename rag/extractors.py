@@ -0,0 +1,386 @@
+# rag/extractors.py
+import os
+import json
+import uuid
+import hashlib
+from functools import partial
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from openpyxl import load_workbook
+
+from rag.passages import join_passages, PassageWriter
+from rag.metadata import extract_metadata
+from rag.docx_extractor import docx_to_passages
+
+# Extensions des fichiers pris en charge par l'indexation
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.docx', '.json', '.txt')
+
+# Nombre de lignes Excel sérialisées par bloc
+EXCEL_CHUNK_ROWS = 10000
+
+def list_files(directories):
+    """
+    Liste les fichiers indexables contenus dans les répertoires spécifiés
+    
+    Args:
+        directories (list): Liste des répertoires à parcourir
+    
+    Returns:
+        list: Chemins des fichiers, triés
+    """
+    files = []
+    
+    for directory in directories:
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+            continue
+        
+        for filename in os.listdir(directory):
+            filepath = os.path.join(directory, filename)
+            
+            # Ignorer les répertoires et les fichiers de verrouillage Office (~$...)
+            if os.path.isdir(filepath) or filename.startswith('~$'):
+                continue
+            
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                files.append(filepath)
+    
+    return sorted(files)
+
+def hash_file(filepath, chunk_size=1024 * 1024):
+    """
+    Calcule l'empreinte SHA-1 du contenu d'un fichier
+    
+    Args:
+        filepath (str): Chemin du fichier
+        chunk_size (int, optional): Taille des blocs lus
+    
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha1()
+    
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    
+    return digest.hexdigest()
+
+def fingerprint_file(filepath, stat=None, content_hash=None):
+    """
+    Calcule l'empreinte d'un fichier (taille, date de modification, contenu)
+    
+    Args:
+        filepath (str): Chemin du fichier
+        stat (os.stat_result, optional): Résultat de os.stat déjà calculé
+        content_hash (str, optional): Empreinte du contenu déjà calculée
+    
+    Returns:
+        dict: Empreinte avec les clés 'path', 'size', 'mtime' et 'hash'
+    """
+    if stat is None:
+        stat = os.stat(filepath)
+    
+    return {
+        'path': filepath,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'hash': content_hash if content_hash is not None else hash_file(filepath)
+    }
+
+def extract_files(filepaths, workers=None, spool_dir=None):
+    """
+    Extrait le contenu d'une liste de fichiers, en parallèle sur plusieurs processus
+    
+    L'échec d'un fichier est signalé sans interrompre l'extraction des autres.
+    
+    Args:
+        filepaths (list): Chemins des fichiers
+        workers (int, optional): Nombre de processus. Si non fourni, il est choisi
+            selon le nombre de fichiers et de cœurs ; 1 désactive le parallélisme.
+        spool_dir (str, optional): Répertoire où écrire le texte des classeurs Excel (voir read_file)
+    
+    Yields:
+        tuple: (chemin, document ou None, message d'erreur ou None), dans l'ordre des fichiers
+    """
+    filepaths = list(filepaths)
+    
+    if workers is None:
+        # Le démarrage des processus ne se justifie que pour un corpus conséquent
+        workers = min(os.cpu_count() or 1, len(filepaths) // 8)
+    
+    if workers <= 1 or len(filepaths) <= 1:
+        for filepath in filepaths:
+            yield _extract_task(filepath, spool_dir)
+        return
+    
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        task = partial(_extract_task, spool_dir=spool_dir)
+        for result in executor.map(task, filepaths, chunksize=chunksize):
+            yield result
+
+def _extract_task(filepath, spool_dir=None):
+    """
+    Extrait un fichier dans un processus de travail
+    
+    Args:
+        filepath (str): Chemin du fichier
+        spool_dir (str, optional): Répertoire où écrire le texte des classeurs Excel
+    
+    Returns:
+        tuple: (chemin, document ou None, message d'erreur ou None)
+    """
+    try:
+        return filepath, read_file(filepath, spool_dir), None
+    except Exception as e:
+        return filepath, None, str(e)
+
+def read_file(filepath, spool_dir=None):
+    """
+    Lit un fichier et extrait son texte et ses passages
+    
+    Args:
+        filepath (str): Chemin du fichier
+        spool_dir (str, optional): Répertoire où écrire le texte des classeurs Excel,
+            bloc de lignes par bloc, au lieu de l'assembler en mémoire
+    
+    Returns:
+        dict: Document avec les clés 'id', 'path', 'text', 'type' et 'passages'
+            (liste des passages [début, fin, type], ou None pour un découpage par ligne),
+            ou None si l'extension n'est pas prise en charge. Un classeur Excel lu avec
+            spool_dir a la clé 'text_path' à la place de 'text' (voir _spool_excel).
+    
+    Raises:
+        Exception: Si le fichier ne peut pas être lu
+    """
+    filename = os.path.basename(filepath)
+    lower_name = filename.lower()
+    
+    passages = None
+    
+    if lower_name.endswith('.xlsx') or lower_name.endswith('.xls'):
+        # Fichiers Excel : une ligne du tableau par passage, lues par blocs
+        if spool_dir is not None:
+            return _spool_excel(filepath, spool_dir)
+        text, passages = join_passages(chain.from_iterable(iter_excel_passages(filepath)))
+        doc_type = 'excel'
+    
+    elif lower_name.endswith('.docx'):
+        # Fichiers Word : paragraphes et lignes de tableaux dans l'ordre du document
+        text, passages = join_passages(docx_to_passages(filepath))
+        doc_type = 'docx'
+    
+    elif lower_name.endswith('.json'):
+        # Fichiers JSON
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        text = json.dumps(data, ensure_ascii=False)
+        doc_type = 'json'
+    
+    elif lower_name.endswith('.txt'):
+        # Fichiers texte
+        with open(filepath, 'r', encoding='utf-8') as f:
+            text = f.read()
+        doc_type = 'txt'
+    
+    else:
+        return None
+    
+    return {
+        'id': filename,
+        'path': filepath,
+        'text': text,
+        'type': doc_type,
+        'passages': passages
+    }
+
+def _spool_excel(filepath, spool_dir):
+    """
+    Lit un classeur Excel par blocs de lignes en écrivant son texte dans un fichier
+    
+    Chaque bloc est écrit sur disque et analysé pour les métadonnées avant la
+    lecture du suivant : ni le texte complet ni la liste de ses passages ne sont
+    construits en mémoire.
+    
+    Args:
+        filepath (str): Chemin du fichier
+        spool_dir (str): Répertoire du fichier texte à créer
+    
+    Returns:
+        dict: Document avec les clés 'id', 'path', 'text_path', 'type', 'passages'
+            (PassageTable des positions dans le fichier texte) et 'metadata'
+    """
+    document = {
+        'id': os.path.basename(filepath),
+        'path': filepath,
+        'text_path': os.path.join(spool_dir, f"{uuid.uuid4().hex}.txt"),
+        'type': 'excel'
+    }
+    
+    writer = PassageWriter(document['text_path'])
+    try:
+        texts = (writer.write(items) for items in iter_excel_passages(filepath))
+        document['metadata'] = extract_metadata(document, texts=texts)
+    finally:
+        document['passages'] = writer.close()
+    
+    return document
+
+def iter_excel_passages(filepath, chunk_size=EXCEL_CHUNK_ROWS):
+    """
+    Lit la première feuille d'un classeur Excel par blocs de lignes et la convertit en passages
+    
+    Les fichiers .xlsx sont parcourus en lecture seule par openpyxl : seul le
+    bloc courant est chargé en mémoire. Comme avec pandas.read_excel, la
+    première ligne donne les colonnes, les lignes vides finales sont ignorées et
+    les cellules vides sont sérialisées 'nan' ; chaque valeur est convertie telle
+    quelle (un entier reste '3' même si la colonne contient des cellules vides).
+    Les anciens fichiers .xls, que le lecteur charge toujours en entier, passent
+    par pandas.
+    
+    Args:
+        filepath (str): Chemin du fichier
+        chunk_size (int, optional): Nombre de lignes par bloc
+    
+    Yields:
+        list: Couples (texte, type) du bloc, l'en-tête étant en tête du premier bloc
+    """
+    if not filepath.lower().endswith('.xlsx'):
+        yield from iter_dataframe_passages(pd.read_excel(filepath), chunk_size)
+        return
+    
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = _trim_blank_rows(workbook.worksheets[0].iter_rows(values_only=True))
+        columns = _column_names(next(rows, ()))
+        header = [("Colonnes: " + ", ".join(columns), 'paragraph')]
+        
+        first_row = 0
+        while True:
+            chunk = [_row_values(row, len(columns)) for row in islice(rows, chunk_size)]
+            if not chunk:
+                break
+            
+            # Colonnes de type objet : chaque cellule est convertie telle quelle, quel que soit le bloc
+            df = pd.DataFrame(chunk, columns=columns, dtype=object)
+            lines = [(line, 'excel_row') for line in _serialize_rows(df, first_row)]
+            yield header + lines if first_row == 0 else lines
+            first_row += len(chunk)
+        
+        if first_row == 0:
+            yield header
+    finally:
+        workbook.close()
+
+def _trim_blank_rows(rows):
+    """
+    Ignore les lignes vides finales d'une feuille, sans lire la feuille d'avance
+    
+    Args:
+        rows (iterable): Lignes de la feuille (tuples de valeurs)
+    
+    Yields:
+        tuple: Lignes, les lignes vides n'étant transmises que si une ligne non vide les suit
+    """
+    blank = []
+    
+    for row in rows:
+        if all(value is None for value in row):
+            blank.append(row)
+            continue
+        
+        yield from blank
+        blank.clear()
+        yield row
+
+def _column_names(values):
+    """
+    Détermine les noms des colonnes à partir de la ligne d'en-tête, comme pandas.read_excel
+    
+    Args:
+        values (tuple): Valeurs de la ligne d'en-tête
+    
+    Returns:
+        list: Noms des colonnes ('Unnamed: n' pour une cellule vide, suffixe '.n' pour un doublon)
+    """
+    values = list(values)
+    while values and values[-1] is None:
+        values.pop()
+    
+    columns = []
+    seen = {}
+    for j, value in enumerate(values):
+        name = str(value) if value is not None else f"Unnamed: {j}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    
+    return columns
+
+def _row_values(row, width):
+    """
+    Ajuste une ligne à la largeur de l'en-tête, les cellules vides valant NaN
+    
+    Args:
+        row (tuple): Valeurs de la ligne
+        width (int): Nombre de colonnes
+    
+    Returns:
+        list: Valeurs de la ligne
+    """
+    values = [float('nan') if value is None else value for value in row[:width]]
+    
+    return values + [float('nan')] * (width - len(values))
+
+def iter_dataframe_passages(df, chunk_size=EXCEL_CHUNK_ROWS):
+    """
+    Convertit un DataFrame en passages, par blocs de lignes
+    
+    Les lignes sont sérialisées colonne par colonne (conversion en texte
+    vectorisée par numpy) puis assemblées en une seule jointure par ligne.
+    Seul le bloc courant est converti en chaînes Python.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame à convertir
+        chunk_size (int, optional): Nombre de lignes par bloc
+    
+    Yields:
+        list: Couples (texte, type) du bloc, l'en-tête étant en tête du premier bloc
+    """
+    header = [("Colonnes: " + ", ".join(str(col) for col in df.columns), 'paragraph')]
+    
+    if df.empty:
+        yield header
+        return
+    
+    for first_row in range(0, len(df), chunk_size):
+        rows = [(line, 'excel_row') for line in _serialize_rows(df.iloc[first_row:first_row + chunk_size], first_row)]
+        yield header + rows if first_row == 0 else rows
+
+def _serialize_rows(df, first_row=0):
+    """
+    Sérialise les lignes d'un DataFrame ("Ligne n: colonne: valeur, ...")
+    
+    Args:
+        df (pandas.DataFrame): Lignes à sérialiser
+        first_row (int, optional): Position de la première ligne dans le tableau complet
+    
+    Returns:
+        list: Texte de chaque ligne
+    """
+    # str() de chaque valeur, y compris pour les cellules vides ('nan') : avec
+    # pandas 3, astype(str) conserverait NaN tel quel
+    columns = [
+        f"{col}: " + df.iloc[:, j].to_numpy(dtype=object).astype(str).astype(object)
+        for j, col in enumerate(df.columns)
+    ]
+    
+    return [
+        f"Ligne {n}: " + ", ".join(values)
+        for n, values in zip(range(first_row + 1, first_row + len(df) + 1), zip(*columns))
+    ]
\ No newline at end of file
@@ -0,0 +1,222 @@
+# rag/hashing.py
+import os
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+class HashingTfidfVectorizer:
+    """
+    Vectoriseur TF-IDF à colonnes fixes, obtenues par hachage des mots
+    
+    Contrairement à TfidfVectorizer, aucun vocabulaire n'est appris : chaque mot
+    est envoyé dans l'une des n_features colonnes par une fonction de hachage.
+    Les passages peuvent donc être vectorisés par paquets, sans connaître le
+    reste du corpus ; seules les fréquences documentaires des colonnes sont
+    cumulées pendant la lecture, puis les poids IDF sont appliqués dans une
+    seconde passe sur la matrice écrite sur disque.
+    """
+    
+    def __init__(self, n_features=2 ** 18, document_frequency=None, n_samples=0):
+        """
+        Initialisation du vectoriseur
+        
+        Args:
+            n_features (int, optional): Nombre de colonnes de la matrice
+            document_frequency (numpy.ndarray, optional): Nombre de passages contenant
+                chaque colonne, issu d'un entraînement précédent
+            n_samples (int, optional): Nombre de passages de l'entraînement
+        """
+        self.n_features = int(n_features)
+        self.hasher = HashingVectorizer(
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32
+        )
+        self.document_frequency = None
+        self.n_samples = 0
+        self.idf_ = None
+        
+        if document_frequency is not None:
+            self._set_document_frequency(document_frequency, n_samples)
+    
+    def _set_document_frequency(self, document_frequency, n_samples):
+        """
+        Calcule les poids IDF à partir des fréquences documentaires
+        
+        La formule est celle de TfidfVectorizer (idf lissé) : ln((1 + n) / (1 + df)) + 1.
+        
+        Args:
+            document_frequency (numpy.ndarray): Nombre de passages contenant chaque colonne
+            n_samples (int): Nombre de passages
+        """
+        self.document_frequency = np.asarray(document_frequency, dtype=np.int64)
+        self.n_samples = int(n_samples)
+        self.idf_ = (np.log((1.0 + self.n_samples) / (1.0 + self.document_frequency)) + 1.0).astype(np.float32)
+    
+    def get_params(self):
+        """
+        Récupère les paramètres à conserver dans le manifeste de l'index
+        
+        Returns:
+            dict: Paramètres du vectoriseur
+        """
+        return {'type': 'hashing', 'n_features': self.n_features, 'n_samples': self.n_samples}
+    
+    def build_analyzer(self):
+        """
+        Récupère la fonction de découpage des textes en mots
+        
+        Returns:
+            callable: Analyseur (texte -> liste de mots)
+        """
+        return self.hasher.build_analyzer()
+    
+    def count(self, texts):
+        """
+        Compte les occurrences des mots de chaque texte, par colonne
+        
+        Args:
+            texts (list): Textes à analyser
+        
+        Returns:
+            scipy.sparse.csr_matrix: Fréquences (textes x colonnes), indices triés
+        """
+        return self.hasher.transform(texts)
+    
+    def transform(self, texts):
+        """
+        Vectorise des textes avec les poids IDF de l'entraînement
+        
+        Args:
+            texts (list): Textes à vectoriser
+        
+        Returns:
+            scipy.sparse.csr_matrix: Vecteurs TF-IDF normalisés (norme L2)
+        """
+        matrix = self.count(texts)
+        matrix.data *= self.idf_[matrix.indices]
+        
+        return normalize(matrix, norm='l2', copy=False)
+    
+    def count_unknown_tokens(self, texts):
+        """
+        Compte les mots tombant dans des colonnes absentes de l'entraînement
+        
+        Args:
+            texts (list): Textes à analyser
+        
+        Returns:
+            int: Nombre de mots hors vocabulaire
+        """
+        matrix = self.count(texts)
+        unknown = self.document_frequency[matrix.indices] == 0
+        
+        return int(matrix.data[unknown].sum())
+    
+    def fit_transform_batches(self, batches, work_dir, keep_counts=False):
+        """
+        Entraîne le vectoriseur et vectorise des passages lus par paquets
+        
+        Première passe : chaque paquet est haché et ses tableaux CSR (fréquences
+        brutes) sont ajoutés à la suite de fichiers du répertoire de travail, tandis
+        que les fréquences documentaires sont cumulées. Seconde passe : les poids
+        IDF sont appliqués et les lignes normalisées, paquet par paquet, directement
+        dans le fichier des valeurs. La mémoire utilisée dépend de la taille des
+        paquets et non de celle du corpus.
+        
+        Args:
+            batches (iterable): Paquets de textes (listes), dans l'ordre des lignes
+            work_dir (str): Répertoire de travail, créé si nécessaire
+            keep_counts (bool, optional): Si True, écrit aussi les fréquences brutes
+                (pour l'index BM25) dans un fichier du répertoire de travail
+        
+        Returns:
+            tuple: (matrice CSR mappée sur les fichiers du répertoire de travail,
+                fréquences brutes mappées de la même façon ou None, nombre total de mots)
+        """
+        os.makedirs(work_dir, exist_ok=True)
+        paths = {name: os.path.join(work_dir, f"{name}.bin") for name in ('data', 'indices', 'indptr', 'counts')}
+        
+        document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        bounds = []
+        n_rows = 0
+        nnz = 0
+        n_tokens = 0
+        
+        # Première passe : fréquences brutes et fréquences documentaires
+        with open(paths['data'], 'wb') as data_file, \
+                open(paths['indices'], 'wb') as indices_file, \
+                open(paths['indptr'], 'wb') as indptr_file, \
+                open(paths['counts'], 'wb') as counts_file:
+            np.zeros(1, dtype=np.int64).tofile(indptr_file)
+            
+            for texts in batches:
+                if not texts:
+                    continue
+                
+                matrix = self.count(texts)
+                matrix.data.tofile(data_file)
+                matrix.indices.astype(np.int32, copy=False).tofile(indices_file)
+                (matrix.indptr[1:].astype(np.int64) + nnz).tofile(indptr_file)
+                
+                document_frequency += np.bincount(matrix.indices, minlength=self.n_features)
+                n_tokens += int(matrix.data.sum())
+                bounds.append((n_rows, n_rows + matrix.shape[0], nnz, nnz + matrix.nnz))
+                if keep_counts:
+                    # Les fréquences brutes partagent les indices et indptr des poids
+                    matrix.data.astype(np.int32).tofile(counts_file)
+                                
+                n_rows += matrix.shape[0]
+                nnz += matrix.nnz
+        
+        self._set_document_frequency(document_frequency, n_rows)
+        
+        data = _open_array(paths['data'], np.float32, nnz, 'r+')
+        indices = _open_array(paths['indices'], np.int32, nnz, 'r')
+        indptr = _open_array(paths['indptr'], np.int64, n_rows + 1, 'r')
+        
+        # Seconde passe : poids IDF et normalisation, paquet par paquet
+        for first_row, last_row, first, last in bounds:
+            block = sparse.csr_matrix(
+                (np.array(data[first:last]), indices[first:last], indptr[first_row:last_row + 1] - first),
+                shape=(last_row - first_row, self.n_features)
+            )
+            block.data *= self.idf_[block.indices]
+            data[first:last] = normalize(block, norm='l2', copy=False).data
+        
+        if isinstance(data, np.memmap):
+            data.flush()
+        
+        embeddings = sparse.csr_matrix((data, indices, indptr), shape=(n_rows, self.n_features), copy=False)
+        embeddings.has_sorted_indices = True
+        
+        counts = None
+        if keep_counts:
+            counts = sparse.csr_matrix(
+                (_open_array(paths['counts'], np.int32, nnz, 'r'), indices, indptr),
+                shape=(n_rows, self.n_features),
+                copy=False
+            )
+            counts.has_sorted_indices = True
+        
+        return embeddings, counts, n_tokens
+
+def _open_array(path, dtype, length, mode):
+    """
+    Ouvre un fichier binaire comme tableau mappé en mémoire
+    
+    Args:
+        path (str): Chemin du fichier
+        dtype (numpy.dtype): Type des éléments
+        length (int): Nombre d'éléments
+        mode (str): Mode d'ouverture ('r' ou 'r+')
+    
+    Returns:
+        numpy.ndarray: Tableau mappé (tableau vide si le fichier ne contient aucun élément)
+    """
+    if length == 0:
+        return np.zeros(0, dtype=dtype)
+    
+    return np.memmap(path, dtype=dtype, mode=mode, shape=(length,))
\ No newline at end of file
@@ -0,0 +1,269 @@
+# rag/image_search.py
+import os
+from functools import lru_cache
+import numpy as np
+from PIL import Image
+from scipy.fft import dctn
+
+from data_processing.image_catalog import default_catalog
+
+# Nombre de bits à 1 de chaque octet, pour la distance de Hamming
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Poids de la distance des empreintes et de celle des descripteurs couleur/texture
+HASH_WEIGHT = 0.7
+FEATURE_WEIGHT = 0.3
+
+def compute_signature(image):
+    """
+    Calcule la signature visuelle d'une image
+    
+    Args:
+        image (PIL.Image.Image): Image à analyser
+    
+    Returns:
+        tuple: (pHash sur 64 bits, dHash sur 64 bits, descripteur couleur/texture numpy.ndarray)
+    """
+    # La version réduite suffit : les formats compressés (JPEG) ne décodent que cette taille
+    image.draft('RGB', (128, 128))
+    rgb = image.convert('RGB')
+    gray = rgb.convert('L')
+    
+    # pHash : signe des basses fréquences de la DCT par rapport à leur médiane
+    pixels = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float32)
+    low = dctn(pixels, norm='ortho')[:8, :8].ravel()
+    phash = _pack_bits(low > np.median(low[1:]))
+    
+    # dHash : sens du gradient horizontal sur une grille 9 x 8
+    pixels = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    dhash = _pack_bits((pixels[:, 1:] > pixels[:, :-1]).ravel())
+    
+    # Descripteur : histogramme des couleurs (8 niveaux par canal) et des
+    # orientations du gradient pondérées par son intensité (8 directions)
+    small = np.asarray(rgb.resize((64, 64), Image.BILINEAR), dtype=np.float32)
+    colour = np.concatenate([
+        np.histogram(small[:, :, channel], bins=8, range=(0, 256))[0]
+        for channel in range(3)
+    ]).astype(np.float32)
+    
+    luminance = small.mean(axis=2)
+    gy, gx = np.gradient(luminance)
+    magnitude = np.hypot(gx, gy)
+    orientation = np.floor((np.arctan2(gy, gx) + np.pi) / (2 * np.pi) * 8).astype(np.int64) % 8
+    texture = np.bincount(orientation.ravel(), weights=magnitude.ravel(), minlength=8).astype(np.float32)
+    
+    features = np.concatenate([_unit(colour), _unit(texture)])
+    
+    return phash, dhash, _unit(features)
+
+def _pack_bits(bits):
+    """
+    Regroupe 64 booléens en un entier non signé
+    
+    Args:
+        bits (numpy.ndarray): 64 booléens
+    
+    Returns:
+        numpy.uint64: Entier dont le bit de poids fort est le premier booléen
+    """
+    return np.packbits(bits).view('>u8')[0].astype(np.uint64)
+
+def _unit(vector):
+    """
+    Normalise un vecteur (norme L2 unitaire, le vecteur nul restant nul)
+    
+    Args:
+        vector (numpy.ndarray): Vecteur
+    
+    Returns:
+        numpy.ndarray: Vecteur normalisé
+    """
+    norm = np.linalg.norm(vector)
+    
+    return vector / norm if norm > 0 else vector
+
+def hamming(hashes, query_hash):
+    """
+    Calcule la distance de Hamming entre des empreintes et une empreinte de requête
+    
+    Args:
+        hashes (numpy.ndarray): Empreintes sur 64 bits (uint64)
+        query_hash (numpy.uint64): Empreinte de la requête
+    
+    Returns:
+        numpy.ndarray: Nombre de bits différents pour chaque empreinte (0 à 64)
+    """
+    diff = np.bitwise_xor(hashes, np.uint64(query_hash))
+    
+    return POPCOUNT[diff.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+class ImageIndex:
+    """
+    Index de similarité visuelle des images de référence
+    
+    Chaque image du catalogue est résumée par deux empreintes perceptuelles
+    (pHash et dHash, 64 bits chacune) et un court descripteur couleur/texture.
+    Les empreintes sont rangées dans des tableaux d'entiers : une recherche
+    compare la photo à toutes les références par XOR et comptage de bits
+    vectorisés, ce qui prend quelques millisecondes pour des milliers d'images.
+    Les signatures sont enregistrées à côté du catalogue et ne sont recalculées
+    que pour les images nouvelles ou modifiées.
+    """
+    
+    INDEX_FILE = 'image_index.npz'
+    
+    def __init__(self, catalog=None):
+        """
+        Initialisation et construction de l'index
+        
+        Args:
+            catalog (ImageCatalog, optional): Catalogue des images.
+                Si non fourni, le catalogue du projet sera utilisé.
+        """
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.index_path = os.path.join(self.catalog.cache_dir, self.INDEX_FILE)
+        
+        self.paths = []
+        self.phashes = np.zeros(0, dtype=np.uint64)
+        self.dhashes = np.zeros(0, dtype=np.uint64)
+        self.features = np.zeros((0, 32), dtype=np.float32)
+        
+        self.build()
+    
+    def build(self):
+        """
+        Calcule les signatures des images du catalogue, en réutilisant celles enregistrées
+        
+        Returns:
+            int: Nombre d'images analysées
+        """
+        known = self._load_signatures()
+        signatures = []
+        computed = 0
+        
+        for path, entry in sorted(self.catalog.images.items()):
+            signature = known.get(entry['hash'])
+            if signature is None:
+                try:
+                    with Image.open(os.path.join(self.catalog.base_dir, path)) as image:
+                        signature = compute_signature(image)
+                except Exception as e:
+                    print(f"Erreur lors de l'analyse de l'image {path} : {str(e)}")
+                    continue
+                computed += 1
+            
+            signatures.append((path, entry['hash'], signature))
+        
+        self.paths = [path for path, _, _ in signatures]
+        self.phashes = np.array([signature[0] for _, _, signature in signatures], dtype=np.uint64)
+        self.dhashes = np.array([signature[1] for _, _, signature in signatures], dtype=np.uint64)
+        self.features = np.array([signature[2] for _, _, signature in signatures], dtype=np.float32).reshape(-1, 32)
+        
+        if computed or len(signatures) != len(known):
+            self._save_signatures([content_hash for _, content_hash, _ in signatures])
+        
+        return computed
+    
+    def _load_signatures(self):
+        """
+        Charge les signatures enregistrées
+        
+        Returns:
+            dict: Empreinte du contenu -> signature (pHash, dHash, descripteur)
+        """
+        if not os.path.exists(self.index_path):
+            return {}
+        
+        try:
+            with np.load(self.index_path) as data:
+                return {
+                    str(content_hash): (phash, dhash, features)
+                    for content_hash, phash, dhash, features in zip(
+                        data['hashes'], data['phashes'], data['dhashes'], data['features']
+                    )
+                }
+        except Exception as e:
+            print(f"Erreur lors du chargement de l'index des images {self.index_path} : {str(e)}")
+            return {}
+    
+    def _save_signatures(self, content_hashes):
+        """
+        Enregistre les signatures à côté du catalogue
+        
+        Args:
+            content_hashes (list): Empreintes du contenu des images, dans l'ordre de self.paths
+        """
+        tmp_path = self.index_path + '.tmp.npz'
+        
+        try:
+            os.makedirs(self.catalog.cache_dir, exist_ok=True)
+            np.savez(
+                tmp_path,
+                hashes=np.array(content_hashes, dtype=str),
+                phashes=self.phashes,
+                dhashes=self.dhashes,
+                features=self.features
+            )
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement de l'index des images {self.index_path} : {str(e)}")
+    
+    def search(self, image, top_k=5, category=None):
+        """
+        Recherche les images de référence les plus proches d'une photo
+        
+        Args:
+            image (str or PIL.Image.Image): Chemin ou image de la photo
+            top_k (int, optional): Nombre de résultats à retourner
+            category (str or list, optional): Limite la recherche à un ou plusieurs dossiers
+                ('defauts', 'anomalies'...)
+        
+        Returns:
+            list: Résultats par distance croissante, avec les clés 'path', 'distance'
+                (0 à 1), 'similarity' (1 - distance), 'category' et 'tags'
+        """
+        if isinstance(image, str):
+            with Image.open(image) as opened:
+                phash, dhash, features = compute_signature(opened)
+        else:
+            phash, dhash, features = compute_signature(image)
+        
+        rows = np.arange(len(self.paths))
+        if category is not None:
+            categories = [category] if isinstance(category, str) else category
+            allowed = {path for name in categories for path in self.catalog.find(category=name)}
+            rows = np.array([i for i, path in enumerate(self.paths) if path in allowed], dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        
+        # Distance des empreintes (0 à 1) et distance cosinus des descripteurs (0 à 1)
+        hash_distance = (hamming(self.phashes[rows], phash) + hamming(self.dhashes[rows], dhash)) / 128.0
+        feature_distance = 1.0 - self.features[rows] @ features
+        distances = HASH_WEIGHT * hash_distance + FEATURE_WEIGHT * np.clip(feature_distance, 0.0, 1.0)
+        
+        k = min(top_k, len(rows))
+        best = np.argpartition(distances, k - 1)[:k]
+        best = best[np.argsort(distances[best], kind='stable')]
+        
+        results = []
+        for i in best.tolist():
+            entry = self.catalog.get(self.paths[rows[i]])
+            results.append({
+                'path': entry['path'],
+                'distance': float(distances[i]),
+                'similarity': float(1.0 - distances[i]),
+                'category': entry['category'],
+                'tags': entry['tags']
+            })
+        
+        return results
+
+@lru_cache(maxsize=1)
+def default_image_index():
+    """
+    Récupère l'index des images du projet, construit une seule fois par processus
+    
+    Returns:
+        ImageIndex: Index du catalogue du projet
+    """
+    return ImageIndex()
\ No newline at end of file
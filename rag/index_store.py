@@ -0,0 +1,402 @@
+# rag/index_store.py
+import os
+import json
+import shutil
+import time
+import uuid
+from datetime import datetime
+import numpy as np
+from scipy import sparse
+
+from rag.documents import DocumentTable
+
+class IndexStore:
+    """
+    Stockage sur disque de l'index vectoriel, versionné et mappé en mémoire
+    
+    Chaque génération de l'index est un répertoire autonome contenant :
+        - manifest.json : description de l'index (version du format, génération, forme...)
+        - vocabulary.json : vocabulaire du vectoriseur, ordonné par colonne
+        - idf.npy : poids IDF du vectoriseur
+        - data.npy, indices.npy, indptr.npy : matrice CSR des embeddings
+        - documents.jsonl : métadonnées des documents, une ligne JSON par document
+        - texts.bin : textes des documents encodés en UTF-8, à la suite
+        - document_offsets.npy, text_offsets.npy : positions des lignes et des textes
+        - <nom>.json / <nom>.npy : tables et tableaux annexes (empreintes des fichiers...)
+    
+    Le fichier CURRENT désigne la génération active. Une nouvelle génération est
+    écrite dans un répertoire temporaire puis renommée, et CURRENT est remplacé
+    atomiquement : un arrêt brutal ne peut donc pas laisser un index corrompu.
+    """
+    
+    FORMAT_VERSION = 2
+    STALE_TMP_SECONDS = 3600
+    
+    def __init__(self, index_dir, keep_generations=2):
+        """
+        Initialisation du stockage
+        
+        Args:
+            index_dir (str): Répertoire racine de l'index
+            keep_generations (int, optional): Nombre de générations conservées sur disque
+        """
+        self.index_dir = index_dir
+        self.keep_generations = max(1, keep_generations)
+        self.current_path = os.path.join(self.index_dir, 'CURRENT')
+    
+    def exists(self):
+        """
+        Vérifie si une génération valide de l'index est disponible
+        
+        Returns:
+            bool: True si l'index peut être chargé, False sinon
+        """
+        generation_dir = self._current_generation_dir()
+        return generation_dir is not None and os.path.exists(os.path.join(generation_dir, 'manifest.json'))
+    
+    def _current_generation_dir(self):
+        """
+        Récupère le répertoire de la génération active
+        
+        Returns:
+            str: Chemin du répertoire ou None si aucune génération n'est publiée
+        """
+        if not os.path.exists(self.current_path):
+            return None
+        
+        with open(self.current_path, 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+        
+        if not name:
+            return None
+        
+        return os.path.join(self.index_dir, name)
+    
+    def load(self):
+        """
+        Charge la génération active de l'index
+        
+        Le chargement lit le manifeste, le vocabulaire et les tables annexes
+        (empreintes, métadonnées...). La matrice, les tableaux annexes et les
+        documents sont ouverts avec mmap : aucun document n'est décodé avant
+        d'être consulté, et les pages sont partagées entre processus via le
+        cache du système.
+        
+        Returns:
+            dict: Contenu de l'index avec les clés 'manifest', 'documents',
+                'embeddings', 'vocabulary', 'idf', 'tables' et 'arrays'
+        """
+        generation_dir = self._current_generation_dir()
+        if generation_dir is None:
+            raise FileNotFoundError(f"Aucun index publié dans {self.index_dir}")
+        
+        with open(os.path.join(generation_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        if manifest.get('format_version') != self.FORMAT_VERSION:
+            raise ValueError(f"Version de format d'index non supportée : {manifest.get('format_version')}")
+        
+        # Matrice CSR mappée en mémoire
+        embeddings = self._load_embeddings(generation_dir, manifest)
+        
+        # Vocabulaire et poids IDF
+        vocabulary = None
+        idf = None
+        vocabulary_path = os.path.join(generation_dir, 'vocabulary.json')
+        if os.path.exists(vocabulary_path):
+            with open(vocabulary_path, 'r', encoding='utf-8') as f:
+                terms = json.load(f)
+            vocabulary = {term: i for i, term in enumerate(terms)}
+            idf = np.load(os.path.join(generation_dir, 'idf.npy'), mmap_mode='r')
+        
+        # Documents, lus à la demande
+        documents = self._open_documents(generation_dir)
+        
+        # Tables et tableaux annexes
+        tables = {}
+        for name in manifest.get('tables', []):
+            with open(os.path.join(generation_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+                tables[name] = json.load(f)
+        
+        arrays = {}
+        for name in manifest.get('arrays', []):
+            arrays[name] = np.load(os.path.join(generation_dir, f"{name}.npy"), mmap_mode='r')
+        
+        return {
+            'manifest': manifest,
+            'documents': documents,
+            'embeddings': embeddings,
+            'vocabulary': vocabulary,
+            'idf': idf,
+            'tables': tables,
+            'arrays': arrays
+        }
+    
+    def load_documents(self):
+        """
+        Ouvre uniquement les documents de la génération active
+        
+        Returns:
+            DocumentTable: Documents, lus à la demande
+        """
+        generation_dir = self._current_generation_dir()
+        if generation_dir is None:
+            raise FileNotFoundError(f"Aucun index publié dans {self.index_dir}")
+        
+        return self._open_documents(generation_dir)
+    
+    def _open_documents(self, generation_dir):
+        """
+        Ouvre les documents d'une génération avec mmap
+        
+        Args:
+            generation_dir (str): Répertoire de la génération
+        
+        Returns:
+            DocumentTable: Documents, lus à la demande
+        """
+        return DocumentTable.open(
+            os.path.join(generation_dir, 'documents.jsonl'),
+            np.load(os.path.join(generation_dir, 'document_offsets.npy'), mmap_mode='r'),
+            os.path.join(generation_dir, 'texts.bin'),
+            np.load(os.path.join(generation_dir, 'text_offsets.npy'), mmap_mode='r')
+        )
+    
+    def load_embeddings(self):
+        """
+        Charge uniquement la matrice des embeddings de la génération active
+        
+        Returns:
+            scipy.sparse.csr_matrix: Matrice mappée en mémoire, ou None si l'index n'en contient pas
+        """
+        generation_dir = self._current_generation_dir()
+        if generation_dir is None:
+            raise FileNotFoundError(f"Aucun index publié dans {self.index_dir}")
+        
+        with open(os.path.join(generation_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        return self._load_embeddings(generation_dir, manifest)
+    
+    def load_arrays(self):
+        """
+        Charge uniquement les tableaux annexes de la génération active
+        
+        Returns:
+            tuple: (tableaux nom -> numpy.ndarray mappés en mémoire, tables nom -> données)
+        """
+        generation_dir = self._current_generation_dir()
+        if generation_dir is None:
+            raise FileNotFoundError(f"Aucun index publié dans {self.index_dir}")
+        
+        with open(os.path.join(generation_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        tables = {}
+        for name in manifest.get('tables', []):
+            with open(os.path.join(generation_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+                tables[name] = json.load(f)
+        
+        arrays = {}
+        for name in manifest.get('arrays', []):
+            arrays[name] = np.load(os.path.join(generation_dir, f"{name}.npy"), mmap_mode='r')
+        
+        return arrays, tables
+    
+    def _load_embeddings(self, generation_dir, manifest):
+        """
+        Ouvre la matrice CSR d'une génération avec mmap_mode='r'
+        
+        Args:
+            generation_dir (str): Répertoire de la génération
+            manifest (dict): Manifeste de la génération
+        
+        Returns:
+            scipy.sparse.csr_matrix: Matrice mappée en mémoire, ou None si l'index n'en contient pas
+        """
+        if manifest.get('shape') is None:
+            return None
+        
+        data = np.load(os.path.join(generation_dir, 'data.npy'), mmap_mode='r')
+        indices = np.load(os.path.join(generation_dir, 'indices.npy'), mmap_mode='r')
+        indptr = np.load(os.path.join(generation_dir, 'indptr.npy'), mmap_mode='r')
+        
+        return sparse.csr_matrix((data, indices, indptr), shape=tuple(manifest['shape']), copy=False)
+    
+    def save(self, documents, embeddings, vocabulary=None, idf=None, vectorizer_params=None,
+             tables=None, arrays=None):
+        """
+        Écrit une nouvelle génération de l'index et la publie atomiquement
+        
+        Args:
+            documents (DocumentTable): Documents indexés
+            embeddings (scipy.sparse matrix): Matrice des embeddings (peut être None)
+            vocabulary (dict, optional): Vocabulaire terme -> colonne
+            idf (numpy.ndarray, optional): Poids IDF du vectoriseur
+            vectorizer_params (dict, optional): Paramètres du vectoriseur à conserver
+            tables (dict, optional): Tables annexes nom -> données sérialisables en JSON
+            arrays (dict, optional): Tableaux annexes nom -> numpy.ndarray
+        
+        Returns:
+            int: Numéro de la génération publiée
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        
+        generation = self._read_generation() + 1
+        tmp_dir = os.path.join(self.index_dir, f".tmp-{os.getpid()}-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        
+        try:
+            shape = None
+            nnz = 0
+            
+            # Matrice CSR
+            if embeddings is not None:
+                matrix = sparse.csr_matrix(embeddings)
+                matrix.sort_indices()
+                shape = list(matrix.shape)
+                nnz = int(matrix.nnz)
+                self._write_array(os.path.join(tmp_dir, 'data.npy'), matrix.data)
+                self._write_array(os.path.join(tmp_dir, 'indices.npy'), matrix.indices)
+                self._write_array(os.path.join(tmp_dir, 'indptr.npy'), matrix.indptr)
+            
+            # Vocabulaire ordonné par colonne et poids IDF
+            if vocabulary is not None:
+                terms = [None] * len(vocabulary)
+                for term, column in vocabulary.items():
+                    terms[int(column)] = term
+                self._write_json(os.path.join(tmp_dir, 'vocabulary.json'), terms)
+                self._write_array(os.path.join(tmp_dir, 'idf.npy'), np.asarray(idf, dtype=np.float64))
+            
+            # Documents : métadonnées et textes, retrouvés par leurs positions
+            document_offsets, text_offsets = documents.write(
+                os.path.join(tmp_dir, 'documents.jsonl'),
+                os.path.join(tmp_dir, 'texts.bin')
+            )
+            self._write_array(os.path.join(tmp_dir, 'document_offsets.npy'), document_offsets)
+            self._write_array(os.path.join(tmp_dir, 'text_offsets.npy'), text_offsets)
+                        
+            # Tables et tableaux annexes
+            tables = tables or {}
+            for name, data in tables.items():
+                self._write_json(os.path.join(tmp_dir, f"{name}.json"), data)
+            
+            arrays = arrays or {}
+            for name, array in arrays.items():
+                self._write_array(os.path.join(tmp_dir, f"{name}.npy"), array)
+            
+            # Manifeste écrit en dernier : sa présence valide la génération
+            manifest = {
+                'format_version': self.FORMAT_VERSION,
+                'generation': generation,
+                'created_at': datetime.now().isoformat(),
+                'n_documents': len(documents),
+                'shape': shape,
+                'nnz': nnz,
+                'dtype': str(embeddings.dtype) if embeddings is not None else None,
+                'vectorizer': vectorizer_params or {},
+                'tables': sorted(tables),
+                'arrays': sorted(arrays)
+            }
+            self._write_json(os.path.join(tmp_dir, 'manifest.json'), manifest)
+            
+            # Publier la génération
+            generation_name = f"gen-{generation:06d}"
+            os.rename(tmp_dir, os.path.join(self.index_dir, generation_name))
+            self._write_current(generation_name)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        
+        self._cleanup(generation)
+        
+        return generation
+    
+    def _read_generation(self):
+        """
+        Récupère le numéro de la génération active
+        
+        Returns:
+            int: Numéro de génération (0 si aucun index n'est publié)
+        """
+        generation_dir = self._current_generation_dir()
+        if generation_dir is None:
+            return 0
+        
+        try:
+            return int(os.path.basename(generation_dir).split('-')[1])
+        except (IndexError, ValueError):
+            return 0
+    
+    def _write_current(self, generation_name):
+        """
+        Remplace atomiquement le pointeur CURRENT
+        
+        Args:
+            generation_name (str): Nom du répertoire de la génération à publier
+        """
+        tmp_path = f"{self.current_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(generation_name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.current_path)
+    
+    def _write_array(self, path, array):
+        """
+        Écrit un tableau numpy et force son écriture sur disque
+        
+        Args:
+            path (str): Chemin du fichier .npy
+            array (numpy.ndarray): Tableau à écrire
+        """
+        with open(path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _write_json(self, path, data):
+        """
+        Écrit un fichier JSON et force son écriture sur disque
+        
+        Args:
+            path (str): Chemin du fichier
+            data: Données sérialisables en JSON
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _cleanup(self, current_generation):
+        """
+        Supprime les anciennes générations et les répertoires temporaires abandonnés
+        
+        Les générations récentes sont conservées pour les processus qui les
+        ont encore ouvertes. Les erreurs de suppression sont ignorées (fichiers
+        encore mappés sous Windows, par exemple).
+        
+        Args:
+            current_generation (int): Numéro de la génération active
+        """
+        for name in os.listdir(self.index_dir):
+            path = os.path.join(self.index_dir, name)
+            
+            if name.startswith('gen-'):
+                try:
+                    generation = int(name.split('-')[1])
+                except (IndexError, ValueError):
+                    continue
+                if generation > current_generation - self.keep_generations:
+                    continue
+            elif name.startswith('.tmp-'):
+                # Ne pas toucher aux écritures en cours d'un autre processus
+                try:
+                    if time.time() - os.path.getmtime(path) < self.STALE_TMP_SECONDS:
+                        continue
+                except OSError:
+                    continue
+            else:
+                continue
+            
+            shutil.rmtree(path, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,128 @@
+# rag/lazy_db.py
+import os
+import threading
+
+from rag.config import load_config
+
+class LazyVectorDB:
+    """
+    Base de données vectorielle chargée en arrière-plan
+    
+    Le constructeur rend la main immédiatement : l'import des bibliothèques de
+    calcul, puis le chargement de l'index (ou son indexation complète s'il est
+    absent ou illisible) se font dans un thread séparé. Les appelants attendent
+    la fin du chargement avec wait_ready, ou traitent l'index comme en cours de
+    préparation tant que ready est False.
+    
+    Si la configuration définit des shards, la base chargée est une ShardedVectorDB.
+    """
+    
+    def __init__(self, data_dir=None, refit_threshold=None, backend=None):
+        """
+        Initialisation de la base et lancement du chargement
+        
+        Args:
+            data_dir (str, optional): Répertoire contenant les données.
+                Si non fourni, un répertoire par défaut sera utilisé.
+            refit_threshold (float, optional): Seuil de réentraînement du vectoriseur (voir VectorDB)
+            backend (str, optional): Moteur de recherche ('tfidf', 'bm25' ou 'lsa')
+        """
+        # Définir le répertoire de données
+        if data_dir is None:
+            self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        else:
+            self.data_dir = data_dir
+        
+        # La configuration est disponible tout de suite (cache du Retriever, délais...)
+        self.config = load_config(self.data_dir)
+        
+        self.db = None
+        self.error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(
+            target=self._warm_up,
+            args=(refit_threshold, backend),
+            name='vectordb-warm-up',
+            daemon=True
+        )
+        self._thread.start()
+    
+    def _warm_up(self, refit_threshold, backend):
+        """
+        Charge ou construit la base de données (thread de chargement)
+        
+        Args:
+            refit_threshold (float): Seuil de réentraînement du vectoriseur
+            backend (str): Moteur de recherche
+        """
+        try:
+            # Import différé : scikit-learn à lui seul prend plus d'une seconde à charger
+            if self.config['shards']:
+                from rag.sharded_db import ShardedVectorDB
+                
+                self.db = ShardedVectorDB(self.data_dir, refit_threshold=refit_threshold, backend=backend)
+            else:
+                from rag.vectordb import VectorDB
+                
+                self.db = VectorDB(self.data_dir, refit_threshold=refit_threshold, backend=backend)
+        except Exception as e:
+            self.error = e
+            print(f"Erreur lors du chargement de la base de données vectorielle : {str(e)}")
+        finally:
+            self._done.set()
+    
+    @property
+    def ready(self):
+        """
+        bool: True si la base de données est chargée et interrogeable
+        """
+        return self.db is not None
+    
+    @property
+    def generation(self):
+        """
+        int: Génération de l'index, ou None tant que la base n'est pas chargée
+        """
+        return self.db.generation if self.db is not None else None
+    
+    def wait_ready(self, timeout=None):
+        """
+        Attend la fin du chargement de la base de données
+        
+        Args:
+            timeout (float, optional): Délai maximal d'attente en secondes (None : sans limite)
+        
+        Returns:
+            bool: True si la base est prête, False si le délai est écoulé ou si le chargement a échoué
+        """
+        self._done.wait(timeout)
+        
+        return self.ready
+    
+    def get(self):
+        """
+        Récupère la base de données, en attendant la fin du chargement
+        
+        Returns:
+            VectorDB or ShardedVectorDB: Base de données chargée
+        
+        Raises:
+            RuntimeError: Si le chargement a échoué
+        """
+        if not self.wait_ready():
+            raise RuntimeError(f"La base de données vectorielle n'a pas pu être chargée : {str(self.error)}")
+        
+        return self.db
+    
+    def __getattr__(self, name):
+        """
+        Donne accès aux attributs et méthodes de la base chargée (search, update_db...)
+        
+        L'accès attend la fin du chargement ; pour ne pas bloquer, vérifier ready
+        ou appeler wait_ready avec un délai au préalable.
+        """
+        # Attributs internes absents (pendant l'initialisation) : pas de délégation
+        if name.startswith('_') or name in ('db', 'error', 'config', 'data_dir'):
+            raise AttributeError(name)
+        
+        return getattr(self.get(), name)
\ No newline at end of file
@@ -0,0 +1,182 @@
+# rag/lsa.py
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+class LSAIndex:
+    """
+    Index sémantique dense (analyse sémantique latente)
+    
+    Les passages sont projetés sur les premières composantes d'une décomposition
+    en valeurs singulières de la matrice TF-IDF : des termes employés dans les
+    mêmes contextes ("percement" et "fuite", par exemple) se retrouvent proches.
+    Les vecteurs, normalisés, sont stockés en float16 et lus par blocs depuis
+    l'index projeté en mémoire : le coût d'une recherche reste proportionnel
+    au nombre de passages, avec une empreinte mémoire fixe.
+    """
+    
+    def __init__(self, components, vectors, block_size=65536):
+        """
+        Initialisation de l'index
+        
+        Args:
+            components (numpy.ndarray): Composantes de la décomposition (dimensions x termes)
+            vectors (numpy.ndarray): Vecteurs normalisés des passages (passages x dimensions), float16
+            block_size (int, optional): Nombre de passages évalués par bloc lors d'une recherche
+        """
+        self.components = components
+        self.vectors = vectors
+        self.block_size = block_size
+    
+    @classmethod
+    def build(cls, embeddings, n_components=128, block_size=65536, random_state=0):
+        """
+        Construit l'index à partir de la matrice TF-IDF des passages
+        
+        Args:
+            embeddings (scipy.sparse matrix): Matrice TF-IDF (passages x termes)
+            n_components (int, optional): Nombre de dimensions des vecteurs
+            block_size (int, optional): Nombre de passages évalués par bloc
+            random_state (int, optional): Graine de la décomposition (résultat reproductible)
+        
+        Returns:
+            LSAIndex: Index construit, ou None si le corpus est trop petit
+        """
+        n_components = min(n_components, min(embeddings.shape) - 1)
+        if n_components < 1:
+            return None
+        
+        svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+        vectors = svd.fit_transform(embeddings)
+        
+        return cls(svd.components_.astype(np.float32), _normalize(vectors).astype(np.float16), block_size)
+    
+    @classmethod
+    def from_arrays(cls, arrays, params):
+        """
+        Reconstruit l'index à partir des tableaux stockés
+        
+        Args:
+            arrays (dict): Tableaux annexes de l'index
+            params (dict): Paramètres de l'index ('block_size')
+        
+        Returns:
+            LSAIndex: Index reconstruit, ou None si l'index n'en contient pas
+        """
+        if 'lsa_vectors' not in arrays:
+            return None
+        
+        return cls(arrays['lsa_components'], arrays['lsa_vectors'], params.get('block_size', 65536))
+    
+    def to_arrays(self):
+        """
+        Convertit l'index en tableaux à stocker
+        
+        Returns:
+            tuple: (tableaux nom -> numpy.ndarray, paramètres sérialisables en JSON)
+        """
+        arrays = {
+            'lsa_components': self.components,
+            'lsa_vectors': self.vectors
+        }
+        params = {
+            'n_components': int(self.components.shape[0]),
+            'block_size': self.block_size
+        }
+        
+        return arrays, params
+    
+    def transform(self, embeddings):
+        """
+        Projette des vecteurs TF-IDF dans l'espace latent
+        
+        Args:
+            embeddings (scipy.sparse matrix): Matrice TF-IDF (lignes x termes)
+        
+        Returns:
+            numpy.ndarray: Vecteurs normalisés (lignes x dimensions), float32
+        """
+        return _normalize(np.asarray(embeddings @ self.components.T, dtype=np.float32))
+    
+    def update(self, kept_rows, embeddings):
+        """
+        Construit un nouvel index avec une partie des passages et de nouveaux passages
+        
+        Les nouveaux passages sont projetés sur les composantes existantes, sans
+        recalculer la décomposition.
+        
+        Args:
+            kept_rows (array-like): Passages de l'index à conserver
+            embeddings (scipy.sparse matrix): Matrice TF-IDF des nouveaux passages
+        
+        Returns:
+            LSAIndex: Nouvel index
+        """
+        vectors = [np.asarray(self.vectors)[kept_rows]]
+        if embeddings.shape[0]:
+            vectors.append(self.transform(embeddings).astype(np.float16))
+        
+        return LSAIndex(self.components, np.concatenate(vectors), self.block_size)
+    
+    def top_k(self, query_vectors, k, vectors=None, excluded=None):
+        """
+        Recherche les passages les plus similaires à un lot de requêtes
+        
+        Les vecteurs sont convertis en float32 et multipliés par les requêtes bloc
+        par bloc ; seuls les k meilleurs candidats de chaque requête sont conservés
+        d'un bloc à l'autre.
+        
+        Args:
+            query_vectors (numpy.ndarray): Vecteurs des requêtes (requêtes x dimensions)
+            k (int): Nombre de passages à retourner par requête
+            vectors (numpy.ndarray, optional): Vecteurs d'un sous-ensemble de passages.
+                Si non fourni, tous les passages de l'index sont évalués.
+            excluded (numpy.ndarray, optional): Masque booléen des passages à ignorer
+                (aligné sur vectors)
+        
+        Returns:
+            list: Pour chaque requête, couple (indices des passages, similarités), non trié
+        """
+        if vectors is None:
+            vectors = self.vectors
+        
+        n_queries = query_vectors.shape[0]
+        best_rows = np.zeros((0, n_queries), dtype=np.int64)
+        best_scores = np.zeros((0, n_queries), dtype=np.float32)
+        
+        for start in range(0, vectors.shape[0], self.block_size):
+            block = np.asarray(vectors[start:start + self.block_size], dtype=np.float32)
+            scores = block @ query_vectors.T
+            if excluded is not None:
+                scores[excluded[start:start + self.block_size]] = -np.inf
+            
+            # Meilleurs candidats du bloc, fusionnés avec ceux des blocs précédents
+            if scores.shape[0] > k:
+                rows = np.argpartition(-scores, k - 1, axis=0)[:k]
+                scores = np.take_along_axis(scores, rows, axis=0)
+            else:
+                rows = np.broadcast_to(np.arange(scores.shape[0])[:, None], scores.shape)
+            
+            best_rows = np.concatenate([best_rows, rows + start])
+            best_scores = np.concatenate([best_scores, scores])
+            
+            if best_rows.shape[0] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=0)[:k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=0)
+                best_scores = np.take_along_axis(best_scores, keep, axis=0)
+        
+        return [(best_rows[:, i], best_scores[:, i]) for i in range(n_queries)]
+
+def _normalize(vectors):
+    """
+    Normalise des vecteurs (norme L2 unitaire, les vecteurs nuls restant nuls)
+    
+    Args:
+        vectors (numpy.ndarray): Vecteurs en lignes
+    
+    Returns:
+        numpy.ndarray: Vecteurs normalisés
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    
+    return vectors / norms
\ No newline at end of file
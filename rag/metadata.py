@@ -0,0 +1,387 @@
+# rag/metadata.py
+import os
+import re
+import unicodedata
+import numpy as np
+
+# Facettes indexées pour chaque document
+FACETS = ('type', 'category', 'component', 'subcomponent')
+
+# Noms des équipements (après normalisation) -> nom canonique
+EQUIPMENT_ALIASES = {
+    'economiseur': 'economiseur',
+    'surchauffeur': 'surchauffeur',
+    'rechauffeur': 'rechauffeur',
+    # Abréviations et variantes rencontrées dans les noms de fichiers
+    'eco': 'economiseur',
+    'sur': 'surchauffeur',
+    'rch': 'rechauffeur',
+    'rechauffeu': 'rechauffeur',
+    'ruchauffeur': 'rechauffeur'
+}
+
+# Seuls les noms complets sont recherchés dans le contenu ("sur" est aussi une préposition)
+CONTENT_EQUIPMENTS = ('economiseur', 'surchauffeur', 'rechauffeur')
+
+# Sous-composants : expression régulière sur le texte normalisé -> nom canonique
+SUBCOMPONENT_PATTERNS = [
+    (re.compile(r'\bcollecteurs? (?:d |de )?entree'), 'collecteur entree'),
+    (re.compile(r'\bcollecteurs? (?:d |de )?sortie'), 'collecteur sortie'),
+    (re.compile(r'\bbranches? (?:d |de )?entree'), 'branches entree'),
+    (re.compile(r'\bbranches? (?:d |de )?sortie'), 'branches sortie'),
+    (re.compile(r'\btubes? (?:de )?suspension'), 'tubes suspension'),
+    (re.compile(r'\btubes? porteurs?\b'), 'tube porteur'),
+    (re.compile(r'\bepingles?\b'), 'epingle')
+]
+
+# Mots du morceau de texte précédent repris devant le suivant (mentions les plus longues)
+OVERLAP_WORDS = 3
+
+# Catégories de documents reconnues dans les noms de fichiers
+CATEGORIES = ('amdec', 'gamme', 'historique')
+
+def normalize_text(text):
+    """
+    Normalise un texte pour la détection des métadonnées
+    
+    Args:
+        text (str): Texte à normaliser
+    
+    Returns:
+        str: Texte en minuscules, sans accents ni ponctuation, espaces simples
+    """
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+def find_components(text, aliases=None):
+    """
+    Recherche les composants (équipement + niveau BT/HT) cités dans un texte normalisé
+    
+    Args:
+        text (str): Texte normalisé
+        aliases (dict, optional): Noms d'équipements reconnus -> nom canonique
+    
+    Returns:
+        list: Composants trouvés ('economiseur bt', ...), dans l'ordre d'apparition
+    """
+    if aliases is None:
+        aliases = {name: name for name in CONTENT_EQUIPMENTS}
+    
+    pattern = r'\b(' + '|'.join(sorted(aliases, key=len, reverse=True)) + r') (bt|ht)\b'
+    components = []
+    
+    for equipment, level in re.findall(pattern, text):
+        component = f"{aliases[equipment]} {level}"
+        if component not in components:
+            components.append(component)
+    
+    return components
+
+def find_subcomponents(text):
+    """
+    Recherche les sous-composants cités dans un texte normalisé
+    
+    Args:
+        text (str): Texte normalisé
+    
+    Returns:
+        list: Sous-composants trouvés ('collecteur sortie', ...)
+    """
+    return [name for pattern, name in SUBCOMPONENT_PATTERNS if pattern.search(text)]
+
+def extract_metadata(document, texts=None):
+    """
+    Détermine les métadonnées d'un document à partir de son nom de fichier et de son contenu
+    
+    Le nom de fichier (ex. gamme_maintenance_eco_bt.docx) est prioritaire pour
+    le composant ; à défaut, les composants cités dans le texte sont retenus.
+    Les sous-composants sont ceux du nom de fichier et du texte.
+    
+    Args:
+        document (dict): Document avec les clés 'id', 'path', 'text' et 'type'
+        texts (iterable, optional): Texte du document en morceaux successifs, lus une
+            seule fois, à la place de la clé 'text' (ex. blocs de lignes d'un classeur)
+    
+    Returns:
+        dict: Métadonnées avec les clés 'type', 'category', 'component' et 'subcomponent'
+            (listes de valeurs, éventuellement vides, sauf 'type')
+    """
+    name = normalize_text(os.path.splitext(os.path.basename(document.get('path') or document['id']))[0])
+    if texts is None:
+        texts = [document['text']]
+    
+    content_components = []
+    content_subcomponents = set()
+    tail = ''
+    
+    for piece in texts:
+        # Les derniers mots du morceau précédent complètent les mentions à cheval
+        text = f"{tail} {normalize_text(piece)}".strip()
+        for component in find_components(text):
+            if component not in content_components:
+                content_components.append(component)
+        content_subcomponents.update(find_subcomponents(text))
+        tail = ' '.join(text.rsplit(' ', OVERLAP_WORDS)[-OVERLAP_WORDS:])
+    
+    components = find_components(name, EQUIPMENT_ALIASES) or content_components
+    
+    subcomponents = find_subcomponents(name)
+    for _, subcomponent in SUBCOMPONENT_PATTERNS:
+        if subcomponent in content_subcomponents and subcomponent not in subcomponents:
+            subcomponents.append(subcomponent)
+    
+    return {
+        'type': document['type'],
+        'category': [category for category in CATEGORIES if category in name.split()],
+        'component': components,
+        'subcomponent': subcomponents
+    }
+
+def filter_key(filters):
+    """
+    Construit une clé hachable à partir de filtres de métadonnées
+    
+    Args:
+        filters (dict): Facette -> valeur ou liste de valeurs, ou None
+    
+    Returns:
+        tuple: Clé indépendante de l'ordre des filtres et des valeurs, ou None sans filtre
+    """
+    if not filters:
+        return None
+    
+    return tuple(sorted(
+        (facet, tuple(sorted(value)) if isinstance(value, (list, tuple, set)) else value)
+        for facet, value in filters.items()
+        if value is not None
+    )) or None
+
+class MetadataIndex:
+    """
+    Index des documents par identifiant et par facette
+    
+    L'identifiant donne directement la ligne du document ; chaque valeur de
+    facette (type, catégorie, composant, sous-composant) donne l'ensemble des
+    lignes des documents correspondants.
+    """
+    
+    def __init__(self, ids=None, facets=None):
+        """
+        Initialisation de l'index
+        
+        Args:
+            ids (dict, optional): Identifiant -> ligne du document
+            facets (dict, optional): Facette -> {valeur -> ensemble des lignes}
+        """
+        self.ids = ids if ids is not None else {}
+        self.facets = facets if facets is not None else {facet: {} for facet in FACETS}
+    
+    @classmethod
+    def build(cls, documents):
+        """
+        Construit l'index d'une liste de documents
+        
+        Args:
+            documents (list): Documents de la base (avec la clé 'metadata')
+        
+        Returns:
+            MetadataIndex: Index construit
+        """
+        index = cls()
+        index.add(documents)
+        
+        return index
+    
+    @classmethod
+    def from_table(cls, table):
+        """
+        Reconstruit l'index à partir de la table stockée
+        
+        Args:
+            table (dict): Table 'metadata' de l'index
+        
+        Returns:
+            MetadataIndex: Index reconstruit, ou None si l'index n'en contient pas
+        """
+        if not table:
+            return None
+        
+        facets = {
+            facet: {value: set(rows) for value, rows in table['facets'].get(facet, {}).items()}
+            for facet in FACETS
+        }
+        
+        return cls(dict(table['ids']), facets)
+    
+    def to_table(self):
+        """
+        Convertit l'index en table sérialisable en JSON
+        
+        Returns:
+            dict: Table avec les clés 'ids' et 'facets'
+        """
+        return {
+            'ids': self.ids,
+            'facets': {
+                facet: {value: sorted(rows) for value, rows in values.items()}
+                for facet, values in self.facets.items()
+            }
+        }
+    
+    def add(self, documents, first_row=0):
+        """
+        Ajoute des documents à l'index
+        
+        Args:
+            documents (list): Documents à ajouter (avec la clé 'metadata')
+            first_row (int, optional): Ligne du premier document dans la base
+        """
+        for row, doc in enumerate(documents, start=first_row):
+            self.ids[doc['id']] = row
+            
+            for facet in FACETS:
+                values = doc['metadata'].get(facet)
+                if isinstance(values, str):
+                    values = [values]
+                for value in values or []:
+                    self.facets[facet].setdefault(value, set()).add(row)
+    
+    def copy(self):
+        """
+        Copie l'index (les ensembles de lignes sont copiés)
+        
+        Returns:
+            MetadataIndex: Copie indépendante
+        """
+        facets = {facet: {value: set(rows) for value, rows in values.items()} for facet, values in self.facets.items()}
+        
+        return MetadataIndex(dict(self.ids), facets)
+    
+    def remove(self, row, document):
+        """
+        Retire un document de l'index
+        
+        Args:
+            row (int): Ligne du document
+            document (dict): Document (avec la clé 'metadata')
+        """
+        if self.ids.get(document['id']) == row:
+            del self.ids[document['id']]
+        
+        for facet in FACETS:
+            values = document['metadata'].get(facet)
+            if isinstance(values, str):
+                values = [values]
+            for value in values or []:
+                rows = self.facets[facet].get(value)
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del self.facets[facet][value]
+    
+    def select(self, kept_rows):
+        """
+        Extrait l'index d'un sous-ensemble des documents, renumérotés dans l'ordre
+        
+        Args:
+            kept_rows (list): Lignes des documents conservés, dans l'ordre croissant
+        
+        Returns:
+            MetadataIndex: Nouvel index
+        """
+        remap = {old: new for new, old in enumerate(kept_rows)}
+        
+        ids = {doc_id: remap[row] for doc_id, row in self.ids.items() if row in remap}
+        facets = {facet: {} for facet in FACETS}
+        for facet, values in self.facets.items():
+            for value, rows in values.items():
+                kept = {remap[row] for row in rows if row in remap}
+                if kept:
+                    facets[facet][value] = kept
+        
+        return MetadataIndex(ids, facets)
+    
+    def get_row(self, doc_id):
+        """
+        Récupère la ligne d'un document par son identifiant
+        
+        Args:
+            doc_id (str): Identifiant du document
+        
+        Returns:
+            int: Ligne du document, ou None si inconnu
+        """
+        return self.ids.get(doc_id)
+    
+    def rows(self, **filters):
+        """
+        Récupère les lignes des documents correspondant à des filtres
+        
+        Chaque filtre accepte une valeur ou une liste de valeurs (au moins une doit
+        correspondre) ; les filtres sont combinés entre eux.
+        
+        Args:
+            **filters: Facette -> valeur(s) recherchée(s)
+        
+        Returns:
+            numpy.ndarray: Lignes des documents, triées
+        """
+        selected = None
+        
+        for facet, values in filters.items():
+            if facet not in self.facets:
+                raise ValueError(f"Filtre inconnu : {facet}. Valeurs possibles : {', '.join(FACETS)}")
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            
+            rows = set()
+            for value in values:
+                rows |= self.facets[facet].get(self._normalize_value(facet, value), set())
+            
+            selected = rows if selected is None else selected & rows
+        
+        if selected is None:
+            selected = set(self.ids.values())
+        
+        return np.array(sorted(selected), dtype=np.int64)
+    
+    def values(self, facet):
+        """
+        Liste les valeurs connues d'une facette
+        
+        Args:
+            facet (str): Nom de la facette
+        
+        Returns:
+            list: Valeurs triées
+        """
+        return sorted(self.facets.get(facet, {}))
+    
+    @staticmethod
+    def _normalize_value(facet, value):
+        """
+        Normalise une valeur de filtre ('Économiseur BT' -> 'economiseur bt')
+        
+        Args:
+            facet (str): Nom de la facette
+            value (str): Valeur fournie
+        
+        Returns:
+            str: Valeur sous la forme stockée dans l'index
+        """
+        if facet == 'type':
+            return value
+        if facet == 'component':
+            components = find_components(normalize_text(value), EQUIPMENT_ALIASES)
+            if components:
+                return components[0]
+        if facet == 'subcomponent':
+            subcomponents = find_subcomponents(normalize_text(value))
+            if subcomponents:
+                return subcomponents[0]
+        
+        return normalize_text(value)
\ No newline at end of file
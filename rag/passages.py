@@ -0,0 +1,381 @@
+# rag/passages.py
+import numpy as np
+
+# Types de passages reconnus, stockés sous forme de code dans l'index
+PASSAGE_KINDS = ('paragraph', 'table_row', 'excel_row')
+
+def join_passages(items):
+    """
+    Assemble des passages en un texte unique et calcule leurs positions
+    
+    Les positions sont comptées en octets dans l'encodage UTF-8 du texte.
+    
+    Args:
+        items (iterable): Couples (texte, type) dans l'ordre du document
+    
+    Returns:
+        tuple: (texte complet, liste des passages [début, fin, type])
+    """
+    parts = []
+    passages = []
+    position = 0
+    
+    for text, kind in items:
+        text = text.strip()
+        if not text:
+            continue
+        
+        size = len(text.encode('utf-8'))
+        if parts:
+            position += 1
+        passages.append([position, position + size, kind])
+        parts.append(text)
+        position += size
+    
+    return '\n'.join(parts), passages
+
+def split_passages(text):
+    """
+    Découpe un texte brut en passages (une ligne non vide par passage)
+    
+    Les positions sont comptées en octets dans l'encodage UTF-8 du texte.
+    
+    Args:
+        text (str): Texte à découper
+    
+    Returns:
+        list: Liste des passages [début, fin, type]
+    """
+    passages = []
+    position = 0
+    
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped:
+            start = position + len(line[:line.index(stripped)].encode('utf-8'))
+            passages.append([start, start + len(stripped.encode('utf-8')), 'paragraph'])
+        position += len(line.encode('utf-8')) + 1
+    
+    return passages
+
+class PassageTable:
+    """
+    Table des passages indexés : chaque ligne de la matrice des embeddings
+    correspond à un passage, rattaché à son document parent
+    """
+    
+    def __init__(self, doc=None, start=None, end=None, kind=None):
+        """
+        Initialisation de la table
+        
+        Args:
+            doc (numpy.ndarray, optional): Indice du document parent de chaque passage
+            start (numpy.ndarray, optional): Position de début (en octets) dans le texte du document
+            end (numpy.ndarray, optional): Position de fin (en octets) dans le texte du document
+            kind (numpy.ndarray, optional): Code du type de passage (voir PASSAGE_KINDS)
+        """
+        self.doc = doc if doc is not None else np.zeros(0, dtype=np.int32)
+        self.start = start if start is not None else np.zeros(0, dtype=np.int64)
+        self.end = end if end is not None else np.zeros(0, dtype=np.int64)
+        self.kind = kind if kind is not None else np.zeros(0, dtype=np.uint8)
+    
+    def __len__(self):
+        return len(self.doc)
+    
+    @classmethod
+    def from_documents(cls, documents, first_doc=0):
+        """
+        Construit la table des passages d'une liste de documents
+        
+        Les documents issus des extracteurs fournissent leurs passages dans la
+        clé 'passages' (liste des passages [début, fin, type], ou PassageTable
+        pour un texte écrit sur disque, voir PassageWriter) ; les autres sont
+        découpés ligne par ligne.
+        
+        Args:
+            documents (list): Documents à découper
+            first_doc (int, optional): Indice du premier document dans la base
+        
+        Returns:
+            PassageTable: Table des passages
+        """
+        tables = []
+        doc, start, end, kind = [], [], [], []
+        
+        for i, document in enumerate(documents):
+            passages = document.get('passages')
+            
+            # Positions déjà sous forme de tableaux
+            if isinstance(passages, PassageTable):
+                tables.append(cls._from_lists(doc, start, end, kind))
+                tables.append(cls(
+                    np.full(len(passages), first_doc + i, dtype=np.int32),
+                    passages.start,
+                    passages.end,
+                    passages.kind
+                ))
+                doc, start, end, kind = [], [], [], []
+                continue
+            
+            if passages is None:
+                passages = split_passages(document['text'])
+            
+            for passage_start, passage_end, passage_kind in passages:
+                doc.append(first_doc + i)
+                start.append(passage_start)
+                end.append(passage_end)
+                kind.append(PASSAGE_KINDS.index(passage_kind))
+        
+        tables.append(cls._from_lists(doc, start, end, kind))
+        
+        return cls.stack(tables)
+    
+    @classmethod
+    def _from_lists(cls, doc, start, end, kind):
+        """
+        Construit une table à partir de listes Python
+        
+        Args:
+            doc (list): Indice du document parent de chaque passage
+            start (list): Position de début de chaque passage
+            end (list): Position de fin de chaque passage
+            kind (list): Code du type de chaque passage
+        
+        Returns:
+            PassageTable: Table des passages
+        """
+        return cls(
+            np.array(doc, dtype=np.int32),
+            np.array(start, dtype=np.int64),
+            np.array(end, dtype=np.int64),
+            np.array(kind, dtype=np.uint8)
+        )
+    
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Reconstruit la table à partir des tableaux stockés dans l'index
+        
+        Args:
+            arrays (dict): Tableaux annexes de l'index
+        
+        Returns:
+            PassageTable: Table des passages, ou None si l'index n'en contient pas
+        """
+        if 'passage_doc' not in arrays:
+            return None
+        
+        return cls(arrays['passage_doc'], arrays['passage_start'], arrays['passage_end'], arrays['passage_kind'])
+    
+    def to_arrays(self):
+        """
+        Convertit la table en tableaux à stocker dans l'index
+        
+        Returns:
+            dict: Tableaux nom -> numpy.ndarray
+        """
+        return {
+            'passage_doc': self.doc,
+            'passage_start': self.start,
+            'passage_end': self.end,
+            'passage_kind': self.kind
+        }
+    
+    @classmethod
+    def stack(cls, tables):
+        """
+        Concatène des tables de passages en une seule opération
+        
+        Args:
+            tables (list): Tables à mettre à la suite
+        
+        Returns:
+            PassageTable: Nouvelle table
+        """
+        if not tables:
+            return cls()
+        
+        return cls(*(
+            np.concatenate([getattr(table, field) for table in tables])
+            for field in ('doc', 'start', 'end', 'kind')
+        ))
+    
+    def concat(self, other):
+        """
+        Concatène deux tables de passages
+        
+        Args:
+            other (PassageTable): Table à ajouter à la suite
+        
+        Returns:
+            PassageTable: Nouvelle table
+        """
+        return PassageTable(
+            np.concatenate([self.doc, other.doc]),
+            np.concatenate([self.start, other.start]),
+            np.concatenate([self.end, other.end]),
+            np.concatenate([self.kind, other.kind])
+        )
+    
+    def select(self, rows, doc_remap=None):
+        """
+        Extrait un sous-ensemble des passages
+        
+        Args:
+            rows (array-like): Indices des passages à conserver
+            doc_remap (numpy.ndarray, optional): Nouvel indice de chaque ancien document
+        
+        Returns:
+            PassageTable: Nouvelle table
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        doc = np.asarray(self.doc)[rows]
+        if doc_remap is not None:
+            doc = doc_remap[doc].astype(np.int32)
+        
+        return PassageTable(doc, np.asarray(self.start)[rows], np.asarray(self.end)[rows], np.asarray(self.kind)[rows])
+    
+    def rows_for_documents(self, docs):
+        """
+        Récupère les indices des passages d'un ensemble de documents
+        
+        Les passages d'un même document sont contigus et rangés dans l'ordre des
+        documents : chaque document correspond à un intervalle de lignes, trouvé
+        par recherche dichotomique.
+        
+        Args:
+            docs (array-like): Indices des documents, triés
+        
+        Returns:
+            numpy.ndarray: Indices des passages, triés
+        """
+        docs = np.asarray(docs, dtype=np.int64)
+        starts = np.searchsorted(self.doc, docs, side='left')
+        ends = np.searchsorted(self.doc, docs, side='right')
+        lengths = ends - starts
+        
+        # Concaténation des intervalles [début, fin) sans boucle Python
+        offsets = starts - np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        
+        return np.repeat(offsets, lengths) + np.arange(lengths.sum(), dtype=np.int64)
+    
+    def get(self, row, documents):
+        """
+        Récupère un passage avec son texte
+        
+        Args:
+            row (int): Indice du passage
+            documents (DocumentTable): Documents de la base
+        
+        Returns:
+            dict: Passage avec les clés 'doc', 'text', 'start', 'end' et 'kind'
+        """
+        doc = int(self.doc[row])
+        start = int(self.start[row])
+        end = int(self.end[row])
+        
+        return {
+            'doc': doc,
+            'text': documents.passage_text(doc, start, end),
+            'start': start,
+            'end': end,
+            'kind': PASSAGE_KINDS[self.kind[row]]
+        }
+    
+    def texts(self, documents, first_doc=0):
+        """
+        Récupère le texte de tous les passages
+        
+        Args:
+            documents (DocumentTable): Documents de la base
+            first_doc (int, optional): Indice dans la base du premier élément de documents
+        
+        Returns:
+            list: Textes des passages, dans l'ordre des lignes
+        """
+        return [
+            documents.passage_text(doc - first_doc, start, end)
+            for doc, start, end in zip(self.doc.tolist(), self.start.tolist(), self.end.tolist())
+        ]
+    
+    def iter_texts(self, documents, batch_size, first_doc=0):
+        """
+        Parcourt le texte des passages par paquets, sans construire la liste complète
+        
+        Args:
+            documents (DocumentTable): Documents de la base
+            batch_size (int): Nombre de passages par paquet
+            first_doc (int, optional): Indice dans la base du premier élément de documents
+        
+        Yields:
+            list: Textes d'un paquet de passages, dans l'ordre des lignes
+        """
+        for first in range(0, len(self), batch_size):
+            rows = slice(first, first + batch_size)
+            yield [
+                documents.passage_text(doc - first_doc, start, end)
+                for doc, start, end in zip(self.doc[rows].tolist(), self.start[rows].tolist(), self.end[rows].tolist())
+            ]
+
+class PassageWriter:
+    """
+    Écrit le texte d'un document dans un fichier, bloc de passages par bloc
+    
+    Le fichier contient le texte que join_passages assemblerait à partir de
+    tous les blocs ; seules les positions des passages restent en mémoire,
+    sous forme de tableaux.
+    """
+    
+    def __init__(self, path):
+        """
+        Initialisation de l'écriture
+        
+        Args:
+            path (str): Fichier à créer (texte encodé en UTF-8)
+        """
+        self.path = path
+        self._file = open(path, 'wb')
+        self._position = 0
+        self._tables = []
+    
+    def write(self, items):
+        """
+        Ajoute un bloc de passages à la suite du texte
+        
+        Args:
+            items (iterable): Couples (texte, type) du bloc, dans l'ordre du document
+        
+        Returns:
+            str: Texte du bloc
+        """
+        text, passages = join_passages(items)
+        if not passages:
+            return text
+        
+        if self._position:
+            self._file.write(b'\n')
+            self._position += 1
+        data = text.encode('utf-8')
+        self._file.write(data)
+        
+        positions = np.array([passage[:2] for passage in passages], dtype=np.int64) + self._position
+        self._tables.append(PassageTable(
+            np.zeros(len(passages), dtype=np.int32),
+            positions[:, 0],
+            positions[:, 1],
+            np.array([PASSAGE_KINDS.index(passage[2]) for passage in passages], dtype=np.uint8)
+        ))
+        self._position += len(data)
+        
+        return text
+    
+    def close(self):
+        """
+        Termine l'écriture du fichier
+        
+        Returns:
+            PassageTable: Positions des passages dans le texte écrit
+        """
+        self._file.close()
+        
+        return PassageTable.stack(self._tables)
\ No newline at end of file
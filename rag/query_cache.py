@@ -0,0 +1,185 @@
+# rag/query_cache.py
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+from rag.metadata import filter_key
+
+class QueryCache:
+    """
+    Cache LRU avec durée de vie des résultats de recherche
+    
+    La taille du cache est bornée en octets (estimation de l'empreinte mémoire
+    des résultats) et non en nombre d'entrées. Toutes les entrées sont invalidées
+    dès que la génération de l'index change.
+    """
+    
+    def __init__(self, max_bytes=8 * 1024 * 1024, ttl=600):
+        """
+        Initialisation du cache
+        
+        Args:
+            max_bytes (int, optional): Taille maximale du cache en octets
+            ttl (float, optional): Durée de vie des entrées en secondes (None pour illimitée)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.generation = None
+        self.current_bytes = 0
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(query, top_k, filters=None):
+        """
+        Construit la clé de cache d'une requête
+        
+        Args:
+            query (str): Requête de recherche
+            top_k (int): Nombre de résultats demandés
+            filters (dict, optional): Filtres de métadonnées de la recherche
+        
+        Returns:
+            tuple: Clé (requête normalisée, top_k, filtres)
+        """
+        return (' '.join(query.lower().split()), top_k, filter_key(filters))
+    
+    def get(self, key, generation):
+        """
+        Récupère une entrée du cache
+        
+        Le résultat retourné est partagé avec le cache et ne doit pas être modifié.
+        
+        Args:
+            key (tuple): Clé de la requête
+            generation (int): Génération courante de l'index
+        
+        Returns:
+            Résultat en cache, ou None si absent, expiré ou invalidé
+        """
+        with self._lock:
+            self._check_generation(generation)
+            
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            
+            return value
+    
+    def put(self, key, value, generation):
+        """
+        Ajoute une entrée au cache, en évinçant les entrées les moins récemment utilisées
+        
+        Args:
+            key (tuple): Clé de la requête
+            value: Résultat à mettre en cache
+            generation (int): Génération de l'index ayant produit le résultat
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            self._check_generation(generation)
+            
+            if key in self._entries:
+                self._remove(key)
+            
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def clear(self):
+        """
+        Vide le cache
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """
+        Récupère les statistiques du cache
+        
+        Returns:
+            dict: Compteurs et occupation du cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+    
+    def _check_generation(self, generation):
+        """
+        Invalide toutes les entrées si la génération de l'index a changé
+        
+        Args:
+            generation (int): Génération courante de l'index
+        """
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self.current_bytes = 0
+            self.generation = generation
+    
+    def _remove(self, key):
+        """
+        Retire une entrée du cache
+        
+        Args:
+            key (tuple): Clé de l'entrée
+        """
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+def estimate_size(value):
+    """
+    Estime l'empreinte mémoire d'un résultat (listes, dictionnaires, chaînes...)
+    
+    Args:
+        value: Objet à mesurer
+    
+    Returns:
+        int: Taille estimée en octets
+    """
+    size = sys.getsizeof(value)
+    
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(item) for item in value)
+    
+    return size
\ No newline at end of file
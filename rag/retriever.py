@@ -7,37 +7,158 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_dir = os.path.dirname(os.path.dirname(current_dir))
 sys.path.append(project_dir)
 
-from rag.vectordb import VectorDB
+from concurrent.futures import ThreadPoolExecutor
+
+from rag.lazy_db import LazyVectorDB
+from rag.query_cache import QueryCache
+from rag.segment_matcher import get_matcher
+
+# Type des informations renvoyées tant que l'index est en cours de chargement
+WARMING_TYPE = 'warming'
 
 class Retriever:
     """
     Classe pour récupérer des informations pertinentes à partir d'une requête
     """
     
-    def __init__(self, db=None):
+    def __init__(self, db=None, warm_up_timeout=None):
         """
         Initialisation du récupérateur
         
         Args:
-            db (VectorDB, optional): Base de données vectorielle.
-                Si non fournie, une nouvelle instance sera créée.
+            db (VectorDB or LazyVectorDB, optional): Base de données vectorielle.
+                Si non fournie, une base chargée en arrière-plan sera créée.
+            warm_up_timeout (float, optional): Délai d'attente maximal d'une recherche
+                pendant le chargement de la base. Si non fourni, la valeur de la
+                configuration sera utilisée.
+        """
+        self.db = db if db is not None else LazyVectorDB()
+        self.warm_up_timeout = warm_up_timeout if warm_up_timeout is not None else self.db.config['warm_up_timeout']
+        
+        # Cache des résultats, invalidé à chaque nouvelle génération de l'index
+        cache_config = self.db.config['cache']
+        self.cache = QueryCache(max_bytes=cache_config['max_bytes'], ttl=cache_config['ttl'])
+    
+    def is_ready(self, timeout=0):
+        """
+        Vérifie que la base de données est chargée
+        
+        Args:
+            timeout (float, optional): Délai maximal d'attente en secondes
+            
+        Returns:
+            bool: True si la base peut être interrogée
         """
-        self.db = db if db is not None else VectorDB()
+        if isinstance(self.db, LazyVectorDB):
+            return self.db.wait_ready(timeout)
+        
+        return True
     
-    def retrieve(self, query, top_k=3):
+    def _warming_info(self):
+        """
+        Construit la réponse dégradée renvoyée pendant le chargement de la base
+        
+        Returns:
+            list: Une seule information de type WARMING_TYPE, avec un message en segment
+        """
+        if self.db.error is not None:
+            message = "La base documentaire n'a pas pu être chargée."
+        else:
+            message = "La base documentaire est en cours de chargement, veuillez réessayer dans quelques instants."
+        
+        return [{
+            'id': None,
+            'type': WARMING_TYPE,
+            'similarity': 0.0,
+            'segments': [message]
+        }]
+    
+    def retrieve(self, query, top_k=3, filters=None):
         """
         Récupère les informations pertinentes pour une requête
         
+        Si la base est encore en cours de chargement après warm_up_timeout, une
+        réponse dégradée est renvoyée (voir _warming_info), sans être mise en cache.
+        
         Args:
             query (str): Requête de recherche
             top_k (int, optional): Nombre de résultats à retourner
+            filters (dict, optional): Filtres de métadonnées (voir VectorDB.search)
             
         Returns:
-            list: Liste des informations récupérées
+            list: Liste des informations récupérées (partagée avec le cache, à ne pas modifier)
         """
+        if not self.is_ready(self.warm_up_timeout):
+            return self._warming_info()
+        
+        # Vérifier le cache
+        key = self.cache.make_key(query, top_k, filters)
+        generation = self.db.generation
+        retrieved_info = self.cache.get(key, generation)
+        if retrieved_info is not None:
+            return retrieved_info
+        
         # Rechercher les documents pertinents
-        search_results = self.db.search(query, top_k=top_k)
+        search_results = self.db.search(query, top_k=top_k, filters=filters)
+        
+        retrieved_info = self._build_retrieved_info(query, search_results)
+        self.cache.put(key, retrieved_info, generation)
+        
+        return retrieved_info
+    
+    def retrieve_many(self, queries, top_k=3, max_workers=None, filters=None):
+        """
+        Récupère les informations pertinentes pour un lot de requêtes
+        
+        La recherche est faite en un seul passage sur l'index (VectorDB.search_many),
+        puis les segments sont extraits en parallèle dans un pool de threads.
+        
+        Args:
+            queries (list): Requêtes de recherche
+            top_k (int, optional): Nombre de résultats à retourner par requête
+            max_workers (int, optional): Nombre de threads pour l'extraction des segments
+            filters (dict, optional): Filtres de métadonnées communs à toutes les requêtes
+                        
+        Returns:
+            list: Pour chaque requête, la liste des informations récupérées
+                (réponse dégradée si la base est encore en cours de chargement)
+        """
+        queries = list(queries)
+        if not self.is_ready(self.warm_up_timeout):
+            return [self._warming_info() for _ in queries]
+        
+        generation = self.db.generation
+        keys = [self.cache.make_key(query, top_k, filters) for query in queries]
+        results = [self.cache.get(key, generation) for key in keys]
+        
+        # Seules les requêtes absentes du cache sont recherchées
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        missing_queries = [queries[i] for i in missing]
+        search_results = self.db.search_many(missing_queries, top_k=top_k, filters=filters)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            retrieved = list(executor.map(self._build_retrieved_info, missing_queries, search_results))
         
+        for i, retrieved_info in zip(missing, retrieved):
+            results[i] = retrieved_info
+            self.cache.put(keys[i], retrieved_info, generation)
+        
+        return results
+    
+    def _build_retrieved_info(self, query, search_results):
+        """
+        Met en forme les résultats de recherche d'une requête
+        
+        Args:
+            query (str): Requête de recherche
+            search_results (list): Résultats de VectorDB.search pour cette requête
+            
+        Returns:
+            list: Liste des informations récupérées
+        """
         # Extraire les informations pertinentes
         retrieved_info = []
         
@@ -45,8 +166,8 @@ class Retriever:
             document = result['document']
             similarity = result['similarity']
             
-            # Extraire des segments pertinents du document
-            segments = self._extract_segments(document['text'], query)
+            # Les passages sont déjà classés par l'index : seuls les plus longs sont recadrés
+            segments = [self._passage_segment(passage['text'], query) for passage in result['passages']]
             
             # Ajouter les informations récupérées
             retrieved_info.append({
@@ -58,10 +179,35 @@ class Retriever:
         
         return retrieved_info
     
+    def _passage_segment(self, text, query, segment_length=200):
+        """
+        Recadre un passage sur la zone la plus pertinente pour la requête
+        
+        Args:
+            text (str): Texte du passage
+            query (str): Requête de recherche
+            segment_length (int, optional): Longueur approximative du segment
+            
+        Returns:
+            str: Segment extrait du passage
+        """
+        if len(text) <= segment_length:
+            return text
+        
+        segments = self._extract_segments(text, query, max_segments=1, segment_length=segment_length)
+        if segments:
+            return segments[0]
+        
+        # Aucun mot de la requête n'apparaît tel quel : garder le début du passage
+        return text[:segment_length] + "..."
+    
     def _extract_segments(self, text, query, max_segments=3, segment_length=200):
         """
         Extrait des segments pertinents d'un texte
         
+        Les mots de la requête sont relevés en une seule passe sur le texte
+        (voir SegmentMatcher), quelle que soit la longueur des paragraphes.
+        
         Args:
             text (str): Texte à analyser
             query (str): Requête de recherche
@@ -71,70 +217,13 @@ class Retriever:
         Returns:
             list: Liste des segments extraits
         """
-        # Normaliser la requête
-        query_words = set(query.lower().split())
-        
-        # Diviser le texte en paragraphes
-        paragraphs = text.split('\n')
-        
-        # Calculer le score de pertinence pour chaque paragraphe
-        scored_paragraphs = []
-        
-        for paragraph in paragraphs:
-            # Ignorer les paragraphes vides
-            if not paragraph.strip():
-                continue
-            
-            # Calculer le score (nombre de mots de la requête présents dans le paragraphe)
-            paragraph_words = paragraph.lower()
-            score = sum(1 for word in query_words if word in paragraph_words)
-            
-            # Ajouter le paragraphe et son score
-            scored_paragraphs.append((paragraph, score))
-        
-        # Trier les paragraphes par score décroissant
-        scored_paragraphs.sort(key=lambda x: x[1], reverse=True)
-        
-        # Extraire les segments les plus pertinents
-        segments = []
-        
-        for paragraph, score in scored_paragraphs[:max_segments]:
-            # Ignorer les paragraphes non pertinents
-            if score == 0:
-                continue
-            
-            # Ajuster la longueur du segment
-            if len(paragraph) > segment_length:
-                # Rechercher la position approximative de la requête dans le paragraphe
-                best_position = 0
-                best_score = 0
-                
-                for i in range(0, len(paragraph) - segment_length, segment_length // 2):
-                    window = paragraph[i:i + segment_length].lower()
-                    window_score = sum(1 for word in query_words if word in window)
-                    
-                    if window_score > best_score:
-                        best_score = window_score
-                        best_position = i
-                
-                # Extraire le segment
-                segment = paragraph[best_position:best_position + segment_length]
-                
-                # Ajouter des points de suspension si nécessaire
-                if best_position > 0:
-                    segment = "..." + segment
-                
-                if best_position + segment_length < len(paragraph):
-                    segment = segment + "..."
-            else:
-                segment = paragraph
-            
-            segments.append(segment)
-        
-        return segments
+        return get_matcher(query).extract_segments(text, max_segments=max_segments, segment_length=segment_length)
     
     def update_db(self):
         """
         Met à jour la base de données
+        
+        Returns:
+            dict: Résumé de la mise à jour incrémentale
         """
-        self.db.update_db()
\ No newline at end of file
+        return self.db.update_db()
\ No newline at end of file
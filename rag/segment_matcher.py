@@ -0,0 +1,249 @@
+# rag/segment_matcher.py
+from functools import lru_cache
+from itertools import accumulate
+
+class SegmentMatcher:
+    """
+    Extraction des segments d'un texte les plus pertinents pour une requête
+    
+    Chaque paragraphe est lu une seule fois par mot de la requête (recherche de
+    sous-chaîne de CPython) : les positions de toutes les occurrences sont
+    relevées, puis le score de chaque fenêtre est obtenu par une somme cumulée
+    sur ces positions, sans relire ni repasser en minuscules chaque fenêtre.
+    Le coût est proportionnel à la longueur du texte et au nombre d'occurrences,
+    et non plus au nombre de fenêtres multiplié par leur longueur.
+    """
+    
+    def __init__(self, query):
+        """
+        Initialisation du matcher
+        
+        Args:
+            query (str): Requête de recherche
+        """
+        self.query = query
+        self.words = sorted(set(query.lower().split()))
+    
+    def find(self, text):
+        """
+        Relève les occurrences des mots de la requête dans un texte en minuscules
+        
+        Args:
+            text (str): Texte en minuscules
+        
+        Returns:
+            list: Pour chaque mot (dans l'ordre de self.words), positions de départ
+                croissantes, occurrences chevauchantes comprises
+        """
+        hits = []
+        
+        for word in self.words:
+            starts = []
+            position = text.find(word)
+            while position >= 0:
+                starts.append(position)
+                position = text.find(word, position + 1)
+            hits.append(starts)
+        
+        return hits
+    
+    def best_window(self, hits, text_length, segment_length):
+        """
+        Détermine la fenêtre contenant le plus de mots distincts de la requête
+        
+        Les fenêtres commencent tous les segment_length // 2 caractères. Chaque
+        occurrence couvre un intervalle de fenêtres ; les intervalles d'un même mot
+        sont fusionnés, puis une somme cumulée sur un tableau de différences donne
+        le score de toutes les fenêtres en une seule passe.
+        
+        Args:
+            hits (list): Positions des mots (voir find)
+            text_length (int): Longueur du texte
+            segment_length (int): Longueur des fenêtres
+        
+        Returns:
+            int: Début de la première fenêtre de meilleur score (0 si aucune ne contient de mot)
+        """
+        step = segment_length // 2
+        n_windows = len(range(0, text_length - segment_length, step))
+        if n_windows == 0:
+            return 0
+        
+        diff = [0] * (n_windows + 1)
+        
+        for word, starts in zip(self.words, hits):
+            # Dernière fenêtre déjà comptée pour ce mot (un mot ne compte qu'une fois par fenêtre)
+            end = -1
+            offset = segment_length - len(word)
+            for start in starts:
+                # Fenêtres k telles que k * step <= start et start + len(word) <= k * step + segment_length
+                last = start // step
+                if last <= end:
+                    continue
+                first = max(end + 1, -((offset - start) // step))
+                last = min(n_windows - 1, last)
+                if first <= last:
+                    diff[first] += 1
+                    diff[last + 1] -= 1
+                    end = last
+        
+        scores = list(accumulate(diff[:n_windows]))
+        best = max(range(n_windows), key=scores.__getitem__)
+        
+        return best * step if scores[best] > 0 else 0
+    
+    def extract_segments(self, text, max_segments=3, segment_length=200):
+        """
+        Extrait les segments d'un texte les plus pertinents pour la requête
+        
+        Les résultats sont identiques à ceux de extract_segments_naive.
+        
+        Args:
+            text (str): Texte à analyser
+            max_segments (int, optional): Nombre maximal de segments à extraire
+            segment_length (int, optional): Longueur approximative des segments
+        
+        Returns:
+            list: Liste des segments extraits
+        """
+        scored_paragraphs = []
+        
+        for paragraph in text.split('\n'):
+            # Ignorer les paragraphes vides
+            if not paragraph.strip():
+                continue
+            
+            lowered = paragraph.lower()
+            score = sum(1 for word in self.words if word in lowered)
+            scored_paragraphs.append((paragraph, lowered, score))
+        
+        # Trier les paragraphes par score décroissant (tri stable, comme la version naïve)
+        scored_paragraphs.sort(key=lambda x: x[2], reverse=True)
+        
+        segments = []
+        
+        for paragraph, lowered, score in scored_paragraphs[:max_segments]:
+            # Ignorer les paragraphes non pertinents
+            if score == 0:
+                continue
+            
+            if len(paragraph) > segment_length:
+                # Certains caractères changent de longueur ('İ') ou de forme selon le contexte
+                # ('Σ') en minuscules : les positions ne correspondent plus aux fenêtres
+                if len(lowered) != len(paragraph) or 'Σ' in paragraph:
+                    best_position = _best_window_naive(paragraph, self.words, segment_length)
+                else:
+                    best_position = self.best_window(self.find(lowered), len(paragraph), segment_length)
+                
+                segment = paragraph[best_position:best_position + segment_length]
+                
+                # Ajouter des points de suspension si nécessaire
+                if best_position > 0:
+                    segment = "..." + segment
+                
+                if best_position + segment_length < len(paragraph):
+                    segment = segment + "..."
+            else:
+                segment = paragraph
+            
+            segments.append(segment)
+        
+        return segments
+
+@lru_cache(maxsize=256)
+def get_matcher(query):
+    """
+    Récupère le matcher d'une requête (préparé une fois par requête, tous passages confondus)
+    
+    Args:
+        query (str): Requête de recherche
+    
+    Returns:
+        SegmentMatcher: Matcher de la requête
+    """
+    return SegmentMatcher(query)
+
+def _best_window_naive(paragraph, query_words, segment_length):
+    """
+    Détermine la meilleure fenêtre d'un paragraphe en réanalysant chaque fenêtre
+    
+    Args:
+        paragraph (str): Paragraphe
+        query_words (iterable): Mots de la requête en minuscules
+        segment_length (int): Longueur des fenêtres
+    
+    Returns:
+        int: Début de la première fenêtre de meilleur score
+    """
+    best_position = 0
+    best_score = 0
+    
+    for i in range(0, len(paragraph) - segment_length, segment_length // 2):
+        window = paragraph[i:i + segment_length].lower()
+        window_score = sum(1 for word in query_words if word in window)
+        
+        if window_score > best_score:
+            best_score = window_score
+            best_position = i
+    
+    return best_position
+
+def extract_segments_naive(text, query, max_segments=3, segment_length=200):
+    """
+    Extrait des segments pertinents d'un texte (version d'origine, pour comparaison)
+    
+    Chaque mot de la requête est recherché dans chaque paragraphe, puis dans
+    chaque fenêtre des paragraphes longs.
+    
+    Args:
+        text (str): Texte à analyser
+        query (str): Requête de recherche
+        max_segments (int, optional): Nombre maximal de segments à extraire
+        segment_length (int, optional): Longueur approximative des segments
+    
+    Returns:
+        list: Liste des segments extraits
+    """
+    # Normaliser la requête
+    query_words = set(query.lower().split())
+    
+    # Calculer le score de pertinence pour chaque paragraphe
+    scored_paragraphs = []
+    
+    for paragraph in text.split('\n'):
+        # Ignorer les paragraphes vides
+        if not paragraph.strip():
+            continue
+        
+        # Calculer le score (nombre de mots de la requête présents dans le paragraphe)
+        paragraph_words = paragraph.lower()
+        score = sum(1 for word in query_words if word in paragraph_words)
+        
+        scored_paragraphs.append((paragraph, score))
+    
+    # Trier les paragraphes par score décroissant
+    scored_paragraphs.sort(key=lambda x: x[1], reverse=True)
+    
+    segments = []
+    
+    for paragraph, score in scored_paragraphs[:max_segments]:
+        # Ignorer les paragraphes non pertinents
+        if score == 0:
+            continue
+        
+        if len(paragraph) > segment_length:
+            best_position = _best_window_naive(paragraph, query_words, segment_length)
+            
+            segment = paragraph[best_position:best_position + segment_length]
+            
+            if best_position > 0:
+                segment = "..." + segment
+            
+            if best_position + segment_length < len(paragraph):
+                segment = segment + "..."
+        else:
+            segment = paragraph
+        
+        segments.append(segment)
+    
+    return segments
\ No newline at end of file
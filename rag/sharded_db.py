@@ -0,0 +1,240 @@
+# rag/sharded_db.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from rag.config import load_config
+from rag.vectordb import VectorDB
+
+class ShardedVectorDB:
+    """
+    Base de données vectorielle répartie en plusieurs index indépendants (shards)
+    
+    Chaque shard (une unité de chaudière, un répertoire de documents...) est une
+    VectorDB complète, avec son propre vectoriseur, ses propres postings et son
+    propre répertoire d'index : il est chargé, mis à jour et reconstruit sans
+    toucher aux autres. Une recherche est envoyée à tous les shards en parallèle,
+    puis les résultats sont notés à nouveau avec des poids IDF calculés sur
+    l'ensemble des shards et fusionnés en un seul classement.
+    
+    Les recherches et les mises à jour utilisent des groupes de threads
+    distincts : une reconstruction ne retarde jamais une recherche.
+    """
+    
+    def __init__(self, data_dir=None, shards=None, refit_threshold=None, backend=None, max_workers=None):
+        """
+        Initialisation et chargement des shards
+        
+        Args:
+            data_dir (str, optional): Répertoire contenant les données.
+                Si non fourni, un répertoire par défaut sera utilisé.
+            shards (dict, optional): Nom du shard -> répertoires des documents (relatifs
+                au répertoire de données). Si non fourni, la valeur 'shards' de la
+                configuration, et à défaut un shard par répertoire models et maintenance.
+            refit_threshold (float, optional): Seuil de réentraînement des vectoriseurs (voir VectorDB)
+            backend (str, optional): Moteur de recherche ('tfidf', 'bm25' ou 'lsa')
+            max_workers (int, optional): Nombre de threads interrogeant les shards
+                (et, séparément, de threads les mettant à jour)
+        """
+        # Définir le répertoire de données
+        if data_dir is None:
+            self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        else:
+            self.data_dir = data_dir
+        
+        # Charger la configuration
+        self.config = load_config(self.data_dir)
+        if shards is None:
+            shards = self.config['shards'] or {'models': ['models'], 'maintenance': ['maintenance']}
+        
+        self.backend = backend if backend is not None else self.config['backend']
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or len(shards) or None, thread_name_prefix='vectordb-shard')
+        # Chargements et mises à jour, sans occuper les threads des recherches
+        self.update_executor = ThreadPoolExecutor(max_workers=max_workers or len(shards) or None, thread_name_prefix='vectordb-shard-update')
+                
+        # Charger (ou construire) les shards en parallèle
+        def load_shard(name):
+            return VectorDB(
+                self.data_dir,
+                refit_threshold=refit_threshold,
+                backend=self.backend,
+                documents_dirs=[os.path.join(self.data_dir, directory) for directory in shards[name]],
+                index_dir=os.path.join(self.data_dir, 'shards', name)
+            )
+        
+        names = list(shards)
+        self.shards = dict(zip(names, self.update_executor.map(load_shard, names)))
+    
+    @property
+    def generation(self):
+        """
+        tuple: Générations des index des shards (change dès qu'un shard est mis à jour)
+        """
+        return tuple(shard.generation for shard in self.shards.values())
+    
+    @property
+    def documents(self):
+        """
+        list: Documents de tous les shards
+        """
+        return [doc for shard in self.shards.values() for doc in shard.documents]
+    
+    def search(self, query, top_k=5, max_passages=3, filters=None):
+        """
+        Recherche les documents les plus similaires à une requête dans tous les shards
+        
+        Args:
+            query (str): Requête de recherche
+            top_k (int, optional): Nombre de résultats à retourner
+            max_passages (int, optional): Nombre maximal de passages retournés par document
+            filters (dict, optional): Filtres de métadonnées (voir VectorDB.search)
+        
+        Returns:
+            list: Liste des documents les plus similaires (avec la clé 'shard')
+        """
+        return self.search_many([query], top_k=top_k, max_passages=max_passages, filters=filters)[0]
+    
+    def search_many(self, queries, top_k=5, max_passages=3, filters=None):
+        """
+        Recherche les documents les plus similaires pour un lot de requêtes dans tous les shards
+        
+        Chaque shard renvoie ses top_k meilleurs documents, classés par son propre
+        moteur. Leurs scores dépendent des statistiques du shard (IDF, base LSA) et
+        ne sont pas comparables d'un shard à l'autre : les passages retenus sont
+        donc notés à nouveau, quel que soit le moteur, par la même similarité
+        cosinus TF-IDF, avec des poids IDF calculés sur l'ensemble des shards
+        (voir _rescore).
+        
+        Args:
+            queries (list): Requêtes de recherche
+            top_k (int, optional): Nombre de résultats à retourner par requête
+            max_passages (int, optional): Nombre maximal de passages retournés par document
+            filters (dict, optional): Filtres de métadonnées communs à toutes les requêtes
+        
+        Returns:
+            list: Pour chaque requête, la liste des documents les plus similaires
+        """
+        queries = list(queries)
+        names = list(self.shards)
+        
+        shard_results = self.executor.map(
+            lambda name: self.shards[name].search_many(queries, top_k=top_k, max_passages=max_passages, filters=filters),
+            names
+        )
+        
+        merged = [[] for _ in queries]
+        for name, results in zip(names, shard_results):
+            for i, query_results in enumerate(results):
+                merged[i].extend(dict(result, shard=name) for result in query_results)
+        
+        self._rescore(queries, merged)
+        
+        return [sorted(results, key=lambda x: x['similarity'], reverse=True)[:top_k] for results in merged]
+    
+    def _rescore(self, queries, merged):
+        """
+        Note les passages retenus par les shards avec des statistiques communes
+        
+        Les requêtes et les passages sont découpés en termes par l'analyseur des
+        vectoriseurs, puis pondérés par un IDF global (même formule que
+        TfidfVectorizer) : le nombre de passages et les fréquences documentaires
+        sont additionnés sur tous les shards. La similarité d'un passage est le
+        cosinus avec sa requête, celle d'un document celle de son meilleur passage.
+        Les résultats sont modifiés sur place.
+        
+        Args:
+            queries (list): Requêtes de recherche
+            merged (list): Pour chaque requête, les résultats de tous les shards
+        """
+        analyzers = [shard.snapshot.vectorizer.build_analyzer() for shard in self.shards.values() if shard.snapshot.vectorizer is not None]
+        owners = [i for i, results in enumerate(merged) for result in results for _ in result['passages']]
+        if not analyzers or not owners:
+            return
+        
+        texts = list(queries) + [passage['text'] for results in merged for result in results for passage in result['passages']]
+        counter = CountVectorizer(analyzer=analyzers[0], dtype=np.float32)
+        try:
+            counts = counter.fit_transform(texts)
+        except ValueError:
+            # Aucun terme dans les requêtes ni dans les passages
+            return
+        
+        # Statistiques des termes sur l'ensemble des shards
+        terms = counter.get_feature_names_out().tolist()
+        n_passages = 0
+        frequencies = np.zeros(len(terms), dtype=np.int64)
+        for shard in self.shards.values():
+            shard_passages, shard_frequencies = shard.term_statistics(terms)
+            n_passages += shard_passages
+            frequencies += shard_frequencies
+        
+        idf = np.log((1.0 + n_passages) / (1.0 + frequencies)) + 1.0
+        vectors = normalize(counts.multiply(idf.astype(np.float32)).tocsr(), norm='l2', copy=False)
+        
+        query_vectors = vectors[:len(queries)]
+        passage_vectors = vectors[len(queries):]
+        scores = np.asarray(passage_vectors.multiply(query_vectors[owners]).sum(axis=1)).ravel()
+        
+        position = 0
+        for results in merged:
+            for result in results:
+                for passage in result['passages']:
+                    passage['similarity'] = float(scores[position])
+                    position += 1
+                
+                result['passages'].sort(key=lambda x: x['similarity'], reverse=True)
+                result['similarity'] = result['passages'][0]['similarity'] if result['passages'] else 0.0
+    
+    def get_document_by_id(self, doc_id):
+        """
+        Récupère un document par son identifiant, quel que soit son shard
+        
+        Args:
+            doc_id (str): Identifiant du document
+        
+        Returns:
+            dict: Document correspondant, ou None si non trouvé
+        """
+        for shard in self.shards.values():
+            document = shard.get_document_by_id(doc_id)
+            if document is not None:
+                return document
+        
+        return None
+    
+    def find_documents(self, **filters):
+        """
+        Liste les documents de tous les shards correspondant à des filtres de métadonnées
+        
+        Args:
+            **filters: Facette -> valeur(s) (voir MetadataIndex.rows)
+        
+        Returns:
+            list: Documents correspondants, shard par shard
+        """
+        return [doc for shard in self.shards.values() for doc in shard.find_documents(**filters)]
+    
+    def update_db(self, force=False, shards=None):
+        """
+        Met à jour les shards de façon incrémentale
+        
+        Les shards sont mis à jour en parallèle ; chacun ne relit que ses propres
+        fichiers et n'écrit que dans son propre index.
+        
+        Args:
+            force (bool, optional): Si True, ré-indexe tous les documents des shards concernés
+            shards (list, optional): Noms des shards à mettre à jour. Si non fournis, tous les shards.
+        
+        Returns:
+            dict: Nom du shard -> résumé de la mise à jour (voir VectorDB.update_db)
+        """
+        names = list(shards) if shards is not None else list(self.shards)
+        unknown = [name for name in names if name not in self.shards]
+        if unknown:
+            raise ValueError(f"Shard inconnu : {', '.join(unknown)}. Valeurs possibles : {', '.join(self.shards)}")
+        
+        summaries = self.update_executor.map(lambda name: self.shards[name].update_db(force=force), names)
+        
+        return dict(zip(names, summaries))
\ No newline at end of file
@@ -0,0 +1,89 @@
+# rag/snapshot.py
+import numpy as np
+
+from rag.documents import DocumentTable
+from rag.passages import PassageTable
+from rag.metadata import MetadataIndex
+
+class IndexSnapshot:
+    """
+    État complet et immuable de l'index à un instant donné
+    
+    Une recherche lit toutes ses données dans le même instantané : les documents,
+    les passages, la matrice et le vectoriseur sont toujours cohérents entre eux.
+    Une écriture prépare un brouillon (voir draft), puis publie un nouvel
+    instantané en remplaçant la référence en une seule affectation.
+    """
+    
+    FIELDS = (
+        'documents', 'passages', 'metadata', 'deleted', 'deleted_rows', 'embeddings',
+        'vectorizer', 'bm25', 'lsa', 'generation', 'drift', 'fingerprints'
+    )
+    
+    __slots__ = FIELDS
+    
+    def __init__(self, documents=None, passages=None, metadata=None, deleted=None, deleted_rows=None,
+                 embeddings=None, vectorizer=None, bm25=None, lsa=None, generation=0, drift=None,
+                 fingerprints=None):
+        """
+        Initialisation de l'instantané
+        
+        Args:
+            documents (DocumentTable, optional): Documents de la base
+            passages (PassageTable, optional): Table des passages
+            metadata (MetadataIndex, optional): Index des métadonnées
+            deleted (numpy.ndarray, optional): Masque des documents supprimés
+            deleted_rows (numpy.ndarray, optional): Masque des passages supprimés (None si aucun)
+            embeddings (scipy.sparse.csr_matrix, optional): Matrice TF-IDF des passages
+            vectorizer (TfidfVectorizer, optional): Vectoriseur entraîné
+            bm25 (BM25Index, optional): Index BM25
+            lsa (LSAIndex, optional): Vecteurs denses LSA
+            generation (int, optional): Génération de l'index sur disque
+            drift (dict, optional): Mesure de la dérive du vocabulaire
+            fingerprints (dict, optional): Empreintes des fichiers indexés
+        """
+        if deleted is None:
+            deleted = np.zeros(0, dtype=bool)
+        deleted.flags.writeable = False
+        
+        values = {
+            'documents': documents if documents is not None else DocumentTable(),
+            'passages': passages if passages is not None else PassageTable(),
+            'metadata': metadata if metadata is not None else MetadataIndex(),
+            'deleted': deleted,
+            'deleted_rows': deleted_rows,
+            'embeddings': embeddings,
+            'vectorizer': vectorizer,
+            'bm25': bm25,
+            'lsa': lsa,
+            'generation': generation,
+            'drift': drift if drift is not None else {'fit_tokens': 0, 'drift_tokens': 0},
+            'fingerprints': fingerprints if fingerprints is not None else {}
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Un instantané de l'index ne peut pas être modifié")
+    
+    def draft(self):
+        """
+        Prépare une copie modifiable de l'instantané
+        
+        Les conteneurs modifiés sur place par les écritures (table des documents,
+        index des métadonnées, masque des suppressions, dictionnaires) sont
+        copiés ; les matrices et les index, toujours remplacés, sont partagés.
+        La copie de la table des documents partage ses fichiers ouverts : aucun
+        document n'est décodé.
+        
+        Returns:
+            dict: Valeurs des champs, à passer à IndexSnapshot(**draft) pour publier
+        """
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        values['documents'] = self.documents.copy()
+        values['metadata'] = self.metadata.copy()
+        values['deleted'] = np.array(self.deleted, dtype=bool)
+        values['drift'] = dict(self.drift)
+        values['fingerprints'] = dict(self.fingerprints)
+        
+        return values
\ No newline at end of file
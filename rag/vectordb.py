@@ -1,24 +1,107 @@
 # rag/vectordb.py
 import os
-import pandas as pd
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 import numpy as np
-import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 import pickle
 
+from rag.index_store import IndexStore
+from rag.hashing import HashingTfidfVectorizer
+from rag.extractors import list_files, fingerprint_file, extract_files
+from rag.documents import DocumentTable
+from rag.passages import PassageTable
+from rag.bm25 import BM25Index
+from rag.lsa import LSAIndex
+from rag.config import load_config
+from rag.metadata import MetadataIndex, extract_metadata, filter_key
+from rag.snapshot import IndexSnapshot
+
+def _snapshot_field(name):
+    """
+    Crée une propriété donnant accès à un champ de l'instantané de l'index
+    
+    Au cours d'une écriture, le thread qui écrit lit et modifie le brouillon du
+    prochain instantané ; les autres threads lisent l'instantané publié.
+    
+    Args:
+        name (str): Nom du champ (voir IndexSnapshot.FIELDS)
+    
+    Returns:
+        property: Propriété de VectorDB
+    """
+    def getter(self):
+        staging = getattr(self._local, 'staging', None)
+        if staging is not None:
+            return staging[name]
+        return getattr(self.snapshot, name)
+    
+    def setter(self, value):
+        staging = getattr(self._local, 'staging', None)
+        if staging is None:
+            raise AttributeError(f"{name} ne peut être modifié qu'au cours d'une écriture sur l'index")
+        staging[name] = value
+    
+    return property(getter, setter)
+
 class VectorDB:
     """
     Base de données vectorielle simple pour la recherche de documents
+    
+    Chaque ligne de la matrice des embeddings correspond à un passage (paragraphe,
+    ligne de tableau Word ou ligne Excel) rattaché à son document parent.
+    
+    Les documents supprimés sont d'abord marqués dans un masque (tombstones) et
+    ignorés par la recherche ; leurs lignes ne sont retirées de la matrice que
+    lors du compactage, déclenché lorsque leur part dépasse un seuil.
+    
+    L'état de l'index est un instantané immuable (IndexSnapshot). Les écritures
+    préparent le suivant à part et le publient d'une seule affectation : une
+    recherche n'attend jamais une reconstruction et ne voit jamais un état
+    intermédiaire.
     """
     
-    def __init__(self, data_dir=None):
+    # Moteurs de recherche disponibles
+    BACKENDS = ('tfidf', 'bm25', 'lsa')
+    
+    # Vectoriseurs disponibles
+    VECTORIZERS = ('tfidf', 'hashing')
+    
+    # Champs de l'instantané courant
+    documents = _snapshot_field('documents')
+    passages = _snapshot_field('passages')
+    metadata = _snapshot_field('metadata')
+    deleted = _snapshot_field('deleted')
+    deleted_rows = _snapshot_field('deleted_rows')
+    embeddings = _snapshot_field('embeddings')
+    vectorizer = _snapshot_field('vectorizer')
+    bm25 = _snapshot_field('bm25')
+    lsa = _snapshot_field('lsa')
+    generation = _snapshot_field('generation')
+    drift = _snapshot_field('drift')
+    fingerprints = _snapshot_field('fingerprints')
+    
+    def __init__(self, data_dir=None, refit_threshold=None, backend=None, documents_dirs=None, index_dir=None):
         """
         Initialisation de la base de données vectorielle
         
         Args:
             data_dir (str, optional): Répertoire contenant les données.
                 Si non fourni, un répertoire par défaut sera utilisé.
+            refit_threshold (float, optional): Dérive du vocabulaire (part de mots inconnus
+                ajoutés depuis le dernier entraînement) au-delà de laquelle le vectoriseur
+                est réentraîné lors d'une mise à jour. Si non fourni, la valeur de la
+                configuration sera utilisée.
+            backend (str, optional): Moteur de recherche ('tfidf', 'bm25' ou 'lsa').
+                Si non fourni, la valeur de la configuration sera utilisée.
+            documents_dirs (list, optional): Répertoires des documents à indexer.
+                Si non fournis, les répertoires models et maintenance du répertoire de données.
+            index_dir (str, optional): Répertoire de l'index sur disque.
+                Si non fourni, le répertoire index du répertoire de données.
         """
         # Définir le répertoire de données
         if data_dir is None:
@@ -26,52 +109,194 @@ class VectorDB:
         else:
             self.data_dir = data_dir
         
+        # Charger la configuration
+        self.config = load_config(self.data_dir)
+        self.backend = backend if backend is not None else self.config['backend']
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Moteur de recherche inconnu : {self.backend}. Valeurs possibles : {', '.join(self.BACKENDS)}")
+        if self.config['vectorizer']['type'] not in self.VECTORIZERS:
+            raise ValueError(f"Vectoriseur inconnu : {self.config['vectorizer']['type']}. Valeurs possibles : {', '.join(self.VECTORIZERS)}")
+        
         # Initialiser les attributs
-        self.documents = []
-        self.embeddings = None
-        self.vectorizer = None
-        self.db_path = os.path.join(self.data_dir, 'vectordb.pkl')
+        self.snapshot = IndexSnapshot()
+        self.extraction_errors = {}
+        self.refit_threshold = refit_threshold if refit_threshold is not None else self.config['refit_threshold']
+        self.filter_cache = OrderedDict()
+        self._filter_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        # Répertoire de travail d'une construction en flux, en attente de sauvegarde
+        self._build_dir = None
+        # Répertoire des textes des classeurs Excel extraits, en attente de sauvegarde
+        self._spool_dir = None
+        # Fréquences documentaires des colonnes, calculées pour le dernier instantané consulté
+        self._column_frequency = None
+        self.index_dir = index_dir if index_dir is not None else os.path.join(self.data_dir, 'index')
+        self.store = IndexStore(self.index_dir)
+        
+        # Ancien format (fichier pickle unique), migré au premier chargement de l'index par défaut
+        self.db_path = os.path.join(self.data_dir, 'vectordb.pkl') if index_dir is None else None
+        
+        # Répertoires des documents à indexer
+        if documents_dirs is None:
+            self.documents_dirs = [
+                os.path.join(self.data_dir, 'models'),
+                os.path.join(self.data_dir, 'maintenance')
+            ]
+        else:
+            self.documents_dirs = list(documents_dirs)
         
         # Charger la base de données si elle existe
-        self._load_db()
+        with self._transaction():
+            self._load_db()
+    
+    @contextmanager
+    def _transaction(self):
+        """
+        Écriture sur l'index
+        
+        Les écritures sont sérialisées. Elles travaillent sur un brouillon de
+        l'instantané courant, publié en fin d'écriture par une seule affectation ;
+        en cas d'erreur, l'instantané courant est conservé. Une écriture imbriquée
+        réutilise le brouillon de l'écriture englobante.
+        """
+        with self._write_lock:
+            if getattr(self._local, 'staging', None) is not None:
+                yield
+                return
+            
+            self._local.staging = self.snapshot.draft()
+            try:
+                yield
+                self.snapshot = IndexSnapshot(**self._local.staging)
+            finally:
+                self._local.staging = None
     
     def _load_db(self):
         """
-        Charge la base de données vectorielle depuis un fichier
+        Charge la base de données vectorielle depuis l'index sur disque
         """
-        if os.path.exists(self.db_path):
+        if self.store.exists():
             try:
-                with open(self.db_path, 'rb') as f:
-                    db_data = pickle.load(f)
+                index = self.store.load()
                 
-                self.documents = db_data.get('documents', [])
-                self.embeddings = db_data.get('embeddings')
-                self.vectorizer = db_data.get('vectorizer')
+                self.documents = index['documents']
+                self.passages = PassageTable.from_arrays(index['arrays'])
+                self.embeddings = index['embeddings']
+                self.vectorizer = self._restore_vectorizer(
+                    index['vocabulary'],
+                    index['idf'],
+                    params=index['manifest'].get('vectorizer'),
+                    arrays=index['arrays']
+                )
+                self.generation = index['manifest']['generation']
+                self.fingerprints = index['tables'].get('fingerprints', {})
+                self.drift = index['tables'].get('drift', {'fit_tokens': 0, 'drift_tokens': 0})
+                self.metadata = MetadataIndex.from_table(index['tables'].get('metadata'))
+                self._reset_tombstones(index['arrays'].get('deleted_documents'))
+                
+                # Index inversé BM25, construit au premier chargement si nécessaire
+                if self.backend == 'bm25':
+                    self.bm25 = BM25Index.from_arrays(index['arrays'], index['tables'].get('bm25', {}))
+                    if self.bm25 is None and self.vectorizer is not None:
+                        self._update_bm25(self.passages.texts(self.documents))
+                        self._save_db()
+                
+                # Vecteurs denses LSA, calculés au premier chargement si nécessaire
+                if self.backend == 'lsa':
+                    self.lsa = LSAIndex.from_arrays(index['arrays'], index['tables'].get('lsa', {}))
+                    if self.lsa is None and self.embeddings is not None:
+                        self._update_lsa()
+                        self._save_db()
                 
                 print(f"Base de données vectorielle chargée avec {len(self.documents)} documents.")
             except Exception as e:
                 print(f"Erreur lors du chargement de la base de données vectorielle : {str(e)}")
                 # Initialiser une nouvelle base de données
                 self._init_db()
+        elif self.db_path is not None and os.path.exists(self.db_path):
+            # Migrer l'ancien fichier pickle vers le nouveau format
+            self._migrate_legacy_db()
         else:
             # Initialiser une nouvelle base de données
             self._init_db()
     
+    def _migrate_legacy_db(self):
+        """
+        Convertit l'ancien fichier vectordb.pkl vers l'index sur disque
+        """
+        try:
+            with open(self.db_path, 'rb') as f:
+                db_data = pickle.load(f)
+            
+            # L'ancien format contient un vecteur par document : découper en passages
+            self.documents, self.passages = self._prepare_documents(db_data.get('documents', []))
+            self.metadata = MetadataIndex.build(self.documents.iter_records())
+            self._reset_tombstones()
+            self._fit()
+            
+            self._save_db()
+            print(f"Ancienne base de données vectorielle migrée vers {self.index_dir}.")
+        except Exception as e:
+            print(f"Erreur lors de la migration de la base de données vectorielle : {str(e)}")
+            self._init_db()
+    
+    def _new_vectorizer(self, vocabulary=None):
+        """
+        Crée un vectoriseur TF-IDF avec les paramètres de l'index
+        
+        Args:
+            vocabulary (dict, optional): Vocabulaire fixe terme -> colonne
+            
+        Returns:
+            TfidfVectorizer: Vectoriseur non entraîné
+        """
+        return TfidfVectorizer(max_features=1000, vocabulary=vocabulary, dtype=np.float32)
+    
+    def _restore_vectorizer(self, vocabulary, idf, params=None, arrays=None):
+        """
+        Reconstruit le vectoriseur à partir du vocabulaire et des poids IDF stockés
+        
+        Le type de vectoriseur est celui de l'index chargé : un changement de la
+        configuration ne prend effet qu'au prochain entraînement.
+        
+        Args:
+            vocabulary (dict): Vocabulaire terme -> colonne
+            idf (numpy.ndarray): Poids IDF
+            params (dict, optional): Paramètres du vectoriseur enregistrés dans le manifeste
+            arrays (dict, optional): Tableaux annexes de l'index
+            
+        Returns:
+            TfidfVectorizer or HashingTfidfVectorizer: Vectoriseur prêt pour transform,
+                ou None si l'index est vide
+        """
+        params = params or {}
+        if params.get('type') == 'hashing':
+            if arrays is None or 'document_frequency' not in arrays:
+                return None
+            return HashingTfidfVectorizer(
+                n_features=params['n_features'],
+                document_frequency=arrays['document_frequency'],
+                n_samples=params['n_samples']
+            )
+        
+        if vocabulary is None or idf is None:
+            return None
+        
+        vectorizer = self._new_vectorizer(vocabulary=vocabulary)
+        vectorizer.idf_ = np.asarray(idf)
+        
+        return vectorizer
+    
     def _init_db(self):
         """
         Initialise une nouvelle base de données vectorielle
         """
         # Créer les répertoires nécessaires
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        # Chemin des documents à indexer
-        documents_dirs = [
-            os.path.join(self.data_dir, 'models'),
-            os.path.join(self.data_dir, 'maintenance')
-        ]
+        os.makedirs(self.index_dir, exist_ok=True)
         
         # Indexer les documents
-        self._index_documents(documents_dirs)
+        self._index_documents(self.documents_dirs)
     
     def _index_documents(self, directories):
         """
@@ -80,133 +305,402 @@ class VectorDB:
         Args:
             directories (list): Liste des répertoires à indexer
         """
-        documents = []
+        filepaths = list_files(directories)
+        fingerprints = {filepath: fingerprint_file(filepath) for filepath in filepaths}
         
-        # Parcourir les répertoires
-        for directory in directories:
-            if not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
-                continue
+        # Extraire le contenu des fichiers (en parallèle pour un corpus conséquent)
+        self.extraction_errors = {}
+        documents = self._iter_extracted(filepaths, self.extraction_errors)
+        
+        if self.config['vectorizer']['type'] == 'hashing':
+            # Construction en flux : les documents sont découpés et vectorisés au fil
+            # de l'extraction, sans liste intermédiaire
+            self._fit_streaming(documents)
+            if len(self.passages) == 0:
+                self._discard_build()
+                self._fit()
+        else:
+            # Mettre à jour les documents et leurs passages
+            self.documents, self.passages = self._prepare_documents(list(documents))
+            self.metadata = MetadataIndex.build(self.documents.iter_records())
+            self._reset_tombstones()
             
-            # Parcourir les fichiers
-            for filename in os.listdir(directory):
-                filepath = os.path.join(directory, filename)
-                
-                # Ignorer les répertoires
-                if os.path.isdir(filepath):
-                    continue
-                
-                # Traiter les différents types de fichiers
-                if filename.endswith('.xlsx') or filename.endswith('.xls'):
-                    # Fichiers Excel
-                    try:
-                        df = pd.read_excel(filepath)
-                        text = self._dataframe_to_text(df)
-                        documents.append({
-                            'id': filename,
-                            'path': filepath,
-                            'text': text,
-                            'type': 'excel'
-                        })
-                    except Exception as e:
-                        print(f"Erreur lors de l'indexation de {filename} : {str(e)}")
-                
-                elif filename.endswith('.docx'):
-                    # Fichiers Word
-                    try:
-                        from docx import Document
-                        doc = Document(filepath)
-                        text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-                        documents.append({
-                            'id': filename,
-                            'path': filepath,
-                            'text': text,
-                            'type': 'docx'
-                        })
-                    except Exception as e:
-                        print(f"Erreur lors de l'indexation de {filename} : {str(e)}")
-                
-                elif filename.endswith('.json'):
-                    # Fichiers JSON
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        text = json.dumps(data, ensure_ascii=False)
-                        documents.append({
-                            'id': filename,
-                            'path': filepath,
-                            'text': text,
-                            'type': 'json'
-                        })
-                    except Exception as e:
-                        print(f"Erreur lors de l'indexation de {filename} : {str(e)}")
-                
-                elif filename.endswith('.txt'):
-                    # Fichiers texte
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            text = f.read()
-                        documents.append({
-                            'id': filename,
-                            'path': filepath,
-                            'text': text,
-                            'type': 'txt'
-                        })
-                    except Exception as e:
-                        print(f"Erreur lors de l'indexation de {filename} : {str(e)}")
-        
-        # Mettre à jour les documents
-        self.documents = documents
-        
-        # Créer les embeddings
-        if documents:
-            texts = [doc['text'] for doc in documents]
-            self.vectorizer = TfidfVectorizer(max_features=1000)
-            self.embeddings = self.vectorizer.fit_transform(texts)
+            # Créer les embeddings
+            self._fit()
+        
+        # Les fichiers en échec n'ont pas d'empreinte : ils seront relus à la prochaine mise à jour
+        self.fingerprints = {
+            filepath: fingerprint for filepath, fingerprint in fingerprints.items()
+            if filepath not in self.extraction_errors
+        }
         
         # Sauvegarder la base de données
         self._save_db()
     
-    def _dataframe_to_text(self, df):
+    def _extract(self, filepaths):
+        """
+        Extrait le contenu d'une liste de fichiers avec le pool de processus configuré
+        
+        Args:
+            filepaths (list): Chemins des fichiers
+            
+        Returns:
+            tuple: (documents extraits, dictionnaire chemin -> message d'erreur)
+        """
+        errors = {}
+        documents = list(self._iter_extracted(filepaths, errors))
+        
+        return documents, errors
+    
+    def _iter_extracted(self, filepaths, errors):
+        """
+        Extrait le contenu d'une liste de fichiers au fur et à mesure
+        
+        Args:
+            filepaths (list): Chemins des fichiers
+            errors (dict): Dictionnaire chemin -> message d'erreur, complété au fil de l'extraction
+            
+        Le texte des classeurs Excel est écrit au fil de leur lecture dans un
+        répertoire de travail de l'index, supprimé par _save_db une fois les
+        documents recopiés dans la génération publiée.
+        
+        Yields:
+            dict: Documents extraits, dans l'ordre des fichiers
+        """
+        if self._spool_dir is None:
+            self._spool_dir = os.path.join(self.index_dir, f".tmp-spool-{os.getpid()}-{uuid.uuid4().hex}")
+            os.makedirs(self._spool_dir)
+        
+        for filepath, document, error in extract_files(
+            filepaths,
+            workers=self.config['extraction_workers'],
+            spool_dir=self._spool_dir
+        ):
+            if error is not None:
+                print(f"Erreur lors de l'indexation de {os.path.basename(filepath)} : {error}")
+                errors[filepath] = error
+            elif document is not None:
+                yield document
+    
+    def _prepare_documents(self, documents, first_doc=0):
+        """
+        Sépare les documents de leurs passages et détermine leurs métadonnées
+        
+        Args:
+            documents (list): Documents issus des extracteurs ou fournis par l'appelant
+            first_doc (int, optional): Indice dans la base du premier document
+            
+        Returns:
+            tuple: (DocumentTable, PassageTable)
+        """
+        passages = PassageTable.from_documents(documents, first_doc=first_doc)
+        documents = [{key: value for key, value in doc.items() if key != 'passages'} for doc in documents]
+        self._attach_metadata(documents)
+        
+        return DocumentTable.from_documents(documents), passages
+    
+    def _attach_metadata(self, documents):
+        """
+        Ajoute la clé 'metadata' aux documents qui n'en ont pas
+        
+        Args:
+            documents (list): Documents à compléter
+        """
+        for doc in documents:
+            if 'metadata' not in doc:
+                doc['metadata'] = extract_metadata(doc)
+    
+    def _fit(self):
+        """
+        Entraîne le vectoriseur sur l'ensemble des passages et recalcule les embeddings
+        """
+        if not self.documents or len(self.passages) == 0:
+            self.vectorizer = None
+            self.embeddings = None
+            self.bm25 = None
+            self.lsa = None
+            self.drift = {'fit_tokens': 0, 'drift_tokens': 0}
+            return
+        
+        if self.config['vectorizer']['type'] == 'hashing':
+            self._fit_streaming()
+            return
+        
+        texts = self.passages.texts(self.documents)
+        self.vectorizer = self._new_vectorizer()
+        self.embeddings = self.vectorizer.fit_transform(texts)
+        self._update_bm25(texts)
+        self._update_lsa()
+        
+        # Volume de texte de référence pour mesurer la dérive du vocabulaire
+        analyzer = self.vectorizer.build_analyzer()
+        self.drift = {
+            'fit_tokens': sum(len(analyzer(text)) for text in texts),
+            'drift_tokens': 0
+        }
+    
+    def _fit_streaming(self, documents=None):
         """
-        Convertit un DataFrame en texte
+        Entraîne un vectoriseur par hachage en lisant les passages par paquets
+        
+        Ni la liste des textes de tous les passages ni un vocabulaire ne sont
+        construits : la matrice (et, pour BM25, celle des fréquences brutes) est
+        écrite au fil des paquets dans un répertoire de travail de l'index, puis
+        recopiée dans la génération publiée par _save_db, qui supprime ensuite ce
+        répertoire.
         
         Args:
-            df (pandas.DataFrame): DataFrame à convertir
+            documents (iterable, optional): Documents issus des extracteurs, lus au fil
+                de l'extraction ; ils remplacent ceux de la base (voir _stream_documents).
+                Si non fournis, les passages des documents de la base sont relus.
+        """
+        vectorizer_params = self.config['vectorizer']
+        self._discard_build()
+        self._build_dir = os.path.join(self.index_dir, f".tmp-build-{os.getpid()}-{uuid.uuid4().hex}")
+        
+        if documents is None:
+            batches = self.passages.iter_texts(self.documents, vectorizer_params['batch_size'])
+        else:
+            batches = self._stream_documents(documents, vectorizer_params['batch_size'])
+        
+        self.vectorizer = HashingTfidfVectorizer(n_features=vectorizer_params['n_features'])
+        self.embeddings, counts, n_tokens = self.vectorizer.fit_transform_batches(
+            batches,
+            self._build_dir,
+            keep_counts=self.backend == 'bm25'
+        )
+        
+        if counts is not None:
+            bm25_params = self.config['bm25']
+            self.bm25 = BM25Index.build(counts, k1=bm25_params['k1'], b=bm25_params['b'])
+        else:
+            self.bm25 = None
+        self._update_lsa()
+        
+        # Les mots sont comptés pendant la lecture, sans repasser sur les textes
+        self.drift = {'fit_tokens': n_tokens, 'drift_tokens': 0}
+    
+    def _stream_documents(self, documents, batch_size):
+        """
+        Prépare des documents au fil de l'extraction et découpe leurs passages en paquets
+        
+        Les documents sont préparés par groupes d'environ batch_size passages ;
+        seul le groupe courant est conservé avec ses passages sous forme de
+        listes. Une fois tous les documents lus, ils remplacent ceux de la base,
+        avec la table de leurs passages et l'index de leurs métadonnées.
+        
+        Args:
+            documents (iterable): Documents issus des extracteurs
+            batch_size (int): Nombre de passages par paquet
+            
+        Yields:
+            list: Textes d'un paquet de passages, dans l'ordre des lignes
+        """
+        prepared = DocumentTable()
+        tables = []
+        pending = []
+        n_pending = 0
+        
+        def flush_pending():
+            nonlocal n_pending
+            
+            first_doc = len(prepared)
+            chunk, chunk_passages = self._prepare_documents(pending, first_doc=first_doc)
+            
+            prepared.extend(chunk)
+            tables.append(chunk_passages)
+            pending.clear()
+            n_pending = 0
+            
+            # Textes relus par paquets (dans le fichier écrit pour un classeur Excel)
+            return chunk_passages.iter_texts(chunk, batch_size, first_doc=first_doc)
+        
+        for document in documents:
+            pending.append(document)
+            # Nombre de passages (une ligne par passage sans découpage fourni)
+            n_pending += len(document['passages']) if document.get('passages') is not None else document['text'].count('\n') + 1
+            
+            if n_pending >= batch_size:
+                yield from flush_pending()
+        
+        if pending:
+            yield from flush_pending()
+        
+        # Tables des groupes concaténées une seule fois
+        self.documents = prepared
+        self.passages = PassageTable.stack(tables)
+        self.metadata = MetadataIndex.build(self.documents.iter_records())
+        self._reset_tombstones()
+    
+    def _discard_build(self):
+        """
+        Supprime le répertoire de travail d'une construction en flux
+        """
+        if self._build_dir is not None:
+            shutil.rmtree(self._build_dir, ignore_errors=True)
+            self._build_dir = None
+    
+    def _discard_spool(self):
+        """
+        Supprime le répertoire des textes des classeurs Excel extraits
+        """
+        if self._spool_dir is not None:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
+    
+    def _term_counts(self, texts, vectorizer=None):
+        """
+        Compte les occurrences des termes du vectoriseur dans des textes
+        
+        Args:
+            texts (list): Textes à analyser
+            vectorizer (optional): Vectoriseur à utiliser. Si non fourni, celui de l'index.
             
         Returns:
-            str: Texte généré
+            scipy.sparse.csr_matrix: Fréquences des termes (textes x colonnes du vectoriseur)
+        """
+        if vectorizer is None:
+            vectorizer = self.vectorizer
+        
+        if isinstance(vectorizer, HashingTfidfVectorizer):
+            return vectorizer.count(texts)
+        
+        return CountVectorizer(vocabulary=vectorizer.vocabulary_, dtype=np.int32).transform(texts)
+    
+    def _update_bm25(self, texts, kept_rows=None):
+        """
+        Met à jour l'index inversé BM25 lorsque ce moteur est sélectionné
+        
+        L'index BM25 partage le vocabulaire du vectoriseur TF-IDF.
+        
+        Args:
+            texts (list): Textes des passages à ajouter
+            kept_rows (array-like, optional): Passages de l'index existant à conserver.
+                Si non fourni, l'index est reconstruit avec les seuls textes fournis.
         """
-        text = ""
+        if self.backend != 'bm25' or self.vectorizer is None:
+            self.bm25 = None
+            return
         
-        # Ajouter les noms de colonnes
-        text += "Colonnes: " + ", ".join(df.columns) + "\n\n"
+        bm25_params = self.config['bm25']
         
-        # Ajouter les données
-        for i, row in df.iterrows():
-            text += f"Ligne {i+1}: "
-            for col in df.columns:
-                text += f"{col}: {row[col]}, "
-            text = text[:-2] + "\n"
+        if kept_rows is not None and self.bm25 is not None:
+            # Les poids dépendent de tout le corpus : ils sont recalculés à partir
+            # des fréquences stockées, sans relire les textes des passages conservés
+            counts = sparse.vstack([self.bm25.counts[kept_rows], self._term_counts(texts)], format='csr')
+        else:
+            # Reconstruction complète à partir des passages de la base
+            if kept_rows is not None:
+                texts = self.passages.texts(self.documents)
+            counts = self._term_counts(texts)
         
-        return text
+        self.bm25 = BM25Index.build(counts, k1=bm25_params['k1'], b=bm25_params['b'])
+    
+    def _update_lsa(self, kept_rows=None):
+        """
+        Met à jour les vecteurs denses LSA lorsque ce moteur est sélectionné
+        
+        Les vecteurs sont calculés à partir de la matrice TF-IDF : ils doivent être
+        mis à jour après les embeddings.
+        
+        Args:
+            kept_rows (array-like, optional): Passages de l'index existant conservés en
+                tête des embeddings, les suivants étant nouveaux. Si non fourni, la
+                décomposition est recalculée sur tous les passages.
+        """
+        if self.backend != 'lsa' or self.embeddings is None:
+            self.lsa = None
+            return
+        
+        if kept_rows is not None and self.lsa is not None:
+            # Projection des nouveaux passages sur les composantes existantes
+            self.lsa = self.lsa.update(kept_rows, self.embeddings[len(kept_rows):])
+        else:
+            lsa_params = self.config['lsa']
+            self.lsa = LSAIndex.build(
+                self.embeddings,
+                n_components=lsa_params['n_components'],
+                block_size=lsa_params['block_size']
+            )
+    
+    def _count_unknown_tokens(self, texts):
+        """
+        Compte les mots de nouveaux passages absents du vocabulaire du vectoriseur
+        
+        Les passages sont analysés un à un : le texte complet des documents
+        n'est pas décodé.
+        
+        Args:
+            texts (list): Textes des passages à analyser
+            
+        Returns:
+            int: Nombre de mots hors vocabulaire
+        """
+        if isinstance(self.vectorizer, HashingTfidfVectorizer):
+            return self.vectorizer.count_unknown_tokens(texts)
+        
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        
+        return sum(
+            1
+            for text in texts
+            for token in analyzer(text)
+            if token not in vocabulary
+        )
     
     def _save_db(self):
         """
-        Sauvegarde la base de données vectorielle dans un fichier
+        Sauvegarde la base de données vectorielle dans une nouvelle génération de l'index
         """
-        # Créer le répertoire si nécessaire
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        vocabulary = None
+        idf = None
+        vectorizer_params = {'type': 'tfidf', 'max_features': 1000}
+        arrays = self.passages.to_arrays()
+        arrays['deleted_documents'] = self.deleted
+        
+        if isinstance(self.vectorizer, HashingTfidfVectorizer):
+            # Pas de vocabulaire : les fréquences documentaires suffisent à recalculer l'IDF
+            vectorizer_params = self.vectorizer.get_params()
+            arrays['document_frequency'] = self.vectorizer.document_frequency
+        elif self.vectorizer is not None:
+            vocabulary = self.vectorizer.vocabulary_
+            idf = self.vectorizer.idf_
         
-        # Sauvegarder les données
-        db_data = {
-            'documents': self.documents,
-            'embeddings': self.embeddings,
-            'vectorizer': self.vectorizer
+        tables = {
+            'fingerprints': self.fingerprints,
+            'drift': self.drift,
+            'metadata': self.metadata.to_table()
         }
+        if self.bm25 is not None:
+            bm25_arrays, tables['bm25'] = self.bm25.to_arrays()
+            arrays.update(bm25_arrays)
+        
+        if self.lsa is not None:
+            lsa_arrays, tables['lsa'] = self.lsa.to_arrays()
+            arrays.update(lsa_arrays)
+        
+        self.generation = self.store.save(
+            self.documents,
+            self.embeddings,
+            vocabulary=vocabulary,
+            idf=idf,
+            vectorizer_params=vectorizer_params,
+            tables=tables,
+            arrays=arrays
+        )
+        
+        # Documents relus à la demande depuis la génération publiée
+        self.documents = self.store.load_documents()
+        self._discard_spool()
         
-        with open(self.db_path, 'wb') as f:
-            pickle.dump(db_data, f)
+        # Matrices construites en flux : les relire depuis la génération publiée
+        if self._build_dir is not None:
+            self.embeddings = self.store.load_embeddings()
+            if self.bm25 is not None:
+                stored_arrays, stored_tables = self.store.load_arrays()
+                self.bm25 = BM25Index.from_arrays(stored_arrays, stored_tables['bm25'])
+            self._discard_build()
         
         print(f"Base de données vectorielle sauvegardée avec {len(self.documents)} documents.")
     
@@ -217,65 +711,407 @@ class VectorDB:
         Args:
             document (dict): Document à ajouter avec les clés 'id', 'path', 'text' et 'type'
         """
-        # Vérifier si le document est valide
-        if not all(key in document for key in ['id', 'path', 'text', 'type']):
-            raise ValueError("Le document doit contenir les clés 'id', 'path', 'text' et 'type'.")
+        self.add_documents([document])
+    
+    def add_documents(self, documents, batch_size=1000):
+        """
+        Ajoute un lot de documents à la base de données
+        
+        Les documents sont consommés par paquets de batch_size : chaque paquet est
+        vectorisé en matrice creuse, les matrices sont concaténées une seule fois
+        à la fin et la base n'est sauvegardée qu'une fois pour tout le lot.
+        
+        Args:
+            documents (iterable): Documents à ajouter avec les clés 'id', 'path', 'text' et 'type'
+            batch_size (int, optional): Nombre de documents vectorisés à la fois
+            
+        Returns:
+            int: Nombre de documents ajoutés
+        """
+        with self._transaction():
+            return self._add_documents(documents, batch_size)
+    
+    def _add_documents(self, documents, batch_size):
+        """
+        Ajoute un lot de documents à la base de données (voir add_documents)
+        
+        Args:
+            documents (iterable): Documents à ajouter
+            batch_size (int): Nombre de documents vectorisés à la fois
+            
+        Returns:
+            int: Nombre de documents ajoutés
+        """
+        added = DocumentTable()
+        new_passages = PassageTable()
+        new_matrices = []
+        new_texts = []
+        batch = []
+        
+        def flush_batch():
+            nonlocal new_passages
+            
+            batch_documents, batch_passages = self._prepare_documents(
+                batch, first_doc=len(self.documents) + len(added)
+            )
+            
+            # Sans vectoriseur, l'entraînement se fera sur l'ensemble des passages
+            if self.vectorizer is not None:
+                texts = batch_passages.texts(batch_documents, first_doc=len(self.documents) + len(added))
+                new_matrices.append(self.vectorizer.transform(texts))
+                self.drift['drift_tokens'] += self._count_unknown_tokens(texts)
+                if self.bm25 is not None:
+                    new_texts.extend(texts)
+            
+            added.extend(batch_documents)
+            new_passages = new_passages.concat(batch_passages)
+            batch.clear()
+        
+        for document in documents:
+            # Vérifier si le document est valide
+            if not all(key in document for key in ['id', 'path', 'text', 'type']):
+                raise ValueError("Le document doit contenir les clés 'id', 'path', 'text' et 'type'.")
+            
+            batch.append(document)
+            if len(batch) >= batch_size:
+                flush_batch()
+        
+        if batch:
+            flush_batch()
         
-        # Ajouter le document
-        self.documents.append(document)
+        if not added:
+            return 0
+        
+        # Ajouter les documents, leurs passages et leurs métadonnées
+        self.metadata.add(added.iter_records(), first_row=len(self.documents))
+        self.documents.extend(added)
+        self.passages = self.passages.concat(new_passages)
+        self._reset_tombstones(np.concatenate([self.deleted, np.zeros(len(added), dtype=bool)]))
         
         # Mettre à jour les embeddings
-        if self.vectorizer is None:
-            self.vectorizer = TfidfVectorizer(max_features=1000)
-            self.embeddings = self.vectorizer.fit_transform([doc['text'] for doc in self.documents])
+        if self.vectorizer is None or self.embeddings is None:
+            self._fit()
+        elif self.drift['drift_tokens'] > self.refit_threshold * max(self.drift['fit_tokens'], 1):
+            self._fit()
         else:
-            # Calculer les embeddings pour le nouveau document
-            new_embedding = self.vectorizer.transform([document['text']])
-            
-            # Concaténer avec les embeddings existants
-            if self.embeddings is not None:
-                self.embeddings = np.vstack([self.embeddings.toarray(), new_embedding.toarray()])
-            else:
-                self.embeddings = new_embedding
+            kept_rows = np.arange(self.embeddings.shape[0])
+            self.embeddings = sparse.vstack([self.embeddings] + new_matrices, format='csr', dtype=np.float32)
+            self._update_bm25(new_texts, kept_rows=kept_rows)
+            self._update_lsa(kept_rows=kept_rows)
         
         # Sauvegarder la base de données
         self._save_db()
+        
+        return len(added)
     
-    def search(self, query, top_k=5):
+    def search(self, query, top_k=5, max_passages=3, filters=None):
         """
         Recherche les documents les plus similaires à une requête
         
+        Les passages sont classés directement, puis regroupés par document : la
+        similarité d'un document est celle de son meilleur passage. Avec le moteur
+        'bm25', la similarité est le score BM25 du passage ; avec le moteur 'lsa',
+        c'est la similarité cosinus dans l'espace sémantique dense.
+        
+        Le document de chaque résultat est donné sans son texte complet, lu
+        seulement pour ses passages retenus (voir get_document_by_id).
+        
         Args:
             query (str): Requête de recherche
             top_k (int, optional): Nombre de résultats à retourner
+            max_passages (int, optional): Nombre maximal de passages retournés par document
+            filters (dict, optional): Filtres de métadonnées, par exemple
+                {'component': 'rechauffeur ht', 'subcomponent': 'branches sortie'}
             
         Returns:
-            list: Liste des documents les plus similaires
+            list: Liste des documents les plus similaires, avec leurs meilleurs passages
         """
+        return self.search_many([query], top_k=top_k, max_passages=max_passages, filters=filters)[0]
+    
+    def search_many(self, queries, top_k=5, max_passages=3, filters=None):
+        """
+        Recherche les documents les plus similaires pour un lot de requêtes
+        
+        Toutes les requêtes sont vectorisées en un seul appel et comparées à
+        l'index par un unique produit de matrices creuses ; la sélection des
+        meilleurs passages est ensuite faite ligne par ligne. Avec des filtres,
+        le produit ne porte que sur la sous-matrice des passages des documents
+        correspondants.
+        
+        La recherche lit l'instantané publié au moment de l'appel, sans attendre
+        les écritures en cours.
+        
+        Args:
+            queries (list): Requêtes de recherche
+            top_k (int, optional): Nombre de résultats à retourner par requête
+            max_passages (int, optional): Nombre maximal de passages retournés par document
+            filters (dict, optional): Filtres de métadonnées communs à toutes les requêtes
+                (facette 'type', 'category', 'component' ou 'subcomponent' -> valeur(s))
+            
+        Returns:
+            list: Pour chaque requête, la liste des documents les plus similaires
+        """
+        queries = list(queries)
+        snapshot = self.snapshot
+        
         # Vérifier si la base de données est vide
-        if not self.documents or self.embeddings is None or self.vectorizer is None:
+        if not snapshot.documents or snapshot.embeddings is None or snapshot.vectorizer is None:
+            return [[] for _ in queries]
+        
+        if not queries:
             return []
         
-        # Calculer l'embedding de la requête
-        query_embedding = self.vectorizer.transform([query])
+        # Passages des documents supprimés, ignorés jusqu'au prochain compactage
+        deleted_rows = snapshot.deleted_rows
+        
+        # Restreindre les passages candidats avant le calcul des scores
+        candidate_rows, matrix = self._filter_candidates(snapshot, filters)
+        if candidate_rows is not None and len(candidate_rows) == 0:
+            return [[] for _ in queries]
         
-        # Calculer les similarités
-        similarities = cosine_similarity(query_embedding, self.embeddings).flatten()
+        # Calculer les embeddings des requêtes
+        query_embeddings = snapshot.vectorizer.transform(queries)
         
-        # Trier les indices par similarité décroissante
-        indices = np.argsort(similarities)[::-1][:top_k]
+        scores = None
+        candidates = None
+        
+        if self.backend == 'bm25':
+            # Seuls les postings des termes des requêtes sont parcourus
+            scores = snapshot.bm25.score(query_embeddings, weights=matrix)
+            min_similarity = 0.0
+        elif self.backend == 'lsa' and snapshot.lsa is not None:
+            # Recherche dense par blocs : seuls les meilleurs passages sont conservés,
+            # avec une marge pour le regroupement par document. Les passages supprimés
+            # sont écartés pendant la recherche pour ne pas occuper cette marge.
+            query_vectors = snapshot.lsa.transform(query_embeddings)
+            excluded = deleted_rows
+            if deleted_rows is not None and candidate_rows is not None:
+                excluded = deleted_rows[candidate_rows]
+            n_candidates = top_k * max_passages * 4
+            candidates = snapshot.lsa.top_k(query_vectors, n_candidates, vectors=matrix, excluded=excluded)
+            min_similarity = 0.1
+        else:
+            # Les lignes étant normalisées (L2), le produit scalaire est la similarité cosinus
+            embeddings = snapshot.embeddings if matrix is None else matrix
+            scores = sparse.csr_matrix((embeddings @ query_embeddings.T).T)
+            min_similarity = 0.1
+        
+        def select(rows, values):
+            if candidate_rows is not None:
+                rows = candidate_rows[rows]
+            
+            # Seuil de similarité minimal, hors documents supprimés
+            mask = values > min_similarity
+            if deleted_rows is not None:
+                mask &= ~deleted_rows[rows]
+            return rows[mask], values[mask]
+        
+        def widen(i, values):
+            # Recherches denses de plus en plus larges pour une requête. Dès qu'un
+            # candidat est sous le seuil, tous les passages au-dessus sont déjà retenus.
+            k = n_candidates
+            n_vectors = (snapshot.lsa.vectors if matrix is None else matrix).shape[0]
+            while k < n_vectors and (values > min_similarity).all():
+                k *= 4
+                rows, values = snapshot.lsa.top_k(query_vectors[i:i + 1], k, vectors=matrix, excluded=excluded)[0]
+                yield select(rows, values)
         
-        # Récupérer les documents correspondants
         results = []
-        for idx in indices:
-            if similarities[idx] > 0.1:  # Seuil de similarité minimal
-                results.append({
-                    'document': self.documents[idx],
-                    'similarity': float(similarities[idx])
-                })
+        for i in range(len(queries)):
+            wider = None
+            if candidates is not None:
+                rows, values = candidates[i]
+                wider = widen(i, values)
+            else:
+                start, end = scores.indptr[i], scores.indptr[i + 1]
+                rows = scores.indices[start:end]
+                values = scores.data[start:end]
+            
+            rows, values = select(rows, values)
+            results.append(self._rank_passages(snapshot, rows, values, top_k, max_passages, wider=wider))
         
         return results
     
+    def _filter_candidates(self, snapshot, filters):
+        """
+        Détermine les passages candidats d'une recherche filtrée et leur sous-matrice
+        
+        Les lignes des documents sont données par les index de métadonnées, puis
+        converties en intervalles de passages. La sous-matrice extraite (embeddings
+        ou poids BM25) est conservée pour les filtres les plus récents, jusqu'au
+        changement de génération de l'index.
+        
+        Args:
+            snapshot (IndexSnapshot): Instantané de l'index lu par la recherche
+            filters (dict): Facette -> valeur(s), ou None
+            
+        Returns:
+            tuple: (indices des passages candidats, sous-matrice), ou (None, None) sans filtre
+        """
+        key = filter_key(filters)
+        if key is None:
+            return None, None
+        
+        key = (snapshot.generation, self.backend, key)
+        with self._filter_lock:
+            candidates = self.filter_cache.get(key)
+            if candidates is not None:
+                self.filter_cache.move_to_end(key)
+                return candidates
+        
+        rows = snapshot.passages.rows_for_documents(snapshot.metadata.rows(**filters))
+        if self.backend == 'bm25':
+            matrix = snapshot.bm25.select_rows(rows)
+        elif self.backend == 'lsa' and snapshot.lsa is not None:
+            matrix = np.asarray(snapshot.lsa.vectors[rows])
+        else:
+            matrix = snapshot.embeddings[rows]
+        
+        with self._filter_lock:
+            # Les entrées d'une génération précédente ne sont plus valides
+            for stale_key in [k for k in self.filter_cache if k[0] != snapshot.generation]:
+                del self.filter_cache[stale_key]
+            
+            self.filter_cache[key] = (rows, matrix)
+            while len(self.filter_cache) > self.config['filter_cache_size']:
+                self.filter_cache.popitem(last=False)
+        
+        return rows, matrix
+    
+    def _rank_passages(self, snapshot, rows, similarities, top_k, max_passages, wider=None):
+        """
+        Sélectionne les meilleurs passages sans trier tous les candidats
+        
+        Les candidats sont présélectionnés avec np.argpartition ; la sélection est
+        élargie tant qu'elle ne couvre pas top_k documents distincts. Lorsque les
+        candidats fournis ne sont eux-mêmes que les meilleurs passages d'une
+        recherche dense, des candidats plus nombreux sont demandés à wider une
+        fois tous les précédents retenus.
+        
+        Args:
+            snapshot (IndexSnapshot): Instantané de l'index lu par la recherche
+            rows (numpy.ndarray): Indices des passages candidats
+            similarities (numpy.ndarray): Similarités correspondantes
+            top_k (int): Nombre de documents à retourner
+            max_passages (int): Nombre maximal de passages par document
+            wider (iterator, optional): Couples (indices, similarités) de candidats
+                de plus en plus nombreux, chacun remplaçant le précédent
+            
+        Returns:
+            list: Résultats groupés par document
+        """
+        limit = max(top_k * max_passages, 1)
+        
+        while True:
+            if limit < len(similarities):
+                candidates = np.argpartition(-similarities, limit - 1)[:limit]
+            else:
+                candidates = np.arange(len(similarities))
+            
+            # Trier les candidats par similarité décroissante
+            order = candidates[np.argsort(-similarities[candidates], kind='stable')]
+            results = self._group_passages(snapshot, rows[order], similarities[order], top_k, max_passages)
+            
+            if len(results) >= top_k:
+                return results
+            
+            if len(candidates) == len(similarities):
+                # Tous les candidats sont retenus : seule une recherche plus large peut compléter
+                more = next(wider, None) if wider is not None else None
+                if more is None:
+                    return results
+                rows, similarities = more
+            
+            limit *= 4
+    
+    def _group_passages(self, snapshot, rows, similarities, top_k, max_passages):
+        """
+        Regroupe des passages triés par similarité décroissante en résultats par document
+        
+        Args:
+            snapshot (IndexSnapshot): Instantané de l'index lu par la recherche
+            rows (numpy.ndarray): Indices des passages
+            similarities (numpy.ndarray): Similarités correspondantes
+            top_k (int): Nombre de documents à retourner
+            max_passages (int): Nombre maximal de passages par document
+            
+        Returns:
+            list: Résultats avec les clés 'document' (sans la clé 'text'), 'similarity' et 'passages'
+        """
+        results = []
+        by_document = {}
+        full = 0
+        
+        for row, similarity in zip(rows.tolist(), similarities.tolist()):
+            doc = int(snapshot.passages.doc[row])
+            result = by_document.get(doc)
+            
+            if result is None:
+                if len(results) >= top_k:
+                    continue
+                result = {
+                    'document': snapshot.documents.record(doc),
+                    'similarity': float(similarity),
+                    'passages': []
+                }
+                by_document[doc] = result
+                results.append(result)
+            
+            if len(result['passages']) < max_passages:
+                passage = snapshot.passages.get(row, snapshot.documents)
+                passage['similarity'] = float(similarity)
+                result['passages'].append(passage)
+                
+                if len(result['passages']) == max_passages:
+                    full += 1
+            
+            # Tous les documents retenus ont leurs passages : inutile de continuer
+            if len(results) >= top_k and full >= len(results):
+                break
+        
+        return results
+    
+    def term_statistics(self, terms):
+        """
+        Calcule les fréquences documentaires de termes dans l'index
+        
+        Ces statistiques permettent de calculer des poids IDF communs à plusieurs
+        index (voir ShardedVectorDB). La fréquence d'un terme est le nombre de
+        passages non supprimés qui le contiennent ; les fréquences de toutes les
+        colonnes sont comptées une fois par instantané.
+        
+        Args:
+            terms (list): Termes, tels que découpés par l'analyseur du vectoriseur
+            
+        Returns:
+            tuple: (nombre de passages non supprimés, numpy.ndarray des fréquences
+                documentaires, 0 pour les termes absents du vectoriseur)
+        """
+        terms = list(terms)
+        snapshot = self.snapshot
+        frequencies = np.zeros(len(terms), dtype=np.int64)
+        
+        if snapshot.embeddings is None or snapshot.vectorizer is None:
+            return 0, frequencies
+        
+        cached = self._column_frequency
+        if cached is None or cached[0] is not snapshot:
+            embeddings = snapshot.embeddings
+            if snapshot.deleted_rows is not None:
+                embeddings = embeddings[~snapshot.deleted_rows]
+            cached = (snapshot, embeddings.shape[0], np.bincount(embeddings.indices, minlength=embeddings.shape[1]))
+            self._column_frequency = cached
+        
+        _, n_passages, column_frequency = cached
+        
+        if terms:
+            # Une ligne par terme, avec sa colonne s'il est connu du vectoriseur
+            counts = self._term_counts(terms, snapshot.vectorizer)
+            rows = np.repeat(np.arange(len(terms)), np.diff(counts.indptr))
+            frequencies[rows] = column_frequency[counts.indices]
+        
+        return n_passages, frequencies
+    
     def get_document_by_id(self, doc_id):
         """
         Récupère un document par son identifiant
@@ -286,21 +1122,333 @@ class VectorDB:
         Returns:
             dict: Document trouvé ou None si non trouvé
         """
-        for doc in self.documents:
-            if doc['id'] == doc_id:
-                return doc
+        snapshot = self.snapshot
+        row = snapshot.metadata.get_row(doc_id)
+        
+        return snapshot.documents[row] if row is not None else None
+    
+    def find_documents(self, **filters):
+        """
+        Récupère les documents correspondant à des filtres de métadonnées
+        
+        Exemple : find_documents(component='economiseur bt', category='gamme')
+        
+        Args:
+            **filters: Facette ('type', 'category', 'component' ou 'subcomponent')
+                -> valeur ou liste de valeurs
+            
+        Returns:
+            list: Documents correspondants, dans l'ordre de la base
+        """
+        snapshot = self.snapshot
         
-        return None
+        return [snapshot.documents[row] for row in snapshot.metadata.rows(**filters).tolist()]
     
-    def update_db(self):
+    def remove_document(self, doc_id):
         """
-        Met à jour la base de données en ré-indexant tous les documents
+        Supprime un document de la base de données
+        
+        Args:
+            doc_id (str): Identifiant du document
+            
+        Returns:
+            bool: True si le document a été supprimé, False s'il est inconnu
+        """
+        return self.remove_documents([doc_id]) == 1
+    
+    def remove_documents(self, doc_ids):
         """
-        # Chemin des documents à indexer
-        documents_dirs = [
-            os.path.join(self.data_dir, 'models'),
-            os.path.join(self.data_dir, 'maintenance')
+        Supprime un lot de documents de la base de données
+        
+        Les documents sont marqués comme supprimés (tombstones) : ils disparaissent
+        immédiatement des résultats et des index de métadonnées, mais leurs lignes
+        restent dans la matrice jusqu'au compactage, lancé lorsque la part des
+        passages supprimés dépasse le seuil de la configuration.
+        
+        Args:
+            doc_ids (iterable): Identifiants des documents
+            
+        Returns:
+            int: Nombre de documents supprimés
+        """
+        with self._transaction():
+            removed = sum(1 for doc_id in doc_ids if self._mark_deleted(doc_id))
+            if removed:
+                self._reset_tombstones(self.deleted)
+                if not self._maybe_compact():
+                    self._save_db()
+            
+            return removed
+    
+    def upsert_document(self, document):
+        """
+        Ajoute un document ou remplace le document de même identifiant
+        
+        L'ancienne version est marquée comme supprimée et la nouvelle est ajoutée
+        en fin d'index, sans recalculer les autres documents.
+        
+        Args:
+            document (dict): Document avec les clés 'id', 'path', 'text' et 'type'
+            
+        Returns:
+            bool: True si un document existant a été remplacé, False s'il a été ajouté
+        """
+        if not all(key in document for key in ['id', 'path', 'text', 'type']):
+            raise ValueError("Le document doit contenir les clés 'id', 'path', 'text' et 'type'.")
+        
+        with self._transaction():
+            replaced = self._mark_deleted(document['id'])
+            self._add_documents([document], batch_size=1)
+            self._maybe_compact()
+            
+            return replaced
+    
+    def _mark_deleted(self, doc_id):
+        """
+        Marque un document comme supprimé et le retire des index de métadonnées
+        
+        Args:
+            doc_id (str): Identifiant du document
+            
+        Returns:
+            bool: True si le document existait
+        """
+        row = self.metadata.get_row(doc_id)
+        if row is None:
+            return False
+        
+        self.metadata.remove(row, self.documents.record(row))
+        self.deleted[row] = True
+        
+        return True
+    
+    def _reset_tombstones(self, deleted=None):
+        """
+        Remplace le masque des documents supprimés et recalcule celui des passages
+        
+        Args:
+            deleted (numpy.ndarray, optional): Masque booléen par document.
+                Si non fourni, aucun document n'est marqué comme supprimé.
+        """
+        if deleted is None or len(deleted) != len(self.documents):
+            deleted = np.zeros(len(self.documents), dtype=bool)
+        
+        self.deleted = np.array(deleted, dtype=bool)
+        self.deleted_rows = self.deleted[np.asarray(self.passages.doc)] if self.deleted.any() else None
+    
+    def _maybe_compact(self):
+        """
+        Lance le compactage si la part des passages supprimés dépasse le seuil
+        
+        Returns:
+            bool: True si l'index a été compacté (et sauvegardé) avant le retour
+        """
+        if self.deleted_rows is None or len(self.passages) == 0:
+            return False
+        
+        if self.deleted_rows.mean() <= self.config['compaction_threshold']:
+            return False
+        
+        # En arrière-plan, le compactage attend la fin de l'écriture en cours
+        if self.config['background_compaction']:
+            self.compact(background=True)
+            return False
+        
+        self.compact()
+        return True
+    
+    def compact(self, background=False):
+        """
+        Retire définitivement les documents supprimés de l'index
+        
+        Le nouvel instantané de l'index est construit à part et publié en fin de
+        compactage : les recherches continuent pendant ce temps sur l'instantané
+        précédent. Les écritures attendent la fin du compactage.
+        
+        Args:
+            background (bool, optional): Si True, compacte dans un thread séparé
+            
+        Returns:
+            int: Nombre de documents retirés, ou le thread lancé si background est True
+        """
+        if background:
+            thread = threading.Thread(target=self.compact, name='vectordb-compaction', daemon=True)
+            thread.start()
+            return thread
+        
+        with self._transaction():
+            if not self.deleted.any():
+                return 0
+            
+            kept_documents = np.flatnonzero(~self.deleted)
+            doc_remap = np.full(len(self.documents), -1, dtype=np.int64)
+            doc_remap[kept_documents] = np.arange(len(kept_documents))
+            kept_rows = np.flatnonzero(~self.deleted_rows)
+            
+            documents = self.documents.select(kept_documents)
+            passages = self.passages.select(kept_rows, doc_remap)
+            metadata = self.metadata.select(kept_documents.tolist())
+            embeddings = None
+            bm25 = None
+            lsa = None
+            
+            if self.embeddings is not None and len(kept_rows):
+                embeddings = sparse.csr_matrix(self.embeddings[kept_rows], dtype=np.float32)
+                if self.bm25 is not None:
+                    bm25_params = self.config['bm25']
+                    bm25 = BM25Index.build(self.bm25.counts[kept_rows], k1=bm25_params['k1'], b=bm25_params['b'])
+                if self.lsa is not None:
+                    lsa = self.lsa.update(kept_rows, embeddings[:0])
+            
+            removed = len(self.documents) - len(documents)
+            
+            # Remplacement dans le brouillon, publié en fin d'écriture
+            self.documents, self.passages, self.metadata = documents, passages, metadata
+            self.embeddings, self.bm25, self.lsa = embeddings, bm25, lsa
+            self._reset_tombstones()
+            
+            if self.embeddings is None:
+                self._fit()
+            
+            self._save_db()
+            print(f"Base de données vectorielle compactée : {removed} documents retirés.")
+            
+            return removed
+    
+    def update_db(self, force=False, background=False):
+        """
+        Met à jour la base de données de façon incrémentale
+        
+        Seuls les fichiers ajoutés ou modifiés (taille, date de modification puis
+        empreinte du contenu) sont relus, et les documents des fichiers supprimés
+        sont retirés. Le vectoriseur n'est réentraîné que lorsque la dérive du
+        vocabulaire dépasse le seuil ; sinon les nouveaux documents sont projetés
+        sur le vocabulaire existant.
+        
+        La mise à jour prépare un nouvel instantané de l'index, publié une fois
+        complet : les recherches lancées entre-temps utilisent l'instantané
+        précédent, sans attendre.
+        
+        Args:
+            force (bool, optional): Si True, ré-indexe tous les documents
+            background (bool, optional): Si True, met à jour dans un thread séparé
+            
+        Returns:
+            dict: Résumé de la mise à jour avec les clés 'changed', 'deleted', 'refit'
+                et 'errors' (le détail des erreurs est dans extraction_errors),
+                ou le thread lancé si background est True
+        """
+        if background:
+            thread = threading.Thread(target=self.update_db, args=(force,), name='vectordb-update', daemon=True)
+            thread.start()
+            return thread
+        
+        with self._transaction():
+            return self._update_db(force)
+    
+    def _update_db(self, force):
+        """
+        Met à jour la base de données (voir update_db)
+        
+        Args:
+            force (bool): Si True, ré-indexe tous les documents
+            
+        Returns:
+            dict: Résumé de la mise à jour
+        """
+        if force:
+            self._index_documents(self.documents_dirs)
+            return {
+                'changed': len(self.fingerprints),
+                'deleted': 0,
+                'refit': True,
+                'errors': len(self.extraction_errors)
+            }
+        
+        # Comparer les fichiers présents aux empreintes connues
+        fingerprints = {}
+        changed_files = []
+        
+        for filepath in list_files(self.documents_dirs):
+            stat = os.stat(filepath)
+            known = self.fingerprints.get(filepath)
+            
+            # Taille et date inchangées : le fichier n'est pas relu
+            if known is not None and known['size'] == stat.st_size and known['mtime'] == stat.st_mtime_ns:
+                fingerprints[filepath] = known
+                continue
+            
+            fingerprint = fingerprint_file(filepath, stat=stat)
+            fingerprints[filepath] = fingerprint
+            
+            # Fichier touché mais contenu identique
+            if known is not None and known['hash'] == fingerprint['hash']:
+                continue
+            
+            changed_files.append(filepath)
+        
+        deleted_files = [filepath for filepath in self.fingerprints if filepath not in fingerprints]
+        fingerprints_changed = fingerprints != self.fingerprints
+        self.fingerprints = fingerprints
+        
+        summary = {'changed': len(changed_files), 'deleted': len(deleted_files), 'refit': False, 'errors': 0}
+        
+        if not changed_files and not deleted_files and not self.deleted.any():
+            # Fichiers touchés sans changement de contenu : enregistrer leurs nouvelles
+            # dates pour ne pas recalculer leur empreinte au prochain démarrage
+            if fingerprints_changed:
+                self._save_db()
+            return summary
+        
+        # Retirer les documents des fichiers modifiés ou supprimés, et leurs passages
+        stale_paths = set(changed_files) | set(deleted_files)
+        # Les documents supprimés en attente de compactage sont retirés au passage
+        kept_documents = [
+            i for i, doc in enumerate(self.documents.iter_records())
+            if doc['path'] not in stale_paths and not self.deleted[i]
         ]
         
-        # Indexer les documents
-        self._index_documents(documents_dirs)
\ No newline at end of file
+        doc_remap = np.full(len(self.documents), -1, dtype=np.int64)
+        doc_remap[kept_documents] = np.arange(len(kept_documents))
+        kept_rows = np.flatnonzero(doc_remap[np.asarray(self.passages.doc)] >= 0)
+        kept_passages = self.passages.select(kept_rows, doc_remap)
+        
+        # Extraire uniquement les fichiers ajoutés ou modifiés
+        new_documents, self.extraction_errors = self._extract(changed_files)
+        summary['errors'] = len(self.extraction_errors)
+        
+        # Les fichiers en échec n'ont pas d'empreinte : ils seront relus à la prochaine mise à jour
+        for filepath in self.extraction_errors:
+            self.fingerprints.pop(filepath, None)
+        
+        new_documents, new_passages = self._prepare_documents(new_documents, first_doc=len(kept_documents))
+        self.documents = self.documents.select(kept_documents)
+        self.documents.extend(new_documents)
+        self.passages = kept_passages.concat(new_passages)
+        self.metadata = self.metadata.select(kept_documents)
+        self.metadata.add(new_documents.iter_records(), first_row=len(kept_documents))
+        self._reset_tombstones()
+        
+        if not self.documents or self.vectorizer is None or self.embeddings is None:
+            self._fit()
+            summary['refit'] = True
+        else:
+            # Mesurer la dérive du vocabulaire introduite par les nouveaux documents
+            texts = new_passages.texts(new_documents, first_doc=len(kept_documents))
+            self.drift['drift_tokens'] += self._count_unknown_tokens(texts)
+            
+            if self.drift['drift_tokens'] > self.refit_threshold * max(self.drift['fit_tokens'], 1):
+                self._fit()
+                summary['refit'] = True
+            else:
+                matrices = [self.embeddings[kept_rows]]
+                if texts:
+                    matrices.append(self.vectorizer.transform(texts))
+                self.embeddings = sparse.vstack(matrices, format='csr', dtype=np.float32)
+                self._update_bm25(texts, kept_rows=kept_rows)
+                self._update_lsa(kept_rows=kept_rows)
+        
+        # Sauvegarder la base de données
+        self._save_db()
+        
+        return summary
\ No newline at end of file
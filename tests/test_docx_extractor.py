@@ -0,0 +1,71 @@
+# tests/test_docx_extractor.py
+import os
+import sys
+from docx import Document
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag.docx_extractor import docx_to_passages
+
+def make_docx(path, rows, merge=None):
+    """
+    Crée un document Word contenant un paragraphe et un tableau
+    
+    Args:
+        path (str): Chemin du fichier à créer
+        rows (list): Lignes du tableau (listes de textes)
+        merge (tuple, optional): (ligne, première colonne, dernière colonne) à fusionner
+    
+    Returns:
+        str: Chemin du fichier
+    """
+    document = Document()
+    document.add_paragraph("Tableau AMDEC")
+    table = document.add_table(rows=len(rows), cols=len(rows[0]))
+    
+    for i, row in enumerate(rows):
+        for j, text in enumerate(row):
+            table.cell(i, j).text = text
+    
+    if merge is not None:
+        row, first, last = merge
+        table.cell(row, first).merge(table.cell(row, last))
+    
+    document.save(path)
+    
+    return path
+
+def test_repeated_values_keep_their_columns(tmp_path):
+    path = make_docx(str(tmp_path / 'amdec.docx'), [
+        ['Sous-composant', 'F', 'G', 'D', 'C'],
+        ['Épingle', '2', '3', '3', '18']
+    ])
+    
+    assert docx_to_passages(path) == [
+        ("Tableau AMDEC", 'paragraph'),
+        ("Sous-composant | F | G | D | C", 'table_row'),
+        ("Épingle | 2 | 3 | 3 | 18", 'table_row')
+    ]
+
+def test_empty_cells_keep_their_slot(tmp_path):
+    path = make_docx(str(tmp_path / 'amdec.docx'), [
+        ['Collecteur', '', '4', '4', '16'],
+        ['', '', '', '', '']
+    ])
+    
+    assert docx_to_passages(path)[1:] == [
+        ("Collecteur |  | 4 | 4 | 16", 'table_row'),
+        ("", 'table_row')
+    ]
+
+def test_merged_cell_occupies_its_first_column(tmp_path):
+    path = make_docx(str(tmp_path / 'amdec.docx'), [
+        ['Tube porteur', 'Fuite', '', '3', '9']
+    ], merge=(0, 1, 2))
+    
+    assert docx_to_passages(path)[1:] == [
+        ("Tube porteur | Fuite |  | 3 | 9", 'table_row')
+    ]
\ No newline at end of file
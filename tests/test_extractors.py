@@ -0,0 +1,61 @@
+# tests/test_extractors.py
+import os
+import sys
+from openpyxl import Workbook
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag import extractors
+from rag.extractors import read_file
+from rag.metadata import extract_metadata
+from rag.documents import DocumentTable
+from rag.passages import PassageTable
+
+def make_xlsx(path, rows):
+    """
+    Crée un classeur Excel d'une feuille
+    
+    Args:
+        path (str): Chemin du fichier à créer
+        rows (list): Lignes de la feuille, la première donnant les colonnes
+    
+    Returns:
+        str: Chemin du fichier
+    """
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    
+    return path
+
+def test_excel_text_is_spooled_chunk_by_chunk(tmp_path, monkeypatch):
+    # Blocs de 2 lignes : le texte et les métadonnées sont assemblés sur trois blocs
+    monkeypatch.setattr(extractors.iter_excel_passages, '__defaults__', (2,))
+    filepath = make_xlsx(str(tmp_path / 'historique.xlsx'), [
+        ['Équipement', 'Défaut'],
+        ['Chaudière', 'Fuite épingle'],
+        ['Arrêt', 'économiseur BT'],
+        ['Arrêt', 'collecteur de sortie'],
+        [None, None],
+        ['Tubes porteurs', 'érodés']
+    ])
+    spool_dir = str(tmp_path / 'spool')
+    os.makedirs(spool_dir)
+    
+    in_memory = read_file(filepath)
+    spooled = read_file(filepath, spool_dir=spool_dir)
+    
+    assert 'text' not in spooled
+    assert os.path.dirname(spooled['text_path']) == spool_dir
+    assert isinstance(spooled['passages'], PassageTable)
+    assert spooled['metadata'] == extract_metadata(in_memory)
+    assert spooled['metadata']['component'] == ['economiseur bt']
+    assert spooled['metadata']['subcomponent'] == ['collecteur sortie', 'tube porteur', 'epingle']
+    
+    documents = DocumentTable.from_documents([spooled])
+    assert documents.text(0) == in_memory['text']
+    assert PassageTable.from_documents([spooled]).texts(documents) == PassageTable.from_documents([in_memory]).texts(documents)
\ No newline at end of file
@@ -0,0 +1,67 @@
+# tests/test_index_store.py
+import os
+import sys
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag.index_store import IndexStore
+from rag.documents import DocumentTable
+from rag.passages import PassageTable
+
+DOCUMENTS = [
+    {'id': 'a.txt', 'path': 'a.txt', 'type': 'txt', 'text': "Réchauffeur HT\n  collecteur de sortie  \n\népingle fissurée"},
+    {'id': 'b.txt', 'path': 'b.txt', 'type': 'txt', 'text': ""},
+    {'id': 'c.txt', 'path': 'c.txt', 'type': 'txt', 'text': "Économiseur BT : contrôle des soudures"}
+]
+
+def save_documents(index_dir, documents):
+    """
+    Publie une génération de l'index ne contenant que des documents
+    
+    Args:
+        index_dir (str): Répertoire de l'index
+        documents (DocumentTable): Documents à enregistrer
+    
+    Returns:
+        IndexStore: Stockage de l'index
+    """
+    store = IndexStore(index_dir)
+    store.save(documents, None)
+    
+    return store
+
+def test_documents_are_read_on_demand(tmp_path):
+    store = save_documents(str(tmp_path), DocumentTable.from_documents(DOCUMENTS))
+    
+    documents = store.load()['documents']
+    
+    assert isinstance(documents, DocumentTable)
+    assert len(documents) == len(DOCUMENTS)
+    assert list(documents) == DOCUMENTS
+    assert documents.record(2) == {'id': 'c.txt', 'path': 'c.txt', 'type': 'txt'}
+
+def test_passage_text_uses_byte_positions(tmp_path):
+    store = save_documents(str(tmp_path), DocumentTable.from_documents(DOCUMENTS))
+    documents = store.load_documents()
+    passages = PassageTable.from_documents(DOCUMENTS)
+    
+    assert passages.texts(documents) == [
+        "Réchauffeur HT",
+        "collecteur de sortie",
+        "épingle fissurée",
+        "Économiseur BT : contrôle des soudures"
+    ]
+
+def test_selected_documents_are_written_again(tmp_path):
+    store = save_documents(str(tmp_path), DocumentTable.from_documents(DOCUMENTS))
+    
+    # Documents conservés lus dans la génération précédente, suivis d'un document ajouté
+    documents = store.load_documents().select([0, 2])
+    added = {'id': 'd.txt', 'path': 'd.txt', 'type': 'txt', 'text': "Tubes porteurs érodés"}
+    documents.extend(DocumentTable.from_documents([added]))
+    save_documents(str(tmp_path), documents)
+    
+    assert list(store.load_documents()) == [DOCUMENTS[0], DOCUMENTS[2], added]
\ No newline at end of file
@@ -0,0 +1,92 @@
+# tests/test_sharded_db.py
+import os
+import sys
+import threading
+import pytest
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag.sharded_db import ShardedVectorDB
+
+# Shard dont un seul document cite, en passant, un terme de la requête
+WEAK_SHARD = {
+    'planning.txt': "Planning des arrêts de la chaudière et du collecteur pour l'année, réunion de service, budget et commandes de pièces de rechange.",
+    'securite.txt': "Consignes de sécurité pour les interventions en hauteur et le port des équipements de protection.",
+    'formation.txt': "Formation des opérateurs à la conduite de la chaudière et aux procédures de démarrage."
+}
+
+# Shard dont les documents traitent précisément de la requête
+STRONG_SHARD = {
+    'fuite_collecteur.txt': "Fuite au collecteur de sortie de l'économiseur : percement par corrosion du collecteur de sortie.",
+    'epingle.txt': "Inspection des épingles du surchauffeur par ultrasons et contrôle des soudures.",
+    'rechauffeur.txt': "Remplacement des tubes porteurs du réchauffeur après érosion."
+}
+
+QUERY = "fuite collecteur sortie corrosion"
+
+def make_shards(data_dir):
+    """
+    Crée les documents des deux shards dans un répertoire de données
+    
+    Args:
+        data_dir (str): Répertoire de données
+    
+    Returns:
+        dict: Nom du shard -> répertoires des documents (shard faible en premier)
+    """
+    for name, documents in (('faible', WEAK_SHARD), ('fort', STRONG_SHARD)):
+        os.makedirs(os.path.join(data_dir, name))
+        for filename, text in documents.items():
+            with open(os.path.join(data_dir, name, filename), 'w', encoding='utf-8') as f:
+                f.write(text)
+    
+    return {'faible': ['faible'], 'fort': ['fort']}
+
+@pytest.mark.parametrize('backend', ['tfidf', 'bm25'])
+def test_weak_shard_does_not_tie_strong_shard(tmp_path, backend):
+    data_dir = str(tmp_path)
+    db = ShardedVectorDB(data_dir, shards=make_shards(data_dir), backend=backend)
+    
+    results = db.search(QUERY, top_k=5)
+    
+    assert results[0]['shard'] == 'fort'
+    assert results[0]['document']['id'] == 'fuite_collecteur.txt'
+    
+    weak = [result for result in results if result['shard'] == 'faible']
+    assert weak
+    assert all(result['similarity'] < results[0]['similarity'] / 2 for result in weak)
+
+def test_search_does_not_wait_for_update(tmp_path):
+    data_dir = str(tmp_path)
+    db = ShardedVectorDB(data_dir, shards=make_shards(data_dir))
+    
+    started = threading.Barrier(len(db.shards) + 1)
+    release = threading.Event()
+    
+    def blocking_update(force=False):
+        started.wait(timeout=5)
+        release.wait(timeout=5)
+        return {}
+    
+    for shard in db.shards.values():
+        shard.update_db = blocking_update
+    
+    update = threading.Thread(target=db.update_db)
+    update.start()
+    try:
+        # Toutes les mises à jour occupent leurs threads
+        started.wait(timeout=5)
+        
+        results = []
+        search = threading.Thread(target=lambda: results.extend(db.search(QUERY)))
+        search.start()
+        search.join(timeout=2)
+        
+        assert not search.is_alive()
+        assert results[0]['document']['id'] == 'fuite_collecteur.txt'
+    finally:
+        release.set()
+        update.join()
\ No newline at end of file
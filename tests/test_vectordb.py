@@ -0,0 +1,283 @@
+# tests/test_vectordb.py
+import os
+import sys
+import json
+import threading
+import pytest
+
+# Ajouter le chemin du projet au PYTHONPATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+sys.path.append(project_dir)
+
+from rag.vectordb import VectorDB
+
+# Journal dont toutes les lignes répondent à la requête, et documents plus courts
+JOURNAL = '\n'.join(f"Fuite au collecteur de sortie, intervention {i}" for i in range(80))
+
+REPORTS = {
+    'rapport_eco.txt': "Fuite collecteur sortie économiseur, percement\nAutre ligne sans rapport",
+    'rapport_corrosion.txt': "Collecteur de sortie : fuite et corrosion\nAutre ligne sans rapport",
+    'rapport_sur.txt': "Fuite sur collecteur de sortie du surchauffeur\nAutre ligne sans rapport",
+    'rapport_rch.txt': "Contrôle fuite collecteur sortie réchauffeur\nAutre ligne sans rapport",
+    'planning.txt': "Planning des arrêts et budget\nConsignes de sécurité"
+}
+
+QUERY = "fuite collecteur sortie"
+
+def write_files(directory, files):
+    """
+    Écrit des fichiers texte dans un répertoire
+    
+    Args:
+        directory (str): Répertoire des fichiers
+        files (dict): Nom du fichier -> contenu
+    """
+    os.makedirs(directory, exist_ok=True)
+    for filename, text in files.items():
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def make_data_dir(data_dir, maintenance=None, models=None, config=None):
+    """
+    Crée un répertoire de données avec ses documents et sa configuration
+    
+    Args:
+        data_dir (str): Répertoire de données
+        maintenance (dict, optional): Documents du répertoire maintenance
+        models (dict, optional): Documents du répertoire models
+        config (dict, optional): Contenu de rag_config.json
+    
+    Returns:
+        str: Répertoire de données
+    """
+    write_files(os.path.join(data_dir, 'maintenance'), maintenance or {})
+    write_files(os.path.join(data_dir, 'models'), models or {})
+    
+    if config is not None:
+        with open(os.path.join(data_dir, 'rag_config.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+    
+    return data_dir
+
+def result_ids(results):
+    """
+    Récupère les identifiants des documents d'une liste de résultats
+    
+    Args:
+        results (list): Résultats d'une recherche
+    
+    Returns:
+        list: Identifiants des documents, dans l'ordre des résultats
+    """
+    return [result['document']['id'] for result in results]
+
+def test_lsa_returns_top_k_documents_past_a_dominant_document(tmp_path):
+    data_dir = make_data_dir(str(tmp_path), maintenance={'journal.txt': JOURNAL}, models=REPORTS)
+    db = VectorDB(data_dir, backend='lsa')
+    
+    ids = result_ids(db.search(QUERY, top_k=5, max_passages=1))
+    
+    assert ids[0] == 'journal.txt'
+    assert set(ids[1:]) == {'rapport_eco.txt', 'rapport_corrosion.txt', 'rapport_sur.txt', 'rapport_rch.txt'}
+
+@pytest.mark.parametrize('filters', [None, {'type': 'txt'}])
+def test_lsa_deleted_passages_do_not_use_the_candidate_budget(tmp_path, filters):
+    data_dir = make_data_dir(
+        str(tmp_path),
+        maintenance={'journal.txt': JOURNAL},
+        models=REPORTS,
+        config={'compaction_threshold': 1.0}
+    )
+    db = VectorDB(data_dir, backend='lsa')
+    db.remove_document('journal.txt')
+    
+    ids = result_ids(db.search(QUERY, top_k=4, max_passages=1, filters=filters))
+    
+    assert set(ids) == {'rapport_eco.txt', 'rapport_corrosion.txt', 'rapport_sur.txt', 'rapport_rch.txt'}
+def passage_texts(db, doc_id):
+    """
+    Récupère les textes des passages d'un document
+    
+    Args:
+        db (VectorDB): Base de données
+        doc_id (str): Identifiant du document
+    
+    Returns:
+        list: Textes des passages du document, dans l'ordre des lignes
+    """
+    row = db.metadata.get_row(doc_id)
+    
+    return [
+        text for doc, text in zip(db.passages.doc.tolist(), db.passages.texts(db.documents))
+        if doc == row
+    ]
+
+@pytest.mark.parametrize('backend', ['tfidf', 'bm25', 'lsa'])
+def test_update_db_applies_edited_removed_added_and_failed_files(tmp_path, backend):
+    data_dir = make_data_dir(str(tmp_path), maintenance={
+        'fuite.txt': "Fuite au collecteur de sortie\nPercement par corrosion",
+        'epingle.txt': "Inspection des épingles du surchauffeur",
+        'porteurs.txt': "Remplacement des tubes porteurs du réchauffeur",
+        'gamme.json': "{ incomplet"
+    })
+    maintenance_dir = os.path.join(data_dir, 'maintenance')
+    db = VectorDB(data_dir, backend=backend)
+    
+    assert set(db.extraction_errors) == {os.path.join(maintenance_dir, 'gamme.json')}
+    
+    write_files(maintenance_dir, {
+        'fuite.txt': "Fuite au collecteur de sortie\nSoudure reprise après ressuage",
+        'economiseur.txt': "Contrôle de l'économiseur BT\nMesure d'épaisseur des tubes"
+    })
+    os.remove(os.path.join(maintenance_dir, 'epingle.txt'))
+    
+    summary = db.update_db()
+    
+    # Le fichier en échec est relu à chaque mise à jour, tant qu'il n'est pas corrigé
+    assert (summary['changed'], summary['deleted'], summary['errors']) == (3, 1, 1)
+    assert sorted(doc['id'] for doc in db.documents.iter_records()) == ['economiseur.txt', 'fuite.txt', 'porteurs.txt']
+    assert db.get_document_by_id('fuite.txt')['text'] == "Fuite au collecteur de sortie\nSoudure reprise après ressuage"
+    assert passage_texts(db, 'fuite.txt') == ["Fuite au collecteur de sortie", "Soudure reprise après ressuage"]
+    assert passage_texts(db, 'economiseur.txt') == ["Contrôle de l'économiseur BT", "Mesure d'épaisseur des tubes"]
+    assert passage_texts(db, 'porteurs.txt') == ["Remplacement des tubes porteurs du réchauffeur"]
+    assert db.find_documents(component='economiseur bt') == [db.get_document_by_id('economiseur.txt')]
+    
+    assert result_ids(db.search("soudure ressuage", top_k=1)) == ['fuite.txt']
+    assert result_ids(db.search("épaisseur économiseur", top_k=1)) == ['economiseur.txt']
+    assert 'epingle.txt' not in result_ids(db.search("épingles surchauffeur", top_k=3))
+    assert not any(
+        passage['text'] == "Percement par corrosion"
+        for result in db.search("percement corrosion", top_k=3)
+        for passage in result['passages']
+    )
+    
+    # Fichier corrigé : il est indexé à la mise à jour suivante
+    write_files(maintenance_dir, {'gamme.json': '{"titre": "Gamme de contrôle des collecteurs"}'})
+    
+    summary = db.update_db()
+    
+    assert (summary['changed'], summary['deleted'], summary['errors']) == (1, 0, 0)
+    assert db.extraction_errors == {}
+    assert passage_texts(db, 'gamme.json') == ['{"titre": "Gamme de contrôle des collecteurs"}']
+    
+    # L'index publié est celui relu par une nouvelle instance
+    reopened = VectorDB(data_dir, backend=backend)
+    assert list(reopened.documents) == list(db.documents)
+    assert result_ids(reopened.search("soudure ressuage", top_k=1)) == ['fuite.txt']
+@pytest.mark.parametrize('refit_threshold, refit', [(0.0, True), (1000.0, False)])
+def test_update_db_refits_past_the_drift_threshold(tmp_path, refit_threshold, refit):
+    data_dir = make_data_dir(str(tmp_path), models=REPORTS)
+    db = VectorDB(data_dir, refit_threshold=refit_threshold)
+    
+    write_files(os.path.join(data_dir, 'models'), {'thermographie.txt': "Thermographie infrarouge du calorifuge"})
+    summary = db.update_db()
+    
+    assert summary['refit'] is refit
+    assert ('thermographie' in db.vectorizer.vocabulary_) is refit
+    assert db.drift['drift_tokens'] == (0 if refit else 3)
+    assert passage_texts(db, 'thermographie.txt') == ["Thermographie infrarouge du calorifuge"]
+    
+    # Projeté sur l'ancien vocabulaire, le document n'a aucun terme en commun avec la requête
+    assert (result_ids(db.search("thermographie infrarouge", top_k=1)) == ['thermographie.txt']) is refit
+def result_passages(results):
+    """
+    Résume une liste de résultats par document et textes des passages
+    
+    Args:
+        results (list): Résultats d'une recherche
+    
+    Returns:
+        list: Couples (identifiant du document, textes des passages), dans l'ordre des résultats
+    """
+    return [(result['document']['id'], [passage['text'] for passage in result['passages']]) for result in results]
+
+@pytest.mark.parametrize('filters', [None, {'type': 'txt'}, {'subcomponent': 'collecteur sortie'}])
+@pytest.mark.parametrize('backend', ['tfidf', 'bm25', 'lsa'])
+def test_deleted_documents_never_match_before_or_after_compaction(tmp_path, backend, filters):
+    data_dir = make_data_dir(str(tmp_path), models=REPORTS, config={'compaction_threshold': 1.0})
+    db = VectorDB(data_dir, backend=backend)
+    
+    db.remove_document('rapport_eco.txt')
+    db.upsert_document({
+        'id': 'rapport_corrosion.txt',
+        'path': 'rapport_corrosion.txt',
+        'text': "Corrosion sous calorifuge, aucune anomalie",
+        'type': 'txt'
+    })
+    db.upsert_document({
+        'id': 'rapport_neuf.txt',
+        'path': 'rapport_neuf.txt',
+        'text': "Fuite au collecteur de sortie réparée",
+        'type': 'txt'
+    })
+    
+    # Anciennes versions conservées dans l'index jusqu'au compactage
+    assert db.deleted.sum() == 2
+    
+    before = result_passages(db.search(QUERY, top_k=10, filters=filters))
+    
+    assert 'rapport_eco.txt' not in [doc_id for doc_id, _ in before]
+    assert 'rapport_neuf.txt' in [doc_id for doc_id, _ in before]
+    for doc_id, texts in before:
+        document_text = db.get_document_by_id(doc_id)['text']
+        assert all(text in document_text.split('\n') for text in texts)
+    
+    assert db.compact() == 2
+    assert not db.deleted.any()
+    assert result_passages(db.search(QUERY, top_k=10, filters=filters)) == before
+@pytest.mark.parametrize('backend', ['tfidf', 'bm25', 'lsa'])
+def test_search_keeps_its_snapshot_while_writes_publish_generations(tmp_path, backend, monkeypatch):
+    # Seuil nul : la suppression compacte l'index et décale les lignes des passages
+    data_dir = make_data_dir(str(tmp_path), models=REPORTS, config={'compaction_threshold': 0.0})
+    db = VectorDB(data_dir, backend=backend)
+    expected = result_passages(db.search(QUERY, top_k=10))
+    
+    started = threading.Event()
+    release = threading.Event()
+    held = {}
+    filter_candidates = db._filter_candidates
+    
+    def blocking_filter_candidates(snapshot, filters):
+        held['snapshot'] = snapshot
+        started.set()
+        release.wait(timeout=5)
+        return filter_candidates(snapshot, filters)
+    
+    monkeypatch.setattr(db, '_filter_candidates', blocking_filter_candidates)
+    
+    results = {}
+    search = threading.Thread(target=lambda: results.update(passages=result_passages(db.search(QUERY, top_k=10))))
+    search.start()
+    try:
+        assert started.wait(timeout=5)
+        
+        # Les écritures publient de nouvelles générations sans attendre la recherche
+        db.add_documents([{
+            'id': 'rapport_neuf.txt',
+            'path': 'rapport_neuf.txt',
+            'text': "Fuite au collecteur de sortie réparée",
+            'type': 'txt'
+        }])
+        db.remove_documents(['rapport_eco.txt', 'rapport_corrosion.txt'])
+        
+        assert search.is_alive()
+        assert db.snapshot.generation > held['snapshot'].generation
+    finally:
+        release.set()
+        search.join(timeout=5)
+    
+    assert results['passages'] == expected
+    
+    # L'instantané de la recherche est resté cohérent : documents, lignes et métadonnées
+    snapshot = held['snapshot']
+    assert [doc['id'] for doc in snapshot.documents.iter_records()] == sorted(REPORTS)
+    assert not snapshot.deleted.any()
+    assert len(snapshot.passages) == snapshot.embeddings.shape[0]
+    assert all(snapshot.metadata.get_row(doc_id) == row for row, doc_id in enumerate(sorted(REPORTS)))
+    assert snapshot.passages.texts(snapshot.documents) == [text for _, content in sorted(REPORTS.items()) for text in content.split('\n')]
+    
+    monkeypatch.undo()
+    ids = result_ids(db.search(QUERY, top_k=10))
+    assert 'rapport_neuf.txt' in ids
+    assert not {'rapport_eco.txt', 'rapport_corrosion.txt'} & set(ids)
\ No newline at end of file